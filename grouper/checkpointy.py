@@ -0,0 +1,176 @@
+"""
+Funkcie na priebežné ukladanie stavu spracovania (checkpointy) a na pokračovanie prerušeného spracovania.
+
+Checkpoint obsahuje pozíciu vo vstupnom súbore v bajtoch, po ktorú boli prípady spracované, veľkosť zapísaného výstupu v bajtoch a súhrnné počty. Výstup sa pred zápisom checkpointu vyprázdni a zapíše na disk. Pri pokračovaní sa podľa veľkosti a času poslednej zmeny vstupného súboru overí, že sa vstup medzitým nezmenil.
+"""
+
+import json
+import os
+
+from grouper.priprava_dat import VELKOST_BUFFRA
+from grouper.sumar import sumar_do_json, sumar_z_json
+
+# Predvolený interval medzi checkpointmi v sekundách
+INTERVAL_CHECKPOINTOV = 60
+
+
+def urci_cestu_checkpointu(output_path):
+    """
+    Určí cestu k súboru s checkpointom podľa cesty k výstupnému súboru.
+
+    Args:
+        output_path (str): cesta k výstupnému súboru
+
+    Returns:
+        str: cesta k súboru s checkpointom
+    """
+    return f"{output_path}.checkpoint"
+
+
+def popis_vstupu(cesta):
+    """
+    Zistí veľkosť a čas poslednej zmeny vstupného súboru, podľa ktorých sa pri pokračovaní overí, že ide o ten istý súbor.
+
+    Args:
+        cesta (str): cesta k vstupnému súboru
+
+    Returns:
+        dict: veľkosť súboru v bajtoch a čas poslednej zmeny v nanosekundách
+    """
+    stat = os.stat(cesta)
+    return {"velkost": stat.st_size, "cas_zmeny": stat.st_mtime_ns}
+
+
+def otvor_vstup_od_pozicie(cesta, pozicia=0):
+    """
+    Otvorí vstupný súbor v binárnom režime a nastaví sa na zadanú pozíciu, takže spracované riadky sa znova nenačítavajú.
+
+    Args:
+        cesta (str): cesta k vstupnému súboru
+        pozicia (int, optional): pozícia v bajtoch, od ktorej sa má čítať
+
+    Returns:
+        file_handle: prístup k vstupnému súboru
+    """
+    file = open(cesta, "rb", buffering=VELKOST_BUFFRA)
+    file.seek(pozicia)
+    return file
+
+
+def dekoduj_riadky(file):
+    """
+    Postupne načíta a dekóduje riadky binárneho súboru. Pozícia súboru pritom zodpovedá koncu posledného vráteného riadku.
+
+    Args:
+        file (file_handle): prístup k súboru otvorenému v binárnom režime
+
+    Yields:
+        str: riadok súboru
+    """
+    for riadok in file:
+        yield riadok.decode("utf-8")
+
+
+def sleduj_poziciu(davky, zisti_poziciu, pozicie):
+    """
+    Ku každej dávke zaznamená pozíciu vo vstupnom súbore, po ktorú boli načítané jej riadky.
+
+    Dávky sa vyhodnocujú v poradí, v akom boli načítané, preto pozícia spracovanej dávky je vždy prvá v rade.
+
+    Args:
+        davky (Iterable[List[dict]]): dávky riadkov
+        zisti_poziciu (Callable[[], int]): funkcia, ktorá vráti aktuálnu pozíciu vo vstupnom súbore v bajtoch, napr. metóda tell súboru otvoreného v binárnom režime
+        pozicie (collections.deque): rad, do ktorého sa pozície zapisujú
+
+    Yields:
+        List[dict]: dávka riadkov
+    """
+    for davka in davky:
+        pozicie.append(zisti_poziciu())
+        yield davka
+
+
+def zapis_checkpoint(cesta, pozicia_vstupu, output_file, sumar, nastavenia, vstup):
+    """
+    Vyprázdni výstup, zapíše ho na disk a atomicky uloží checkpoint.
+
+    Args:
+        cesta (str): cesta k súboru s checkpointom
+        pozicia_vstupu (int): pozícia vo vstupnom súbore v bajtoch, po ktorú sú prípady spracované
+        output_file (file_handle): prístup k výstupnému súboru, prípadne None
+        sumar (dict): súhrnné počty spracovaných prípadov
+        nastavenia (dict): nastavenia spracovania, ktoré musia pri pokračovaní zostať rovnaké
+        vstup (dict): veľkosť a čas poslednej zmeny vstupného súboru na začiatku spracovania z funkcie popis_vstupu
+
+    Returns:
+        None
+    """
+    pozicia_vystupu = None
+    if output_file is not None:
+        output_file.flush()
+        os.fsync(output_file.fileno())
+        pozicia_vystupu = output_file.tell()
+
+    checkpoint = {
+        "nastavenia": nastavenia,
+        "vstup": vstup,
+        "pozicia_vstupu": pozicia_vstupu,
+        "pozicia_vystupu": pozicia_vystupu,
+        "sumar": sumar_do_json(sumar),
+    }
+
+    docasna_cesta = f"{cesta}.tmp"
+    with open(docasna_cesta, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(docasna_cesta, cesta)
+
+
+def nacitaj_checkpoint(cesta, nastavenia, vstup):
+    """
+    Načíta checkpoint a overí, že bol vytvorený s rovnakými nastaveniami spracovania a pre nezmenený vstupný súbor.
+
+    Args:
+        cesta (str): cesta k súboru s checkpointom
+        nastavenia (dict): aktuálne nastavenia spracovania
+        vstup (dict): aktuálna veľkosť a čas poslednej zmeny vstupného súboru z funkcie popis_vstupu
+
+    Raises:
+        ValueError: checkpoint bol vytvorený s inými nastaveniami alebo sa vstupný súbor odvtedy zmenil
+
+    Returns:
+        dict: checkpoint so súhrnom prevedeným späť na počítadlá, None ak checkpoint neexistuje
+    """
+    if not os.path.exists(cesta):
+        return None
+
+    with open(cesta, "r", encoding="utf-8") as file:
+        checkpoint = json.load(file)
+
+    if checkpoint["nastavenia"] != nastavenia:
+        raise ValueError(
+            f"Checkpoint {cesta} bol vytvorený s inými nastaveniami spracovania: {checkpoint['nastavenia']}."
+        )
+
+    if checkpoint.get("vstup") != vstup:
+        raise ValueError(
+            f"Vstupný súbor {nastavenia['file_path']} sa od vytvorenia checkpointu {cesta} zmenil (veľkosť alebo čas poslednej zmeny), v spracovaní nie je možné pokračovať."
+        )
+
+    checkpoint["sumar"] = sumar_z_json(checkpoint["sumar"])
+    return checkpoint
+
+
+def orez_vystup(output_path, pozicia_vystupu):
+    """
+    Odstráni z výstupného súboru neúplný zápis za poslednou uloženou pozíciou.
+
+    Args:
+        output_path (str): cesta k výstupnému súboru
+        pozicia_vystupu (int): veľkosť výstupu v bajtoch podľa checkpointu
+
+    Returns:
+        None
+    """
+    os.truncate(output_path, pozicia_vystupu)
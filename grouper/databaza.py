@@ -0,0 +1,168 @@
+"""
+Funkcie na čítanie hospitalizačných prípadov z databázy SQLite a zápis priradených medicínskych služieb späť do databázy.
+
+Prípady sa čítajú dotazom, ktorý vracia stĺpce v rovnakom poradí ako vstupný csv súbor, po veľkých dávkach. Výsledky sa zapisujú ako dvojice (id, ms) do tabuľky výsledkov hromadne, po dávkach v transakciách, takže nie je potrebný export do csv a spätný import výstupu.
+"""
+
+import sqlite3
+
+from grouper.priprava_dat import NAZVY_STLPCOV
+
+# Predvolený dotaz na načítanie hospitalizačných prípadov
+PREDVOLENY_DOTAZ = f"SELECT {', '.join(NAZVY_STLPCOV)} FROM hospitalizacie"
+
+# Predvolený názov tabuľky, do ktorej sa zapisujú priradené medicínske služby
+PREDVOLENA_TABULKA_VYSLEDKOV = "vysledky_ms"
+
+# Stĺpce tabuľky výsledkov
+STLPCE_TABULKY_VYSLEDKOV = ["id", "ms"]
+
+# Počet riadkov načítaných z databázy naraz
+VELKOST_DAVKY_DATABAZY = 10000
+
+
+def otvor_databazu(cesta):
+    """
+    Otvorí databázu SQLite. Spojenie je možné používať aj z iných vlákien, napr. v etapách spracovania.
+
+    Args:
+        cesta (str): cesta k súboru s databázou
+
+    Returns:
+        sqlite3.Connection: spojenie s databázou
+    """
+    return sqlite3.connect(cesta, check_same_thread=False)
+
+
+def _identifikator(nazov):
+    """Ohraničí názov tabuľky úvodzovkami, aby ho nebolo možné zameniť za časť SQL príkazu."""
+    return '"' + nazov.replace('"', '""') + '"'
+
+
+def urci_tabulku_vysledkov(tabulka=None, shard=None):
+    """
+    Určí názov tabuľky výsledkov. Pri spracovaní shardu sa k predvolenému názvu pridá prípona '_k_N', aby shardy neprepisovali svoje výsledky.
+
+    Args:
+        tabulka (str, optional): explicitne zadaný názov tabuľky
+        shard (Tuple[int, int], optional): číslo spracúvaného shardu a celkový počet shardov
+
+    Returns:
+        str: názov tabuľky výsledkov
+    """
+    if tabulka is not None:
+        return tabulka
+    if shard is not None:
+        return f"{PREDVOLENA_TABULKA_VYSLEDKOV}_{shard[0]}_{shard[1]}"
+    return PREDVOLENA_TABULKA_VYSLEDKOV
+
+
+def vykonaj_dotaz(connection, dotaz=PREDVOLENY_DOTAZ):
+    """
+    Spustí dotaz na načítanie hospitalizačných prípadov a skontroluje počet vrátených stĺpcov.
+
+    Dotaz musí vracať stĺpce id, vek, hmotnost, umela_plucna_ventilacia, diagnozy, vykony a drg v tomto poradí.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s databázou
+        dotaz (str, optional): dotaz na načítanie prípadov
+
+    Raises:
+        sqlite3.Error: dotaz nie je možné vykonať
+        ValueError: dotaz nevracia očakávaný počet stĺpcov
+
+    Returns:
+        sqlite3.Cursor: kurzor s výsledkom dotazu
+    """
+    cursor = connection.execute(dotaz)
+    if cursor.description is None or len(cursor.description) != len(NAZVY_STLPCOV):
+        cursor.close()
+        raise ValueError(
+            f"Dotaz musí vracať {len(NAZVY_STLPCOV)} stĺpcov v poradí {', '.join(NAZVY_STLPCOV)}."
+        )
+    return cursor
+
+
+def _na_retazec(hodnota):
+    """Prevedie hodnotu z databázy na reťazec, ako by bola zapísaná v csv súbore. Celé čísla uložené ako REAL, napr. 45.0, sa zapíšu bez desatinnej časti."""
+    if hodnota is None:
+        return ""
+    if isinstance(hodnota, float) and hodnota.is_integer():
+        return str(int(hodnota))
+    return str(hodnota)
+
+
+def citaj_z_databazy(cursor, velkost_davky=VELKOST_DAVKY_DATABAZY):
+    """
+    Postupne načíta hospitalizačné prípady z výsledku dotazu po dávkach.
+
+    Hodnoty sa prevedú na reťazce rovnako, ako by boli načítané z csv súboru, hodnota NULL na prázdny reťazec a celé čísla uložené ako REAL bez desatinnej časti.
+
+    Args:
+        cursor (sqlite3.Cursor): kurzor vytvorený funkciou vykonaj_dotaz
+        velkost_davky (int, optional): počet riadkov načítaných naraz
+
+    Yields:
+        dict: hospitalizačný prípad v rovnakom tvare, ako ho vracia čítač dát
+    """
+    try:
+        while riadky := cursor.fetchmany(velkost_davky):
+            for riadok in riadky:
+                yield {
+                    nazov: _na_retazec(hodnota)
+                    for nazov, hodnota in zip(NAZVY_STLPCOV, riadok)
+                }
+    finally:
+        cursor.close()
+
+
+def priprav_tabulku_vysledkov(connection, tabulka):
+    """
+    Vytvorí tabuľku výsledkov so stĺpcami id a ms, prípadne vymaže výsledky predchádzajúceho spracovania.
+
+    Existujúca tabuľka sa vymaže, iba ak má práve stĺpce id a ms, aby sa omylom nevymazala napr. tabuľka so vstupnými dátami.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s databázou
+        tabulka (str): názov tabuľky výsledkov
+
+    Raises:
+        ValueError: tabuľka už existuje a nemá stĺpce id a ms
+
+    Returns:
+        None
+    """
+    stlpce = [
+        stlpec[1]
+        for stlpec in connection.execute(
+            f"PRAGMA table_info({_identifikator(tabulka)})"
+        )
+    ]
+    if stlpce and stlpce != STLPCE_TABULKY_VYSLEDKOV:
+        raise ValueError(
+            f"Tabuľka {tabulka} už existuje a nemá iba stĺpce {', '.join(STLPCE_TABULKY_VYSLEDKOV)}, výsledky do nej nie je možné zapísať. Zadajte inú tabuľku prepínačom --tabulka."
+        )
+
+    with connection:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {_identifikator(tabulka)} (id TEXT, ms TEXT)"
+        )
+        connection.execute(f"DELETE FROM {_identifikator(tabulka)}")
+
+
+def zapis_do_databazy(connection, tabulka, vysledky):
+    """
+    Zapíše dávku výsledkov do tabuľky výsledkov v jednej transakcii.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s databázou
+        tabulka (str): názov tabuľky výsledkov
+        vysledky (List[Tuple[str, str]]): dvojice (id, ms)
+
+    Returns:
+        None
+    """
+    with connection:
+        connection.executemany(
+            f"INSERT INTO {_identifikator(tabulka)} (id, ms) VALUES (?, ?)", vysledky
+        )
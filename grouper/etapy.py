@@ -0,0 +1,135 @@
+"""
+Funkcie na spracovanie v etapách (čítanie, vyhodnocovanie, zápis), ktoré bežia súčasne v samostatných vláknach a odovzdávajú si dávky cez ohraničené fronty.
+
+Čakanie na disk alebo sieťové úložisko sa tak prekrýva s vyhodnocovaním prípadov. Spotreba pamäte je ohraničená hĺbkou front. Každá etapa si zaznamenáva počty spracovaných prípadov a čas práce a čakania, z ktorých sa na konci vypíše jej priepustnosť.
+"""
+
+import queue
+import sys
+import threading
+import time
+
+# Predvolený počet dávok, ktoré môžu čakať vo fronte medzi dvoma etapami
+HLBKA_FRONTY = 4
+
+# Interval v sekundách, po ktorom etapa pri plnej fronte skontroluje, či nemá skončiť
+_INTERVAL_KONTROLY = 0.1
+
+# Značka konca dát vo fronte
+_KONIEC = object()
+
+
+def vytvor_statistiku(nazov):
+    """
+    Vytvorí prázdnu štatistiku etapy.
+
+    Args:
+        nazov (str): názov etapy
+
+    Returns:
+        dict: štatistika etapy s nulovými počtami
+    """
+    return {
+        "nazov": nazov,
+        "pocet_davok": 0,
+        "pocet_pripadov": 0,
+        "cas_prace": 0.0,
+        "cas_cakania_na_odber": 0.0,
+        "cas_cakania_odberatela": 0.0,
+    }
+
+
+def spusti_etapu(zdroj, statistika, hlbka_fronty=HLBKA_FRONTY, pocet_pripadov=len):
+    """
+    Spustí postupné načítavanie položiek zo zdroja v samostatnom vlákne a vracia ich cez ohraničenú frontu.
+
+    Ak je fronta plná, vlákno čaká, kým odberateľ položku odoberie. Výnimka zo zdroja sa vyvolá u odberateľa. Ak odberateľ skončí predčasne, vlákno po dokončení rozpracovanej položky skončí.
+
+    Args:
+        zdroj (Iterable): položky, napr. dávky riadkov
+        statistika (dict): štatistika etapy, ktorá sa počas spracovania aktualizuje
+        hlbka_fronty (int, optional): najväčší počet položiek čakajúcich vo fronte
+        pocet_pripadov (Callable, optional): funkcia, ktorá určí počet hospitalizačných prípadov v položke
+
+    Yields:
+        položka zdroja
+    """
+    fronta = queue.Queue(maxsize=hlbka_fronty)
+    zastav = threading.Event()
+
+    def vloz(polozka):
+        zaciatok = time.perf_counter()
+        while not zastav.is_set():
+            try:
+                fronta.put(polozka, timeout=_INTERVAL_KONTROLY)
+                break
+            except queue.Full:
+                continue
+        statistika["cas_cakania_na_odber"] += time.perf_counter() - zaciatok
+
+    def pracuj():
+        polozky = iter(zdroj)
+        try:
+            while not zastav.is_set():
+                zaciatok = time.perf_counter()
+                try:
+                    polozka = next(polozky)
+                except StopIteration:
+                    break
+                statistika["cas_prace"] += time.perf_counter() - zaciatok
+                statistika["pocet_davok"] += 1
+                statistika["pocet_pripadov"] += pocet_pripadov(polozka)
+                vloz((polozka, None))
+            vloz((_KONIEC, None))
+        except BaseException as chyba:
+            vloz((None, chyba))
+        finally:
+            # Uzavretie generátora ukončí aj ním spustené procesy
+            if hasattr(polozky, "close"):
+                polozky.close()
+
+    vlakno = threading.Thread(target=pracuj, name=statistika["nazov"], daemon=True)
+    vlakno.start()
+
+    try:
+        while True:
+            zaciatok = time.perf_counter()
+            polozka, chyba = fronta.get()
+            statistika["cas_cakania_odberatela"] += time.perf_counter() - zaciatok
+            if chyba is not None:
+                raise chyba
+            if polozka is _KONIEC:
+                break
+            yield polozka
+        vlakno.join()
+    finally:
+        zastav.set()
+
+
+def vypis_statistiky(statistiky):
+    """
+    Vypíše priepustnosť etáp zoradených od prvej po poslednú na štandardný chybový výstup, aby sa nemiešala s výstupom spracovania.
+
+    Zaznamenaný čas práce etapy zahŕňa aj čakanie na predchádzajúcu etapu, pri výpise sa preto odpočíta. Etapa, ktorá najmenej čaká, obmedzuje rýchlosť celého spracovania.
+
+    Args:
+        statistiky (List[dict]): štatistiky etáp v poradí, v akom si odovzdávajú dávky
+
+    Returns:
+        None
+    """
+    cakanie_na_vstup = 0.0
+    for statistika in statistiky:
+        cas_prace = max(statistika["cas_prace"] - cakanie_na_vstup, 0.0)
+        priepustnost = (
+            f"{statistika['pocet_pripadov'] / cas_prace:.0f} prípadov/s"
+            if cas_prace > 0
+            else "-"
+        )
+        print(
+            f"Etapa {statistika['nazov']}: {statistika['pocet_pripadov']} prípadov v {statistika['pocet_davok']} dávkach, "
+            f"práca {cas_prace:.2f} s ({priepustnost}), čakanie na vstup {cakanie_na_vstup:.2f} s, "
+            f"čakanie na odber {statistika['cas_cakania_na_odber']:.2f} s",
+            file=sys.stderr,
+        )
+        cakanie_na_vstup = statistika["cas_cakania_odberatela"]
@@ -0,0 +1,200 @@
+"""
+Funkcie na vytvorenie indexu medicínskych služieb počas spracovania a na vyhľadávanie prípadov v ňom.
+
+Index je databáza SQLite s tabuľkou prípadov (číslo riadku výstupu, id) a tabuľkou dvojíc (medicínska služba, číslo riadku), ktorá je zoradená podľa medicínskej služby. Prípady s danou medicínskou službou sa tak nájdu bez čítania celého výstupu. Riadky sa do indexu vkladajú po dávkach a indexy tabuliek sa vytvoria až na konci spracovania, takže zápis spracovanie takmer nespomaľuje.
+"""
+
+import os
+import sqlite3
+from urllib.request import pathname2url
+
+from grouper.priprava_dat import urci_vystupnu_cestu
+
+# Hodnota medicínskej služby, pod ktorou sa v indexe evidujú neplatné prípady
+MS_ERROR = "ERROR"
+
+_TABULKY = [
+    "CREATE TABLE IF NOT EXISTS pripady (riadok INTEGER PRIMARY KEY, id TEXT)",
+    "CREATE TABLE IF NOT EXISTS ms_pripadov (ms TEXT, priloha TEXT, riadok INTEGER)",
+]
+
+_INDEXY = [
+    "CREATE INDEX IF NOT EXISTS ms_pripadov_ms ON ms_pripadov (ms, riadok)",
+    "CREATE INDEX IF NOT EXISTS ms_pripadov_riadok ON ms_pripadov (riadok)",
+]
+
+
+def urci_cestu_indexu(file_path, index_path=None, shard=None):
+    """
+    Určí cestu k indexu medicínskych služieb.
+
+    Ak nie je cesta zadaná explicitne, index sa zapíše vedľa vstupného súboru s príponou '_index.db', pri spracovaní shardu s príponou '_index_k_N.db', rovnako ako výstup funkciou urci_vystupnu_cestu.
+
+    Args:
+        file_path (str): cesta k vstupnému súboru
+        index_path (str, optional): explicitne zadaná cesta k indexu
+        shard (Tuple[int, int], optional): číslo spracúvaného shardu a celkový počet shardov
+
+    Returns:
+        str: cesta k indexu
+    """
+    return urci_vystupnu_cestu(file_path, index_path, shard, "index", ".db")
+
+
+def otvor_index(cesta, pocet_spracovanych=None):
+    """
+    Otvorí index na zápis. Pri novom spracovaní vymaže jeho predchádzajúci obsah, pri pokračovaní od checkpointu odstráni prípady zapísané za checkpointom.
+
+    Args:
+        cesta (str): cesta k indexu
+        pocet_spracovanych (int, optional): počet prípadov spracovaných do checkpointu, od ktorého sa pokračuje
+
+    Returns:
+        sqlite3.Connection: spojenie s indexom
+    """
+    connection = sqlite3.connect(cesta)
+    with connection:
+        if pocet_spracovanych is None:
+            connection.execute("DROP TABLE IF EXISTS pripady")
+            connection.execute("DROP TABLE IF EXISTS ms_pripadov")
+        for prikaz in _TABULKY:
+            connection.execute(prikaz)
+        if pocet_spracovanych is not None:
+            connection.execute(
+                "DELETE FROM pripady WHERE riadok > ?", (pocet_spracovanych,)
+            )
+            connection.execute(
+                "DELETE FROM ms_pripadov WHERE riadok > ?", (pocet_spracovanych,)
+            )
+    return connection
+
+
+def otvor_index_na_citanie(cesta):
+    """
+    Otvorí existujúci index iba na čítanie.
+
+    Args:
+        cesta (str): cesta k indexu
+
+    Raises:
+        sqlite3.Error: index neexistuje alebo ho nie je možné otvoriť
+
+    Returns:
+        sqlite3.Connection: spojenie s indexom
+    """
+    return sqlite3.connect(
+        f"file:{pathname2url(os.path.abspath(cesta))}?mode=ro", uri=True
+    )
+
+
+def zapis_do_indexu(connection, davka, vysledky, prvy_riadok):
+    """
+    Vloží do indexu dávku vyhodnotených prípadov. Zmeny sa uložia až funkciou uloz_index.
+
+    Každá kombinácia medicínskej služby a prílohy sa pri prípade zapíše najviac raz, neplatné prípady sa zapíšu s medicínskou službou 'ERROR'.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s indexom
+        davka (List[dict]): riadky načítané čítačom dát
+        vysledky (List[Tuple[str, List[Tuple[str, str]]]]): výsledky vyhodnotenia dávky
+        prvy_riadok (int): číslo riadku výstupu prvého prípadu dávky, riadky sa číslujú od 1 bez hlavičky
+
+    Returns:
+        None
+    """
+    connection.executemany(
+        "INSERT INTO pripady (riadok, id) VALUES (?, ?)",
+        (
+            (riadok, hospitalizacny_pripad["id"])
+            for riadok, hospitalizacny_pripad in enumerate(davka, start=prvy_riadok)
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO ms_pripadov (ms, priloha, riadok) VALUES (?, ?, ?)",
+        (
+            (sluzba, priloha, riadok)
+            for riadok, (_, sluzby) in enumerate(vysledky, start=prvy_riadok)
+            for priloha, sluzba in (
+                dict.fromkeys(sluzby) if sluzby is not None else [("", MS_ERROR)]
+            )
+        ),
+    )
+
+
+def uloz_index(connection):
+    """
+    Uloží do indexu všetky vložené prípady, napr. pred zápisom checkpointu.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s indexom
+
+    Returns:
+        None
+    """
+    connection.commit()
+
+
+def dokonci_index(connection):
+    """
+    Uloží vložené prípady a vytvorí indexy tabuliek na rýchle vyhľadávanie podľa medicínskej služby.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s indexom
+
+    Returns:
+        None
+    """
+    with connection:
+        for prikaz in _INDEXY:
+            connection.execute(prikaz)
+    connection.execute("ANALYZE")
+
+
+def hladaj_pripady(connection, sluzby, aspon_jedna=False, s_inou=False):
+    """
+    Vyhľadá v indexe prípady podľa priradených medicínskych služieb.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s indexom
+        sluzby (List[str]): kódy medicínskych služieb, napr. ['S12-04'], prípadne 'ERROR'
+        aspon_jedna (bool, optional): vyhľadaj prípady s aspoň jednou zo zadaných medicínskych služieb. Štandardne sa vyhľadajú prípady so všetkými zadanými službami.
+        s_inou (bool, optional): vyhľadaj iba prípady, ktoré majú okrem zadaných aj inú medicínsku službu
+
+    Returns:
+        sqlite3.Cursor: dvojice (číslo riadku výstupu, id) zoradené podľa čísla riadku
+    """
+    sluzby = list(dict.fromkeys(sluzby))
+    zastupne = ", ".join("?" * len(sluzby))
+    dotaz = (
+        f"SELECT ms_pripadov.riadok, pripady.id FROM ms_pripadov "
+        f"JOIN pripady ON pripady.riadok = ms_pripadov.riadok "
+        f"WHERE ms_pripadov.ms IN ({zastupne}) "
+    )
+    parametre = list(sluzby)
+    if s_inou:
+        dotaz += (
+            f"AND EXISTS (SELECT 1 FROM ms_pripadov AS ine WHERE ine.riadok = ms_pripadov.riadok "
+            f"AND ine.ms NOT IN ({zastupne})) "
+        )
+        parametre += sluzby
+    dotaz += "GROUP BY ms_pripadov.riadok "
+    if not aspon_jedna:
+        dotaz += "HAVING COUNT(DISTINCT ms_pripadov.ms) = ? "
+        parametre.append(len(sluzby))
+    dotaz += "ORDER BY ms_pripadov.riadok"
+    return connection.execute(dotaz, parametre)
+
+
+def prehlad_indexu(connection):
+    """
+    Zistí počty prípadov podľa medicínskej služby.
+
+    Args:
+        connection (sqlite3.Connection): spojenie s indexom
+
+    Returns:
+        List[Tuple[str, int]]: dvojice (medicínska služba, počet prípadov) zoradené podľa medicínskej služby
+    """
+    return connection.execute(
+        "SELECT ms, COUNT(DISTINCT riadok) FROM ms_pripadov GROUP BY ms ORDER BY ms"
+    ).fetchall()
@@ -1,5 +1,19 @@
 import re
 
+NEPLATNE_ZNAKY_KODU = re.compile("[^0-9a-zA-Z]")
+NEPLATNE_ZNAKY_ZOZNAMU = re.compile("[^0-9a-zA-Z~]")
+LOKALIZACIA_A_DATUM = re.compile("&[^~]*")
+
 
 def zjednot_kod(kod):
-    return re.sub("[^0-9a-zA-Z]", "", kod).lower()
+    return NEPLATNE_ZNAKY_KODU.sub("", kod).lower()
+
+
+def zjednot_kody(kody):
+    # Zjednotí naraz všetky kódy v zozname oddelenom znakom '~', výsledok je rovnaký ako pri zjednotení každého kódu zvlášť
+    return NEPLATNE_ZNAKY_ZOZNAMU.sub("", kody).lower().split("~")
+
+
+def odstran_lokalizaciu_a_datum(vykony):
+    # Zo zoznamu výkonov v tvare kod_vykonu&lokalizacia&datum_vykonu oddelených znakom '~' ponechá iba kódy výkonov
+    return LOKALIZACIA_A_DATUM.sub("", vykony)
@@ -0,0 +1,396 @@
+"""
+Funkcie na diferenciálne porovnanie spôsobov vyhodnocovania (enginov) so zmrazenou referenčnou implementáciou.
+
+Generuje náhodné aj hraničné hospitalizačné prípady, porovnáva výsledky enginov s referenciou pri všetkých kombináciách prepínačov a nájdený rozdiel zmenšuje na minimálny prípad, na ktorom sa rozdiel stále prejaví.
+"""
+
+import csv
+import io
+import random
+from contextlib import redirect_stdout
+from itertools import product
+
+from grouper.priprava_dat import NAZVY_STLPCOV
+from grouper import referencia
+
+# Všetky kombinácie prepínačov (vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity)
+KOMBINACIE_PREPINACOV = list(product([False, True], repeat=3))
+
+
+def _zoznam_kodov(*stlpce):
+    """Vráti zoradený zoznam rôznych kódov zo zadaných dvojíc (názov tabuľky, názov stĺpca) referenčných príloh."""
+    return sorted(
+        {
+            riadok[stlpec]
+            for nazov_tabulky, stlpec in stlpce
+            for riadok in referencia.tabulky[nazov_tabulky]
+        }
+        - {""}
+    )
+
+
+DIAGNOZY = _zoznam_kodov(
+    ("p5_kriterium_paliativna_starostlivost", "kod_diagnozy"),
+    ("p5_tazke_problemy_u_novorodencov", "kod_diagnozy"),
+    ("p10_DD", "kod_hlavnej_diagnozy"),
+    ("p10_DD", "kod_vedlajsej_diagnozy"),
+    ("p14_D_deti", "kod_hlavnej_diagnozy"),
+    ("p15_D_dospeli", "kod_hlavnej_diagnozy"),
+    ("p16_koma", "kod_diagnozy"),
+    ("p16_opuch_mozgu", "kod_diagnozy"),
+    ("p16_vybrane_ochorenia", "kod_diagnozy"),
+) + ["s020", "s065", "s099", "s100", "z000"]
+
+VYKONY = _zoznam_kodov(
+    ("p5_kriterium_nekonvencna_upv", "kod_vykonu"),
+    ("p5_kriterium_potreba_vymennej_transfuzie", "kod_vykonu"),
+    ("p5_kriterium_riadena_hypotermia", "kod_vykonu"),
+    ("p5_signifikantne_OP", "kod_vykonu"),
+    ("p7_VV_deti", "kod_hlavneho_vykonu"),
+    ("p7_vedlajsie_vykony", "kod_vykonu"),
+    ("p8_VV_dospeli", "kod_hlavneho_vykonu"),
+    ("p8_vedlajsie_vykony", "kod_vykonu"),
+    ("p9_VD_deti", "kod_hlavneho_vykonu"),
+    ("p9_VD_dospeli", "kod_hlavneho_vykonu"),
+    ("p12_V_deti", "kod_hlavneho_vykonu"),
+    ("p13_V_dospeli", "kod_hlavneho_vykonu"),
+    ("p17", "kod_hlavneho_vykonu"),
+) + ["93083", "11111"]
+
+DRG = _zoznam_kodov(("p5_NOV", "drg"), ("p6_DRGD_deti", "drg")) + ["a", "e", "i"]
+
+VEKY = ["0", "1", "17", "18", "19", "45", "90", "", "x", "-1", "150"]
+HMOTNOSTI = ["0", "0", "99", "100", "450", "499", "500", "3200", "20000", "20001", ""]
+UPV = ["0", "0", "24", "95", "96", "97", "10000", "10001", ""]
+
+
+def _kod_na_vstup(rng, kod):
+    """Zapíše kód tak, ako sa môže vyskytnúť vo vstupných dátach (veľké písmená, bodka)."""
+    if rng.random() < 0.5:
+        kod = kod.upper()
+    if len(kod) > 3 and rng.random() < 0.2:
+        kod = f"{kod[:3]}.{kod[3:]}"
+    return kod
+
+
+def _vykon_na_vstup(rng, kod):
+    """Zapíše kód výkonu s lokalizáciou a dátumom, ako sa uvádza vo vstupných dátach."""
+    kod = _kod_na_vstup(rng, kod)
+    return rng.choice([kod, f"{kod}&Z&20240101", f"{kod}&L&20240615", f"{kod}&&"])
+
+
+def _nahodny_riadok(rng, tabulky):
+    """Vytvorí náhodný riadok so zameraním na niektorú z príloh a s náhodnými hraničnými hodnotami."""
+    diagnozy = [rng.choice(DIAGNOZY) for _ in range(rng.randint(0, 6))]
+    vykony = [rng.choice(VYKONY) for _ in range(rng.randint(0, 6))]
+    drg = rng.choice(DRG) + rng.choice(["", "01a", "67d", "12z"])
+
+    scenar = rng.randrange(9)
+    if scenar == 0:
+        # príloha 7 a 8: hlavný výkon s vedľajším výkonom z tej istej skupiny
+        nazov = rng.choice(["p7", "p8"])
+        hlavny = rng.choice(tabulky["p7_VV_deti" if nazov == "p7" else "p8_VV_dospeli"])
+        vedlajsie = [
+            r["kod_vykonu"]
+            for r in tabulky[f"{nazov}_vedlajsie_vykony"]
+            if r["kod_ms"] == hlavny["kod_ms"]
+        ]
+        vykony = [hlavny["kod_hlavneho_vykonu"]] + vykony
+        if vedlajsie:
+            vykony.insert(rng.randint(1, len(vykony)), rng.choice(vedlajsie))
+    elif scenar == 1:
+        # príloha 9: hlavný výkon a hlavná diagnóza zo skupiny diagnóz
+        riadok = rng.choice(tabulky[rng.choice(["p9_VD_deti", "p9_VD_dospeli"])])
+        skupina = [
+            r["kod_hlavnej_diagnozy"]
+            for r in tabulky["p9_skupiny_diagnoz"]
+            if r["skupina_diagnoz"] == riadok["skupina_diagnoz"]
+        ]
+        vykony = [riadok["kod_hlavneho_vykonu"]] + vykony
+        if skupina:
+            diagnozy = [rng.choice(skupina) + rng.choice(["", "0", "9"])] + diagnozy
+    elif scenar == 2:
+        # príloha 10: kombinácia hlavnej a vedľajšej diagnózy
+        riadok = rng.choice(tabulky["p10_DD"])
+        diagnozy = [riadok["kod_hlavnej_diagnozy"]] + diagnozy
+        diagnozy.insert(rng.randint(1, len(diagnozy)), riadok["kod_vedlajsej_diagnozy"])
+    elif scenar == 3:
+        # príloha 16: diagnóza z každej skupiny
+        diagnozy += [
+            rng.choice(tabulky[nazov])
+            for nazov in [
+                "p16_koma_diagnozy",
+                "p16_opuch_mozgu_diagnozy",
+                "p16_vybrane_ochorenia_diagnozy",
+            ]
+        ]
+        rng.shuffle(diagnozy)
+    elif scenar == 4:
+        # príloha 5: skupina NOV s doplňujúcimi kritériami
+        drg = rng.choice(tabulky["p5_NOV"])["drg"] + rng.choice(["", "01a", "67d"])
+        diagnozy += rng.sample(
+            tabulky["p5_tazke_problemy_u_novorodencov_diagnozy"], rng.randint(0, 3)
+        )
+        vykony += [
+            rng.choice(tabulky[nazov])
+            for nazov in [
+                "p5_signifikantne_OP_vykony",
+                "p5_kriterium_riadena_hypotermia_vykony",
+                "p5_kriterium_nekonvencna_upv_vykony",
+            ]
+            if rng.random() < 0.3
+        ]
+    elif scenar == 5:
+        # príloha 6: skupina začínajúca na W s kraniocerebrálnou traumou aj bez nej
+        drg = "w" + rng.choice(["", "01a", "61b"])
+    elif scenar == 6:
+        # príloha 17: analytický hlavný výkon
+        vykony = [rng.choice(tabulky["p17"])["kod_hlavneho_vykonu"]] + vykony
+    elif scenar == 7:
+        # dlhý zoznam výkonov s opakovaniami
+        vykony = [rng.choice(VYKONY) for _ in range(rng.randint(30, 150))]
+        vykony += rng.sample(vykony, min(len(vykony), 10))
+
+    vykony_vstup = "~".join(_vykon_na_vstup(rng, vykon) for vykon in vykony)
+    if vykony_vstup and rng.random() < 0.15:
+        # chýbajúci hlavný výkon
+        vykony_vstup = "~" + vykony_vstup
+
+    return {
+        "id": "" if rng.random() < 0.03 else f"hp{rng.randrange(10**9)}",
+        "vek": rng.choice(VEKY),
+        "hmotnost": rng.choice(HMOTNOSTI),
+        "umela_plucna_ventilacia": rng.choice(UPV),
+        "diagnozy": "~".join(_kod_na_vstup(rng, d) for d in diagnozy),
+        "vykony": vykony_vstup,
+        "drg": "" if rng.random() < 0.05 else _kod_na_vstup(rng, drg),
+    }
+
+
+def hranicne_pripady():
+    """
+    Vráti pevný zoznam hraničných hospitalizačných prípadov.
+
+    Returns:
+        List[dict]: riadky v tvare načítanom čítačom dát
+    """
+    zaklad = {
+        "id": "hranicny",
+        "vek": "0",
+        "hmotnost": "3200",
+        "umela_plucna_ventilacia": "0",
+        "diagnozy": "P073~P220~P291",
+        "vykony": "8p107&Z&20240101~8q902",
+        "drg": "P67D",
+    }
+    zmeny = [
+        {},
+        {"vykony": "~8p107&Z&20240101~8q902"},
+        {"vykony": "~"},
+        {"vykony": ""},
+        {"vek": ""},
+        {"vek": "18"},
+        {"vek": "19"},
+        {"hmotnost": "499"},
+        {"hmotnost": "500"},
+        {"hmotnost": "0"},
+        {"umela_plucna_ventilacia": "95"},
+        {"umela_plucna_ventilacia": "96"},
+        {"drg": "W01A", "diagnozy": "S065~S100"},
+        {"drg": "W01A", "diagnozy": "Z000"},
+        {"drg": "W"},
+        {"drg": ""},
+        {"diagnozy": ""},
+        {"id": ""},
+        {"vykony": "~".join(["93083", "5t600", "93041"] * 60)},
+    ]
+    return [{**zaklad, **zmena} for zmena in zmeny]
+
+
+def generuj_pripady(pocet, seed=0):
+    """
+    Vygeneruje hraničné a náhodné hospitalizačné prípady.
+
+    Args:
+        pocet (int): počet náhodných prípadov
+        seed (int, optional): počiatočná hodnota generátora náhodných čísel
+
+    Returns:
+        List[dict]: riadky v tvare načítanom čítačom dát
+    """
+    rng = random.Random(seed)
+    return hranicne_pripady() + [
+        _nahodny_riadok(rng, referencia.tabulky) for _ in range(pocet)
+    ]
+
+
+def _bez_hlaseni():
+    """Potlačí hlásenia vypisované počas vyhodnocovania."""
+    return redirect_stdout(io.StringIO())
+
+
+def vyhodnot_referenciou(riadky, prepinace):
+    """
+    Vyhodnotí riadky referenčnou implementáciou.
+
+    Args:
+        riadky (List[dict]): riadky v tvare načítanom čítačom dát
+        prepinace (Tuple[bool, bool, bool]): vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+
+    Returns:
+        List[str]: hodnoty stĺpca 'ms'
+    """
+    with _bez_hlaseni():
+        return [referencia.vyhodnot_hp_referencne(r, *prepinace) for r in riadky]
+
+
+def vyhodnot_enginom(engine, riadky, prepinace):
+    """
+    Vyhodnotí riadky zadaným enginom na kópii vstupu.
+
+    Args:
+        engine (Callable): funkcia (riadky, vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity) -> List[str]
+        riadky (List[dict]): riadky v tvare načítanom čítačom dát
+        prepinace (Tuple[bool, bool, bool]): vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+
+    Returns:
+        List[str]: hodnoty stĺpca 'ms'
+    """
+    with _bez_hlaseni():
+        return engine([dict(r) for r in riadky], *prepinace)
+
+
+def _zmensi_zoznam(prvky, zlyha):
+    """
+    Zmenší zoznam odoberaním čoraz menších úsekov, pokiaľ podmienka zlyhania stále platí.
+
+    Args:
+        prvky (list): pôvodný zoznam
+        zlyha (Callable[[list], bool]): podmienka zlyhania
+
+    Returns:
+        list: zmenšený zoznam
+    """
+    velkost = max(len(prvky) // 2, 1)
+    while prvky and velkost >= 1:
+        zmenseny = False
+        zaciatok = 0
+        while zaciatok < len(prvky):
+            kandidat = prvky[:zaciatok] + prvky[zaciatok + velkost :]
+            if zlyha(kandidat):
+                prvky = kandidat
+                zmenseny = True
+            else:
+                zaciatok += velkost
+        if not zmenseny:
+            velkost //= 2
+    return prvky
+
+
+def zmensi_pripad(riadky, zlyha):
+    """
+    Zmenší neúspešný vstup na minimálny: najprv počet riadkov, potom zoznamy diagnóz a výkonov a nakoniec jednotlivé hodnoty.
+
+    Args:
+        riadky (List[dict]): riadky, na ktorých sa prejavil rozdiel
+        zlyha (Callable[[List[dict]], bool]): podmienka zlyhania pre zoznam riadkov
+
+    Returns:
+        List[dict]: zmenšené riadky
+    """
+    riadky = _zmensi_zoznam(riadky, zlyha)
+
+    for i in range(len(riadky)):
+
+        def zlyha_s(zmena):
+            return zlyha(riadky[:i] + [{**riadky[i], **zmena}] + riadky[i + 1 :])
+
+        for pole in ["diagnozy", "vykony"]:
+            polozky = riadky[i][pole].split("~") if riadky[i][pole] else []
+            polozky = _zmensi_zoznam(
+                polozky, lambda kandidat: zlyha_s({pole: "~".join(kandidat)})
+            )
+            riadky[i] = {**riadky[i], pole: "~".join(polozky)}
+
+        zjednodusenia = [
+            {"id": "x"},
+            {"vek": "45"},
+            {"vek": "0"},
+            {"hmotnost": "0"},
+            {"umela_plucna_ventilacia": "0"},
+            {"drg": ""},
+            {
+                "vykony": "~".join(
+                    v.split("&")[0] for v in riadky[i]["vykony"].split("~")
+                )
+            },
+        ]
+        for zmena in zjednodusenia:
+            if {**riadky[i], **zmena} != riadky[i] and zlyha_s(zmena):
+                riadky[i] = {**riadky[i], **zmena}
+
+    return riadky
+
+
+def porovnaj_engine(engine, riadky, prepinace, ocakavane=None):
+    """
+    Porovná výsledky enginu s referenciou a pri rozdiele nájde minimálny vstup, na ktorom sa rozdiel prejaví.
+
+    Args:
+        engine (Callable): funkcia (riadky, vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity) -> List[str]
+        riadky (List[dict]): riadky v tvare načítanom čítačom dát
+        prepinace (Tuple[bool, bool, bool]): vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+        ocakavane (List[str], optional): už vypočítané výsledky referencie pre riadky
+
+    Returns:
+        dict: popis rozdielu s kľúčmi riadky, ocakavane, skutocne; None, ak sa výsledky zhodujú
+    """
+    if ocakavane is None:
+        ocakavane = vyhodnot_referenciou(riadky, prepinace)
+
+    def zlyha(kandidat):
+        if not kandidat:
+            return False
+        try:
+            skutocne = vyhodnot_enginom(engine, kandidat, prepinace)
+        except Exception:
+            return True
+        return skutocne != vyhodnot_referenciou(kandidat, prepinace)
+
+    try:
+        skutocne = vyhodnot_enginom(engine, riadky, prepinace)
+    except Exception as chyba:
+        skutocne = [repr(chyba)]
+    if skutocne == ocakavane:
+        return None
+
+    # Ak sa rozdiel prejaví na jednom riadku, zmenšuje sa iba tento riadok
+    rozdielne = [
+        r for r, o, s in zip(riadky, ocakavane, skutocne) if o != s and zlyha([r])
+    ]
+    minimalne = zmensi_pripad(rozdielne[:1] if rozdielne else list(riadky), zlyha)
+
+    try:
+        skutocne = vyhodnot_enginom(engine, minimalne, prepinace)
+    except Exception as chyba:
+        skutocne = [repr(chyba)]
+    return {
+        "riadky": minimalne,
+        "ocakavane": vyhodnot_referenciou(minimalne, prepinace),
+        "skutocne": skutocne,
+    }
+
+
+def zapis_riadky(riadky, file):
+    """
+    Zapíše riadky vo formáte vstupného súboru (bez hlavičky, oddeľovač ';').
+
+    Args:
+        riadky (List[dict]): riadky v tvare načítanom čítačom dát
+        file (file_handle): prístup k výstupnému súboru
+
+    Returns:
+        None
+    """
+    writer = csv.writer(file, delimiter=";", lineterminator="\n")
+    writer.writerows([[r[stlpec] for stlpec in NAZVY_STLPCOV] for r in riadky])
@@ -0,0 +1,262 @@
+"""
+Funkcie na priebežné hlásenie stavu dlhého spracovania na štandardný chybový výstup alebo do stavového súboru.
+
+Hlásenie obsahuje počet spracovaných prípadov, počet prečítaných bajtov z celkovej veľkosti vstupu, rýchlosť spracovania od začiatku aj za posledné obdobie, odhad zostávajúceho času, počty prípadov ERROR a S99-99 a spotrebu pamäte. Hlásenie sa vytvára najviac raz za zadaný interval, takže spomalenie spracovania je zanedbateľné.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+try:
+    import resource
+except ImportError:
+    # Modul resource nie je dostupný na Windows
+    resource = None
+
+# Predvolený interval medzi hláseniami v sekundách
+INTERVAL_PRIEBEHU = 10
+
+# Obdobie v sekundách, za ktoré sa počíta aktuálna rýchlosť spracovania
+OKNO_RYCHLOSTI = 60
+
+
+def vytvor_priebeh(
+    velkost_vstupu=None,
+    zisti_precitane_bajty=None,
+    interval=INTERVAL_PRIEBEHU,
+    cesta=None,
+    json_format=False,
+    pocet_na_zaciatku=0,
+    bajty_na_zaciatku=0,
+):
+    """
+    Vytvorí stav priebežného hlásenia.
+
+    Args:
+        velkost_vstupu (int, optional): veľkosť vstupného súboru v bajtoch, ak je známa
+        zisti_precitane_bajty (Callable[[], int], optional): funkcia, ktorá vráti pozíciu čítania vo vstupnom súbore v bajtoch, volá sa v etape čítania
+        interval (float, optional): najkratší čas medzi dvoma hláseniami v sekundách
+        cesta (str, optional): cesta k stavovému súboru, do ktorého sa zapisuje posledné hlásenie vo formáte JSON. Štandardne sa hlásenia vypisujú na štandardný chybový výstup.
+        json_format (bool, optional): na štandardný chybový výstup vypisuj hlásenia vo formáte JSON, jedno na riadok
+        pocet_na_zaciatku (int, optional): počet prípadov spracovaných pred začiatkom tohto spracovania, napr. pri pokračovaní od checkpointu
+        bajty_na_zaciatku (int, optional): pozícia vo vstupnom súbore, od ktorej sa začalo čítať
+
+    Returns:
+        dict: stav priebežného hlásenia
+    """
+    teraz = time.monotonic()
+    return {
+        "velkost_vstupu": velkost_vstupu,
+        "zisti_precitane_bajty": zisti_precitane_bajty,
+        "interval": interval,
+        "cesta": cesta,
+        "json_format": json_format,
+        "zaciatok": teraz,
+        "pocet_na_zaciatku": pocet_na_zaciatku,
+        "posledne_hlasenie": teraz,
+        "bajty_na_zaciatku": bajty_na_zaciatku,
+        "nacitane_bajty": None,
+        "nacitane_pripady": 0,
+        # Dvojice (čas, počet prípadov) na výpočet rýchlosti za posledné obdobie
+        "vzorky": deque([(teraz, pocet_na_zaciatku)]),
+    }
+
+
+def zisti_pamat():
+    """
+    Zistí spotrebu pamäte hlavného procesu v bajtoch.
+
+    Na Linuxe vráti aktuálnu veľkosť rezidentnej pamäte, inde maximálnu dosiahnutú, ak je ju možné zistiť.
+
+    Returns:
+        int: spotreba pamäte v bajtoch, None ak ju nie je možné zistiť
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if resource is None:
+        return None
+    maximum = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Na macOS je hodnota v bajtoch, inde v kilobajtoch
+    return maximum if sys.platform == "darwin" else maximum * 1024
+
+
+def _precitane_bajty(priebeh):
+    """Zistí pozíciu čítania vo vstupnom súbore, ak je to možné, napr. nie pri čítaní z rúry."""
+    if priebeh["zisti_precitane_bajty"] is None:
+        return None
+    try:
+        return priebeh["zisti_precitane_bajty"]()
+    except (OSError, ValueError):
+        return None
+
+
+def sleduj_nacitanie(davky, priebeh):
+    """
+    Ku každej načítanej dávke zaznamená počet načítaných prípadov a pozíciu čítania vo vstupnom súbore.
+
+    Funkcia sa spúšťa v etape čítania, pozícia sa teda zisťuje v tom istom vlákne, v ktorom sa zo súboru číta.
+
+    Args:
+        davky (Iterable[List[dict]]): dávky riadkov
+        priebeh (dict): stav priebežného hlásenia
+
+    Yields:
+        List[dict]: dávka riadkov
+    """
+    for davka in davky:
+        priebeh["nacitane_pripady"] += len(davka)
+        priebeh["nacitane_bajty"] = _precitane_bajty(priebeh)
+        yield davka
+
+
+def vytvor_hlasenie(priebeh, sumar, dokoncene=False):
+    """
+    Vytvorí hlásenie o aktuálnom stave spracovania.
+
+    Args:
+        priebeh (dict): stav priebežného hlásenia
+        sumar (dict): súhrnné počty spracovaných prípadov
+        dokoncene (bool, optional): spracovanie je dokončené
+
+    Returns:
+        dict: hlásenie, ktoré je možné uložiť ako JSON
+    """
+    teraz = time.monotonic()
+    pocet = sumar["pocet_pripadov"]
+    precitane = priebeh["nacitane_bajty"]
+
+    vzorky = priebeh["vzorky"]
+    vzorky.append((teraz, pocet))
+    while len(vzorky) > 1 and teraz - vzorky[1][0] >= OKNO_RYCHLOSTI:
+        vzorky.popleft()
+
+    trvanie = teraz - priebeh["zaciatok"]
+    rychlost = (pocet - priebeh["pocet_na_zaciatku"]) / trvanie if trvanie > 0 else None
+    cas_okna, pocet_okna = vzorky[0]
+    rychlost_okno = (
+        (pocet - pocet_okna) / (teraz - cas_okna) if teraz > cas_okna else None
+    )
+
+    # Načítanie vstupu predbieha vyhodnocovanie, zostávajúci čas sa preto odhaduje podľa časti vstupu,
+    # ktorá zodpovedá už spracovaným prípadom, pri priemernej veľkosti načítaného prípadu
+    velkost = priebeh["velkost_vstupu"]
+    zostava = None
+    if dokoncene:
+        zostava = 0.0
+    elif velkost and precitane is not None and priebeh["nacitane_pripady"] > 0:
+        spracovane_bajty = (
+            (precitane - priebeh["bajty_na_zaciatku"])
+            * (pocet - priebeh["pocet_na_zaciatku"])
+            / priebeh["nacitane_pripady"]
+        )
+        if spracovane_bajty > 0:
+            zostava = (
+                (velkost - priebeh["bajty_na_zaciatku"] - spracovane_bajty)
+                * trvanie
+                / spracovane_bajty
+            )
+
+    return {
+        "cas": datetime.now().isoformat(timespec="seconds"),
+        "dokoncene": dokoncene,
+        "pocet_pripadov": pocet,
+        "precitane_bajty": precitane,
+        "velkost_vstupu": velkost,
+        "percento": (
+            round(100 * precitane / velkost, 1)
+            if velkost and precitane is not None
+            else None
+        ),
+        "trvanie_s": round(trvanie, 1),
+        "pripadov_za_sekundu": round(rychlost, 1) if rychlost is not None else None,
+        "pripadov_za_sekundu_okno": (
+            round(rychlost_okno, 1) if rychlost_okno is not None else None
+        ),
+        "zostavajuci_cas_s": round(zostava, 1) if zostava is not None else None,
+        "pocet_error": sumar["pocet_error"],
+        "pocet_s99_99": sumar["pocet_s99_99"],
+        "pamat_bajty": zisti_pamat(),
+    }
+
+
+def _velkost(bajty):
+    """Naformátuje počet bajtov v MB."""
+    return f"{bajty / 1024 ** 2:.0f} MB"
+
+
+def naformatuj_hlasenie(hlasenie):
+    """
+    Naformátuje hlásenie do jedného riadku textu.
+
+    Args:
+        hlasenie (dict): hlásenie vytvorené funkciou vytvor_hlasenie
+
+    Returns:
+        str: text hlásenia
+    """
+    casti = [f"{hlasenie['pocet_pripadov']} prípadov"]
+    if hlasenie["percento"] is not None:
+        casti.append(
+            f"{hlasenie['percento']} % vstupu ({_velkost(hlasenie['precitane_bajty'])} z {_velkost(hlasenie['velkost_vstupu'])})"
+        )
+    elif hlasenie["precitane_bajty"] is not None:
+        casti.append(f"prečítaných {_velkost(hlasenie['precitane_bajty'])}")
+    if hlasenie["pripadov_za_sekundu"] is not None:
+        casti.append(f"{hlasenie['pripadov_za_sekundu']:.0f} prípadov/s")
+    if hlasenie["pripadov_za_sekundu_okno"] is not None:
+        casti.append(
+            f"za posledných {OKNO_RYCHLOSTI} s {hlasenie['pripadov_za_sekundu_okno']:.0f} prípadov/s"
+        )
+    if hlasenie["zostavajuci_cas_s"] is not None and not hlasenie["dokoncene"]:
+        casti.append(
+            f"zostáva asi {timedelta(seconds=round(hlasenie['zostavajuci_cas_s']))}"
+        )
+    casti.append(f"ERROR {hlasenie['pocet_error']}")
+    casti.append(f"S99-99 {hlasenie['pocet_s99_99']}")
+    if hlasenie["pamat_bajty"] is not None:
+        casti.append(f"pamäť {_velkost(hlasenie['pamat_bajty'])}")
+
+    stav = "Dokončené" if hlasenie["dokoncene"] else "Priebeh"
+    return f"{stav}: {', '.join(casti)}"
+
+
+def _zapis_stavovy_subor(cesta, hlasenie):
+    """Atomicky prepíše stavový súbor posledným hlásením."""
+    docasna_cesta = f"{cesta}.tmp"
+    with open(docasna_cesta, "w", encoding="utf-8") as file:
+        json.dump(hlasenie, file, ensure_ascii=False)
+    os.replace(docasna_cesta, cesta)
+
+
+def ohlas_priebeh(priebeh, sumar, dokoncene=False):
+    """
+    Vypíše alebo zapíše hlásenie o stave spracovania, ak od posledného hlásenia uplynul nastavený interval.
+
+    Args:
+        priebeh (dict): stav priebežného hlásenia
+        sumar (dict): súhrnné počty spracovaných prípadov
+        dokoncene (bool, optional): spracovanie je dokončené, hlásenie sa vytvorí vždy
+
+    Returns:
+        None
+    """
+    teraz = time.monotonic()
+    if not dokoncene and teraz - priebeh["posledne_hlasenie"] < priebeh["interval"]:
+        return
+    priebeh["posledne_hlasenie"] = teraz
+
+    hlasenie = vytvor_hlasenie(priebeh, sumar, dokoncene)
+    if priebeh["cesta"] is not None:
+        _zapis_stavovy_subor(priebeh["cesta"], hlasenie)
+    elif priebeh["json_format"]:
+        print(json.dumps(hlasenie, ensure_ascii=False), file=sys.stderr, flush=True)
+    else:
+        print(naformatuj_hlasenie(hlasenie), file=sys.stderr, flush=True)
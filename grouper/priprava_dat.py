@@ -1,7 +1,13 @@
 import csv
+import os
+import sys
 import uuid
 
-from grouper.pomocne_funkcie import zjednot_kod
+from grouper.pomocne_funkcie import (
+    zjednot_kod,
+    zjednot_kody,
+    odstran_lokalizaciu_a_datum,
+)
 
 NAZVY_STLPCOV = [
     "id",
@@ -13,6 +19,117 @@ NAZVY_STLPCOV = [
     "drg",
 ]
 
+# Stĺpce skráteného výstupu, ktorý obsahuje iba identifikátor prípadu a priradené medicínske služby
+NAZVY_STLPCOV_SKRATENEHO_VYSTUPU = ["id", "ms"]
+
+# Najmenší počet stĺpcov riadku, ktorý je možné vyhodnotiť. Chýbajúce stĺpce na konci riadku (diagnózy, výkony, drg) čítač dát doplní hodnotou None.
+MIN_POCET_STLPCOV = 4
+
+# Cesta, ktorá namiesto súboru označuje štandardný vstup, resp. výstup
+STANDARDNY_PRUD = "-"
+
+# Veľkosť vyrovnávacej pamäte pri čítaní a zápise dát v bajtoch
+VELKOST_BUFFRA = 1024 * 1024
+
+
+def validuj_vek(vek):
+    """Skontroluje a prevedie vek pacienta. Vek musí byť celé, nezáporné číslo menšie ako 150.
+
+    Args:
+        vek (str): vek pacienta v rokoch
+
+    Raises:
+        ValueError: vek nie je platný
+
+    Returns:
+        int: vek pacienta
+    """
+    vek = int(vek)
+    if not 0 <= vek < 150:
+        raise ValueError("Vek musí byť nezáporné číslo menšie ako 150")
+    return vek
+
+
+def validuj_hmotnost(hmotnost, vek):
+    """Skontroluje a prevedie hmotnosť pacienta ku dňu prijatia v gramoch.
+
+    Hmotnosť musí byť 0 alebo celé číslo medzi 100 a 20000. Hmotnosť pacienta s vekom 0 nesmie byť nulová.
+
+    Args:
+        hmotnost (str): hmotnosť pacienta v gramoch
+        vek (int): už skontrolovaný vek pacienta, prípadne None
+
+    Raises:
+        ValueError: hmotnosť nie je platná
+
+    Returns:
+        int: hmotnosť pacienta v gramoch
+    """
+    hmotnost = int(hmotnost)
+    if not 100 <= hmotnost <= 20000 and hmotnost != 0:
+        raise ValueError("Hmotnosť musí byť 0 alebo číslo medzi 100 a 20000.")
+    if vek is not None and vek == 0 and hmotnost == 0:
+        raise ValueError("Hmotnosť pacienta s vekom 0 nesmie byť nulová.")
+    return hmotnost
+
+
+def validuj_upv(upv):
+    """Skontroluje a prevedie počet hodín umelej pľúcnej ventilácie. Musí byť celé, nezáporné číslo menšie ako 10000.
+
+    Args:
+        upv (str): počet hodín umelej pľúcnej ventilácie
+
+    Raises:
+        ValueError: počet hodín nie je platný
+
+    Returns:
+        int: počet hodín umelej pľúcnej ventilácie
+    """
+    upv = int(upv)
+    if not 0 <= upv <= 10000:
+        raise ValueError(
+            "Počet hodín umelej pľúcnej ventilácie musí byť nezáporné číslo menšie ako 10000."
+        )
+    return upv
+
+
+def najdi_chybne_polia(hp):
+    """Nájde všetky povinné polia hospitalizačného prípadu, ktoré nie sú správne vyplnené.
+
+    Na rozdiel od funkcie validuj_hp sa kontrola nezastaví pri prvej chybe, hospitalizačný prípad nemení a nič nevypisuje.
+
+    Args:
+        hp (dict): Hospitalizačný prípad, ktorý sa má skontrolovať.
+
+    Returns:
+        List[str]: zoznam názvov chybných polí
+    """
+    chybne_polia = []
+
+    if hp["id"] == "":
+        chybne_polia.append("id")
+
+    try:
+        vek = validuj_vek(hp["vek"])
+    except ValueError:
+        chybne_polia.append("vek")
+        vek = None
+
+    try:
+        validuj_hmotnost(hp["hmotnost"], vek)
+    except ValueError:
+        chybne_polia.append("hmotnost")
+
+    try:
+        validuj_upv(hp["umela_plucna_ventilacia"])
+    except ValueError:
+        chybne_polia.append("umela_plucna_ventilacia")
+
+    if hp["diagnozy"] == "":
+        chybne_polia.append("diagnozy")
+
+    return chybne_polia
+
 
 def validuj_hp(hp, vyhodnot_neuplne_pripady):
     """
@@ -35,38 +152,24 @@ def validuj_hp(hp, vyhodnot_neuplne_pripady):
         hp["id"] = uuid.uuid4().hex
         print(f'WARNING: Prázdne pole "id", priraďujem nové ID: {hp["id"]}')
 
-    # Vek musí byť celé, nezáporné číslo menšie ako 150
     try:
-        hp["vek"] = int(hp["vek"])
-        if not 0 <= hp["vek"] < 150:
-            raise ValueError("Vek musí byť nezáporné číslo menšie ako 150")
+        hp["vek"] = validuj_vek(hp["vek"])
     except ValueError:
         if not vyhodnot_neuplne_pripady:
             return False
         print(f'WARNING: HP {hp["id"]} nemá správne vyplnený vek.')
         hp["vek"] = None
 
-    # Hmotnosť pacienta ku dňu prijatia v gramoch musí byť 0 alebo celé číslo medzi 100 a 20000
-    # Hmotnosť pacienta s vekom 0 nesmie byť nulová.
     try:
-        hp["hmotnost"] = int(hp["hmotnost"])
-        if not 100 <= hp["hmotnost"] <= 20000 and hp["hmotnost"] != 0:
-            raise ValueError("Hmotnosť musí byť 0 alebo číslo medzi 100 a 20000.")
-        if hp["vek"] is not None and hp["vek"] == 0 and hp["hmotnost"] == 0:
-            raise ValueError("Hmotnosť pacienta s vekom 0 nesmie byť nulová.")
+        hp["hmotnost"] = validuj_hmotnost(hp["hmotnost"], hp["vek"])
     except ValueError:
         if not vyhodnot_neuplne_pripady:
             return False
         print(f'WARNING: HP {hp["id"]} nemá správne vyplnenú hmotnosť.')
         hp["hmotnost"] = None
 
-    # Počet hodín umelej pľúcnej ventilácie musí byť celé, nezáporné číslo menšie ako 10000
     try:
-        hp["umela_plucna_ventilacia"] = int(hp["umela_plucna_ventilacia"])
-        if not 0 <= hp["umela_plucna_ventilacia"] <= 10000:
-            raise ValueError(
-                "Počet hodín umelej pľúcnej ventilácie musí byť nezáporné číslo menšie ako 10000."
-            )
+        hp["umela_plucna_ventilacia"] = validuj_upv(hp["umela_plucna_ventilacia"])
     except ValueError:
         if not vyhodnot_neuplne_pripady:
             return False
@@ -92,13 +195,9 @@ def priprav_hp(hp):
         hp (dict): hospitalizačný prípad
     """
     if hp["diagnozy"]:
-        hp["diagnozy"] = [
-            zjednot_kod(diagnoza) for diagnoza in hp["diagnozy"].split("~")
-        ]
+        hp["diagnozy"] = zjednot_kody(hp["diagnozy"])
     if hp["vykony"]:
-        hp["vykony"] = [
-            zjednot_kod(vykon.split("&")[0]) for vykon in hp["vykony"].split("~")
-        ]
+        hp["vykony"] = zjednot_kody(odstran_lokalizaciu_a_datum(hp["vykony"]))
 
     if hp["drg"]:
         hp["drg"] = zjednot_kod(hp["drg"])
@@ -123,6 +222,32 @@ def priprav_citac_dat(file):
     return csv_reader
 
 
+def skontroluj_pocet_stlpcov(riadky):
+    """Postupne vracia riadky načítané čítačom dát a skontroluje, či majú správny počet stĺpcov.
+
+    Čítač dát doplní chýbajúce polia hodnotou None a nadbytočné polia uloží pod kľúčom None. Riadok bez niektorého zo stĺpcov id, vek, hmotnost a umela_plucna_ventilacia alebo s nadbytočnými stĺpcami nie je možné vyhodnotiť. Chýbajúce stĺpce na konci riadku (diagnózy, výkony, drg) sa ponechajú prázdne.
+
+    Args:
+        riadky (Iterable[dict]): riadky načítané čítačom dát
+
+    Raises:
+        csv.Error: riadok nemá správny počet stĺpcov
+
+    Yields:
+        dict: hospitalizačný prípad
+    """
+    posledny_povinny_stlpec = NAZVY_STLPCOV[MIN_POCET_STLPCOV - 1]
+    for hp in riadky:
+        if hp[posledny_povinny_stlpec] is None or None in hp:
+            pocet_stlpcov = sum(
+                hodnota is not None for nazov, hodnota in hp.items() if nazov
+            ) + len(hp.get(None, []))
+            raise csv.Error(
+                f"očakávaných {MIN_POCET_STLPCOV} až {len(NAZVY_STLPCOV)} stĺpcov, nájdených {pocet_stlpcov}"
+            )
+        yield hp
+
+
 def priprav_zapisovac_dat(file):
     """Pripraví zapisovač dát, ktorý pre slovník s dátami zapíše riadok do csv súboru.
 
@@ -133,3 +258,125 @@ def priprav_zapisovac_dat(file):
         csv_writer: zapisovač dát
     """
     return csv.DictWriter(file, fieldnames=NAZVY_STLPCOV + ["ms"], delimiter=";")
+
+
+def urci_stlpce_vystupu(skrateny_vystup=False, s_prilohami=False):
+    """Určí stĺpce výstupného súboru.
+
+    Args:
+        skrateny_vystup (bool, optional): výstup obsahuje iba stĺpce id a ms namiesto kópie vstupu
+        s_prilohami (bool, optional): skrátený výstup obsahuje aj stĺpec 'prilohy' s číslami príloh, ktoré určili jednotlivé medicínske služby
+
+    Returns:
+        List[str]: názvy stĺpcov výstupu
+    """
+    if not skrateny_vystup:
+        return NAZVY_STLPCOV + ["ms"]
+    if s_prilohami:
+        return NAZVY_STLPCOV_SKRATENEHO_VYSTUPU + ["prilohy"]
+    return NAZVY_STLPCOV_SKRATENEHO_VYSTUPU
+
+
+def priprav_skrateny_zapisovac(file):
+    """Pripraví zapisovač skráteného výstupu, ktorý zapisuje riadky ako zoznamy hodnôt, napr. celú dávku naraz metódou writerows.
+
+    Args:
+        file (file_handle): prístup k výstupnému súboru
+
+    Returns:
+        csv_writer: zapisovač dát
+    """
+    return csv.writer(file, delimiter=";")
+
+
+def otvor_vstup(cesta):
+    """Otvorí vstupný súbor s dátami na čítanie. Pre cestu '-' použije štandardný vstup.
+
+    Args:
+        cesta (str): cesta k vstupnému súboru alebo '-'
+
+    Returns:
+        file_handle: prístup k vstupnému súboru
+    """
+    if cesta == STANDARDNY_PRUD:
+        return open(
+            sys.stdin.fileno(),
+            "r",
+            encoding="utf-8",
+            buffering=VELKOST_BUFFRA,
+            closefd=False,
+        )
+    return open(cesta, "r", encoding="utf-8", buffering=VELKOST_BUFFRA)
+
+
+def otvor_vystup(cesta, pripoj=False):
+    """Otvorí výstupný súbor na zápis s veľkou vyrovnávacou pamäťou. Pre cestu '-' použije štandardný výstup.
+
+    Args:
+        cesta (str): cesta k výstupnému súboru alebo '-'
+        pripoj (bool, optional): zapisuj na koniec existujúceho súboru
+
+    Returns:
+        file_handle: prístup k výstupnému súboru
+    """
+    if cesta == STANDARDNY_PRUD:
+        return open(
+            sys.stdout.fileno(),
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=VELKOST_BUFFRA,
+            closefd=False,
+        )
+    return open(
+        cesta,
+        "a" if pripoj else "w",
+        encoding="utf-8",
+        newline="",
+        buffering=VELKOST_BUFFRA,
+    )
+
+
+def je_rovnaky_subor(cesta, ina_cesta):
+    """Zistí, či dve cesty označujú ten istý existujúci súbor, napr. vstup zadaný aj ako výstup. Štandardný vstup a výstup sa za súbor nepovažujú.
+
+    Args:
+        cesta (str): cesta k súboru alebo '-'
+        ina_cesta (str): cesta k inému súboru alebo '-', prípadne None
+
+    Returns:
+        bool: True, ak obe cesty označujú ten istý súbor
+    """
+    if ina_cesta is None or STANDARDNY_PRUD in (cesta, ina_cesta):
+        return False
+    return (
+        os.path.exists(cesta)
+        and os.path.exists(ina_cesta)
+        and os.path.samefile(cesta, ina_cesta)
+    )
+
+
+def urci_vystupnu_cestu(
+    file_path, output_path=None, shard=None, nazov="output", pripona=".csv"
+):
+    """Určí cestu k výstupnému súboru.
+
+    Ak nie je cesta zadaná explicitne, výstup sa zapíše vedľa vstupného súboru s príponou '_output.csv', pri spracovaní shardu s príponou '_output_k_N.csv'. Pri čítaní zo štandardného vstupu sa predvolene zapisuje na štandardný výstup. Rovnako sa odvodzujú cesty k ďalším výstupom, napr. k indexu s príponou '_index.db'.
+
+    Args:
+        file_path (str): cesta k vstupnému súboru alebo '-'
+        output_path (str, optional): explicitne zadaná cesta k výstupnému súboru alebo '-'
+        shard (Tuple[int, int], optional): číslo spracúvaného shardu a celkový počet shardov
+        nazov (str, optional): názov výstupu, ktorý sa pripojí k názvu vstupného súboru
+        pripona (str, optional): prípona výstupného súboru
+
+    Returns:
+        str: cesta k výstupnému súboru alebo '-'
+    """
+    if output_path is not None:
+        return output_path
+    if file_path == STANDARDNY_PRUD:
+        return STANDARDNY_PRUD
+    if shard is not None:
+        return f"{file_path[:-4]}_{nazov}_{shard[0]}_{shard[1]}{pripona}"
+    return f"{file_path[:-4]}_{nazov}{pripona}"
@@ -1,11 +1,12 @@
 """
 Funkcie na načítanie a predspracovanie súborov s dátami z príloh.
 
-Načíta všetky prílohy zo súborov a vytvorí pomocné zoznamy pre rôzne kritériá.
+Načíta všetky prílohy zo súborov a vytvorí pomocné množiny kódov pre rôzne kritériá. Pripravené prílohy sú nemenné: tabuľky sú n-tice riadkov len na čítanie a pomocné zoznamy sú množiny frozenset, takže ich môže súčasne používať viacero vlákien.
 """
 
 import csv
 from pathlib import Path
+from types import MappingProxyType
 
 from grouper.pomocne_funkcie import zjednot_kod
 
@@ -50,46 +51,63 @@ def nacitaj_vsetky_prilohy():
 
 def priprav_pomocne_zoznamy(tabulky):
     """
-    Pripraví pomocné zoznamy pre tabuľky z príloh. Zoznamy vkladá priamo do vstupného slovníka.
+    Pripraví pomocné množiny kódov pre tabuľky z príloh. Vstupné tabuľky nemení.
 
     Args:
         tabulky (dict): Slovník obsahujúci všetky tabuľky.
 
     Returns:
-        None
+        dict: Slovník, kde kľúč je názov pomocnej množiny a hodnota je množina kódov.
     """
+    return {
+        "p5_kriterium_nekonvencna_upv_vykony": frozenset(
+            extrahuj_do_zoznamu(tabulky, "p5_kriterium_nekonvencna_upv", "kod_vykonu")
+        ),
+        "p5_kriterium_paliativna_starostlivost_diagnozy": frozenset(
+            extrahuj_do_zoznamu(
+                tabulky, "p5_kriterium_paliativna_starostlivost", "kod_diagnozy"
+            )
+        ),
+        "p5_kriterium_potreba_vymennej_transfuzie_vykony": frozenset(
+            extrahuj_do_zoznamu(
+                tabulky, "p5_kriterium_potreba_vymennej_transfuzie", "kod_vykonu"
+            )
+        ),
+        "p5_kriterium_riadena_hypotermia_vykony": frozenset(
+            extrahuj_do_zoznamu(
+                tabulky, "p5_kriterium_riadena_hypotermia", "kod_vykonu"
+            )
+        ),
+        "p5_signifikantne_OP_vykony": frozenset(
+            extrahuj_do_zoznamu(tabulky, "p5_signifikantne_OP", "kod_vykonu")
+        ),
+        "p5_tazke_problemy_u_novorodencov_diagnozy": frozenset(
+            extrahuj_do_zoznamu(
+                tabulky, "p5_tazke_problemy_u_novorodencov", "kod_diagnozy"
+            )
+        ),
+        "p16_koma_diagnozy": frozenset(
+            extrahuj_do_zoznamu(tabulky, "p16_koma", "kod_diagnozy")
+        ),
+        "p16_opuch_mozgu_diagnozy": frozenset(
+            extrahuj_do_zoznamu(tabulky, "p16_opuch_mozgu", "kod_diagnozy")
+        ),
+        "p16_vybrane_ochorenia_diagnozy": frozenset(
+            extrahuj_do_zoznamu(tabulky, "p16_vybrane_ochorenia", "kod_diagnozy")
+        ),
+    }
 
-    tabulky["p5_kriterium_nekonvencna_upv_vykony"] = extrahuj_do_zoznamu(
-        tabulky, "p5_kriterium_nekonvencna_upv", "kod_vykonu"
-    )
-    tabulky["p5_kriterium_paliativna_starostlivost_diagnozy"] = extrahuj_do_zoznamu(
-        tabulky, "p5_kriterium_paliativna_starostlivost", "kod_diagnozy"
-    )
-    tabulky["p5_kriterium_potreba_vymennej_transfuzie_vykony"] = extrahuj_do_zoznamu(
-        tabulky, "p5_kriterium_potreba_vymennej_transfuzie", "kod_vykonu"
-    )
-    tabulky["p5_kriterium_riadena_hypotermia_vykony"] = extrahuj_do_zoznamu(
-        tabulky, "p5_kriterium_riadena_hypotermia", "kod_vykonu"
-    )
-    tabulky["p5_signifikantne_OP_vykony"] = extrahuj_do_zoznamu(
-        tabulky, "p5_signifikantne_OP", "kod_vykonu"
-    )
-    tabulky["p5_tazke_problemy_u_novorodencov_diagnozy"] = extrahuj_do_zoznamu(
-        tabulky, "p5_tazke_problemy_u_novorodencov", "kod_diagnozy"
-    )
 
-    tabulky["p16_koma_diagnozy"] = extrahuj_do_zoznamu(
-        tabulky, "p16_koma", "kod_diagnozy"
-    )
-    tabulky["p16_opuch_mozgu_diagnozy"] = extrahuj_do_zoznamu(
-        tabulky, "p16_opuch_mozgu", "kod_diagnozy"
-    )
-    tabulky["p16_vybrane_ochorenia_diagnozy"] = extrahuj_do_zoznamu(
-        tabulky, "p16_vybrane_ochorenia", "kod_diagnozy"
-    )
+def priprav_kody(tabulky):
+    """
+    Zjednotí kódy diagnóz, výkonov a DRG v tabuľkách z príloh. Vstupné tabuľky nemení.
 
+    Args:
+        tabulky (dict): Slovník obsahujúci všetky tabuľky.
 
-def priprav_kody(tabulky):
+    Returns:
+        dict: Slovník obsahujúci všetky tabuľky so zjednotenými kódmi.
+    """
     stlpce_s_kodami = {
         "p5_kriterium_nekonvencna_upv": ["kod_vykonu"],
         "p5_kriterium_paliativna_starostlivost": ["kod_diagnozy"],
@@ -118,24 +136,46 @@ def priprav_kody(tabulky):
         "p17": ["kod_hlavneho_vykonu"],
     }
 
+    pripravene = dict(tabulky)
     for nazov_tabulky, zoznam_stlpcov in stlpce_s_kodami.items():
-        for stlpec in zoznam_stlpcov:
-            tabulky[nazov_tabulky] = [
-                {**x, stlpec: zjednot_kod(x[stlpec])} for x in tabulky[nazov_tabulky]
-            ]
+        pripravene[nazov_tabulky] = [
+            {**x, **{stlpec: zjednot_kod(x[stlpec]) for stlpec in zoznam_stlpcov}}
+            for x in tabulky[nazov_tabulky]
+        ]
+    return pripravene
 
 
-def priprav_vsetky_prilohy():
+def zmraz_prilohy(tabulky):
     """
-    Načíta a pripraví všetky prílohy.
+    Vytvorí z pripravených príloh nemennú štruktúru, ktorú je možné bezpečne zdieľať medzi vláknami.
+
+    Tabuľky sa prevedú na n-tice riadkov, riadky na slovníky len na čítanie. Pomocné množiny kódov zostanú množinami frozenset.
+
+    Args:
+        tabulky (dict): Slovník obsahujúci všetky tabuľky a pomocné množiny kódov.
 
     Returns:
-        None
+        Mapping[str, tuple]: Slovník len na čítanie s tabuľkami a pomocnými množinami kódov.
     """
-    tabulky = nacitaj_vsetky_prilohy()
+    return MappingProxyType(
+        {
+            nazov: (
+                hodnoty
+                if isinstance(hodnoty, frozenset)
+                else tuple(MappingProxyType(dict(riadok)) for riadok in hodnoty)
+            )
+            for nazov, hodnoty in tabulky.items()
+        }
+    )
 
-    priprav_kody(tabulky)
 
-    priprav_pomocne_zoznamy(tabulky)
+def priprav_vsetky_prilohy():
+    """
+    Načíta a pripraví všetky prílohy.
+
+    Returns:
+        Mapping[str, tuple]: Nemenný slovník s tabuľkami príloh a pomocnými množinami kódov.
+    """
+    tabulky = priprav_kody(nacitaj_vsetky_prilohy())
 
-    return tabulky
+    return zmraz_prilohy({**tabulky, **priprav_pomocne_zoznamy(tabulky)})
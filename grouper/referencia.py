@@ -0,0 +1,841 @@
+"""
+Zmrazená referenčná implementácia vyhodnotenia hospitalizačných prípadov.
+
+Obsahuje nezmenenú pôvodnú verziu validácie a prípravy hospitalizačného prípadu, načítania príloh a vyhodnotenia príloh 5 až 17. Slúži ako referencia, s ktorou sa porovnávajú výsledky optimalizovaných spôsobov vyhodnocovania (pozri porovnaj_enginy.py). Tento modul sa preto nemá meniť ani optimalizovať.
+"""
+
+import csv
+import re
+import uuid
+from copy import deepcopy
+from pathlib import Path
+
+
+def zjednot_kod(kod):
+    return re.sub("[^0-9a-zA-Z]", "", kod).lower()
+
+
+cesta_k_suborom = Path("./Prilohy")
+
+
+def extrahuj_do_zoznamu(tabulky, nazov_tabulky, nazov_stlpca):
+    """
+    Extrahuje hodnoty z tabulky (zoznam slovníkov) do zoznamu hodnôt podľa zadaného názvu tabuľky a názvu stĺpca.
+
+    Args:
+    tabulky (dict): Slovník obsahujúci všetky tabuľky.
+    nazov_tabulky (str): Názov tabuľky, z ktorej sa majú extrahovať hodnoty.
+    nazov_stlpca (str): Názov stĺpca, z ktorého sa majú extrahovať hodnoty.
+
+    Returns:
+    list: Zoznam hodnôt extrahovaných zo zadaného stĺpca tabuľky.
+    """
+    return [t[nazov_stlpca] for t in tabulky[nazov_tabulky]]
+
+
+def nacitaj_vsetky_prilohy():
+    """
+    Načíta všetky prílohy zo súborov a vráti ich vo forme slovníka.
+
+    Returns:
+        dict: Slovník obsahujúci načítané prílohy, kde kľúč je názov súboru bez '.csv' a hodnota je zoznam slovnkov (riadkov príslušnej tabuľky).
+    """
+
+    prilohy = {}
+
+    for cesta_k_suboru in cesta_k_suborom.iterdir():
+        with open(cesta_k_suboru, "r", encoding="utf-8") as subor:
+            nazov_tabulky = cesta_k_suboru.stem
+            prilohy[nazov_tabulky] = []
+            csv_reader = csv.DictReader(subor, delimiter=";")
+            for line in csv_reader:
+                prilohy[nazov_tabulky].append(line)
+
+    return prilohy
+
+
+def priprav_pomocne_zoznamy(tabulky):
+    """
+    Pripraví pomocné zoznamy pre tabuľky z príloh. Zoznamy vkladá priamo do vstupného slovníka.
+
+    Args:
+        tabulky (dict): Slovník obsahujúci všetky tabuľky.
+
+    Returns:
+        None
+    """
+
+    tabulky["p5_kriterium_nekonvencna_upv_vykony"] = extrahuj_do_zoznamu(
+        tabulky, "p5_kriterium_nekonvencna_upv", "kod_vykonu"
+    )
+    tabulky["p5_kriterium_paliativna_starostlivost_diagnozy"] = extrahuj_do_zoznamu(
+        tabulky, "p5_kriterium_paliativna_starostlivost", "kod_diagnozy"
+    )
+    tabulky["p5_kriterium_potreba_vymennej_transfuzie_vykony"] = extrahuj_do_zoznamu(
+        tabulky, "p5_kriterium_potreba_vymennej_transfuzie", "kod_vykonu"
+    )
+    tabulky["p5_kriterium_riadena_hypotermia_vykony"] = extrahuj_do_zoznamu(
+        tabulky, "p5_kriterium_riadena_hypotermia", "kod_vykonu"
+    )
+    tabulky["p5_signifikantne_OP_vykony"] = extrahuj_do_zoznamu(
+        tabulky, "p5_signifikantne_OP", "kod_vykonu"
+    )
+    tabulky["p5_tazke_problemy_u_novorodencov_diagnozy"] = extrahuj_do_zoznamu(
+        tabulky, "p5_tazke_problemy_u_novorodencov", "kod_diagnozy"
+    )
+
+    tabulky["p16_koma_diagnozy"] = extrahuj_do_zoznamu(
+        tabulky, "p16_koma", "kod_diagnozy"
+    )
+    tabulky["p16_opuch_mozgu_diagnozy"] = extrahuj_do_zoznamu(
+        tabulky, "p16_opuch_mozgu", "kod_diagnozy"
+    )
+    tabulky["p16_vybrane_ochorenia_diagnozy"] = extrahuj_do_zoznamu(
+        tabulky, "p16_vybrane_ochorenia", "kod_diagnozy"
+    )
+
+
+def priprav_kody(tabulky):
+    stlpce_s_kodami = {
+        "p5_kriterium_nekonvencna_upv": ["kod_vykonu"],
+        "p5_kriterium_paliativna_starostlivost": ["kod_diagnozy"],
+        "p5_kriterium_potreba_vymennej_transfuzie": ["kod_vykonu"],
+        "p5_kriterium_riadena_hypotermia": ["kod_vykonu"],
+        "p5_NOV": ["drg"],
+        "p5_signifikantne_OP": ["kod_vykonu"],
+        "p5_tazke_problemy_u_novorodencov": ["kod_diagnozy"],
+        "p6_DRGD_deti": ["drg"],
+        "p6_DRGD_dospeli": ["drg"],
+        "p7_VV_deti": ["kod_hlavneho_vykonu"],
+        "p7_vedlajsie_vykony": ["kod_vykonu"],
+        "p8_VV_dospeli": ["kod_hlavneho_vykonu"],
+        "p8_vedlajsie_vykony": ["kod_vykonu"],
+        "p9_VD_deti": ["kod_hlavneho_vykonu"],
+        "p9_VD_dospeli": ["kod_hlavneho_vykonu"],
+        "p9_skupiny_diagnoz": ["kod_hlavnej_diagnozy"],
+        "p10_DD": ["kod_hlavnej_diagnozy", "kod_vedlajsej_diagnozy"],
+        "p12_V_deti": ["kod_hlavneho_vykonu"],
+        "p13_V_dospeli": ["kod_hlavneho_vykonu"],
+        "p14_D_deti": ["kod_hlavnej_diagnozy"],
+        "p15_D_dospeli": ["kod_hlavnej_diagnozy"],
+        "p16_koma": ["kod_diagnozy"],
+        "p16_opuch_mozgu": ["kod_diagnozy"],
+        "p16_vybrane_ochorenia": ["kod_diagnozy"],
+        "p17": ["kod_hlavneho_vykonu"],
+    }
+
+    for nazov_tabulky, zoznam_stlpcov in stlpce_s_kodami.items():
+        for stlpec in zoznam_stlpcov:
+            tabulky[nazov_tabulky] = [
+                {**x, stlpec: zjednot_kod(x[stlpec])} for x in tabulky[nazov_tabulky]
+            ]
+
+
+def priprav_vsetky_prilohy():
+    """
+    Načíta a pripraví všetky prílohy.
+
+    Returns:
+        None
+    """
+    tabulky = nacitaj_vsetky_prilohy()
+
+    priprav_kody(tabulky)
+
+    priprav_pomocne_zoznamy(tabulky)
+
+    return tabulky
+
+
+tabulky = priprav_vsetky_prilohy()
+
+
+def validuj_hp(hp, vyhodnot_neuplne_pripady):
+    """
+    Funkcia na validáciu hospitalizačného prípadu.
+
+    Skontroluje, či hospitalizačný prípad obsahuje neprázdne ID, platný vek, platnú hmotnosť, platný počet hodín umelej pľúcnej ventilácie a neprázdny zoznam diagnóz.
+
+    Args:
+        hp (dict): Hospitalizačný prípad, ktorý sa má validovať.
+        vyhodnot_neuplne_pripady (bool): Príznak určujúci, či sa neúplné prípady budú ďalej vyhodnocovať.
+
+    Returns:
+        bool: True, ak je hospitalizačný prípad platný, False inak.
+    """
+
+    # Identifikátor hospitalizačného prípadu nesmie byť prázdny
+    if hp["id"] == "":
+        if not vyhodnot_neuplne_pripady:
+            return False
+        hp["id"] = uuid.uuid4().hex
+        print(f'WARNING: Prázdne pole "id", priraďujem nové ID: {hp["id"]}')
+
+    # Vek musí byť celé, nezáporné číslo menšie ako 150
+    try:
+        hp["vek"] = int(hp["vek"])
+        if not 0 <= hp["vek"] < 150:
+            raise ValueError("Vek musí byť nezáporné číslo menšie ako 150")
+    except ValueError:
+        if not vyhodnot_neuplne_pripady:
+            return False
+        print(f'WARNING: HP {hp["id"]} nemá správne vyplnený vek.')
+        hp["vek"] = None
+
+    # Hmotnosť pacienta ku dňu prijatia v gramoch musí byť 0 alebo celé číslo medzi 100 a 20000
+    # Hmotnosť pacienta s vekom 0 nesmie byť nulová.
+    try:
+        hp["hmotnost"] = int(hp["hmotnost"])
+        if not 100 <= hp["hmotnost"] <= 20000 and hp["hmotnost"] != 0:
+            raise ValueError("Hmotnosť musí byť 0 alebo číslo medzi 100 a 20000.")
+        if hp["vek"] is not None and hp["vek"] == 0 and hp["hmotnost"] == 0:
+            raise ValueError("Hmotnosť pacienta s vekom 0 nesmie byť nulová.")
+    except ValueError:
+        if not vyhodnot_neuplne_pripady:
+            return False
+        print(f'WARNING: HP {hp["id"]} nemá správne vyplnenú hmotnosť.')
+        hp["hmotnost"] = None
+
+    # Počet hodín umelej pľúcnej ventilácie musí byť celé, nezáporné číslo menšie ako 10000
+    try:
+        hp["umela_plucna_ventilacia"] = int(hp["umela_plucna_ventilacia"])
+        if not 0 <= hp["umela_plucna_ventilacia"] <= 10000:
+            raise ValueError(
+                "Počet hodín umelej pľúcnej ventilácie musí byť nezáporné číslo menšie ako 10000."
+            )
+    except ValueError:
+        if not vyhodnot_neuplne_pripady:
+            return False
+        print(
+            f'WARNING: HP {hp["id"]} nemá správne vyplnený počet hodín umelej pľúcnej ventilácie.'
+        )
+        hp["umela_plucna_ventilacia"] = None
+
+    # Zoznam diagnóz nesmie byť prázdny
+    if hp["diagnozy"] == "":
+        if not vyhodnot_neuplne_pripady:
+            return False
+        print(f'WARNING: HP {hp["id"]} nemá vyplnenú ani jednu diagnózu.')
+        hp["diagnozy"] = None
+
+    return True
+
+
+def priprav_hp(hp):
+    """Príprava zoznamov diagnóz, výkonov a odborností v hospitalizačnom prípade. Zjednotenie kódu drg.
+
+    Args:
+        hp (dict): hospitalizačný prípad
+    """
+    if hp["diagnozy"]:
+        hp["diagnozy"] = [
+            zjednot_kod(diagnoza) for diagnoza in hp["diagnozy"].split("~")
+        ]
+    if hp["vykony"]:
+        hp["vykony"] = [
+            zjednot_kod(vykon.split("&")[0]) for vykon in hp["vykony"].split("~")
+        ]
+
+    if hp["drg"]:
+        hp["drg"] = zjednot_kod(hp["drg"])
+
+
+def s_viacerymi_tazkymi_problemami(diagnozy):
+    """
+    Vyhodnocuje splnenie podmienky pre globálnu funkciu „Viaceré ťažké problémy u novorodencov“ v klasifikačnom systéme.
+
+    Interne je táto definícia implementovaná pomocou zoznamu diagnóz zapísaného v tabuľke. Je nutné mať aspoň 2 diagnózy z tohto zoznamu.
+
+    Args:
+        diagnozy (List[str]): zoznam diagnóz
+
+    Returns:
+        bool: Splnenie "Viaceré ťažké problémy u novorodencov"
+    """
+    if diagnozy is None:
+        return False
+
+    pocet_tazkych_problemov = len(
+        [
+            d
+            for d in diagnozy
+            if d in tabulky["p5_tazke_problemy_u_novorodencov_diagnozy"]
+        ]
+    )
+    return pocet_tazkych_problemov >= 2
+
+
+def so_signifikantnym_vykonom(vykony):
+    """
+    Vyhodnocuje splnenie podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme.
+
+    Interne je táto definícia implementovaná pomocou zoznamu výkonov zapísaného v tabuľke.
+
+    Args:
+        vykony (List[str]): zoznam výkonov
+
+    Returns:
+        bool: Splnenie globálnej funkcie "Signifikantný operačný výkon"
+    """
+    return any(vykon in tabulky["p5_signifikantne_OP_vykony"] for vykon in vykony)
+
+
+def splna_kriterium_podla_5(kriterium, diagnozy, vykony, hmotnost, upv):
+    """
+    Vyhodnotenie doplňujúcich kritérií podľa prílohy 5.
+
+    Args:
+        kriterium (str): názov kritéria
+        diagnozy (List[str]): zoznam diagnóz
+        vykony (Listr[str]): zoznam výkonov
+        hmotnost (int): hmotnosť pacienta v gramoch
+        upv (int): trvanie umelej pľúcnej ventilácie v hodinách
+
+    Returns:
+        bool: spĺňa doplňujúce kritérium
+    """
+
+    # Doplňujúce kritérium „Nekonvenčná UPV (vysokofrekvenčná, NO ventilácia)“ sa je splnené, ak mal pacient vykázaný najmenej jeden z definovaných výkonov
+    if kriterium == "Nekonvenčná UPV (vysokofrekvenčná, NO ventilácia)":
+        return any(
+            vykon in tabulky["p5_kriterium_nekonvencna_upv_vykony"] for vykon in vykony
+        )
+
+    # Doplňujúce kritérium „Riadená hypotermia“ je splnené, ak mal pacient vykázaný najmenej jeden z definovaných výkonov
+    if kriterium == "Riadená hypotermia":
+        return any(
+            vykon in tabulky["p5_kriterium_riadena_hypotermia_vykony"]
+            for vykon in vykony
+        )
+
+    # Doplňujúce kritérium „Paliatívna starostlivosť u novorodencov“ je splnené, ak mal pacient vykázanú najmenej jednu z definovaných diagnóz
+    if kriterium == "Paliatívna starostlivosť u novorodencov":
+        return diagnozy is not None and any(
+            diagnoza in tabulky["p5_kriterium_paliativna_starostlivost_diagnozy"]
+            for diagnoza in diagnozy
+        )
+
+    # Doplňujúce kritérium „Potreba výmennej transfúzie“ je splnené, ak mal pacient vykázaný najmenej jeden z definovaných výkonov
+    if kriterium == "Potreba výmennej transfúzie":
+        return any(
+            vykon in tabulky["p5_kriterium_potreba_vymennej_transfuzie_vykony"]
+            for vykon in vykony
+        )
+
+    # Doplňujúce kritérium „Akútny pôrod novorodenca v prípade ohrozenia života bez ohľadu na gestačný vek a hmotnosť” je splnené, ak mal pacient vykázaný aj tento výkon: 93083, Akútny pôrod novorodenca v prípade ohrozenia života
+    if (
+        kriterium
+        == "Akútny pôrod novorodenca v prípade ohrozenia života bez ohľadu na gestačný vek a hmotnosť"
+    ):
+        return "93083" in vykony
+
+    # Doplňujúce kritérium „Novorodenec pod hranicou viability (< 24 týždeň alebo < 500 g)” je splnené, ak mal hospitalizovaný pacient hmotnosť menej ako 500g alebo gestačný vek nižší ako 24 týždňov.
+    # Gestačný vek aktuálne nie je možné z dát zistiť, kontrolujeme iba hmotnosť.
+    if kriterium == "Novorodenec pod hranicou viability (< 24 týždeň alebo < 500 g)":
+        return hmotnost is not None and hmotnost < 500
+
+    # Doplňujúce kritérium „So signifikantným OP výkonom“ je splnené, ak hospitalizačný prípad pacienta splnil podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme.
+    if kriterium == "So signifikantným OP výkonom":
+        return so_signifikantnym_vykonom(vykony)
+
+    # Doplňujúce kritérium „Bez signifikantného OP výkonu, s UPV > 95 hodín, s viacerými ťažkými problémami“ je splnené, ak hospitalizačný prípad pacienta nesplnil podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme, ale dĺžka umelej pľúcnej ventilácie poskytnutej počas hospitalizácie v súlade s pravidlami kódovania pre umelú pľúcnu ventiláciu bola vyššia ako 95 hodín a hospitalizačný prípad splnil podmienky pre globálnu funkciu „Viaceré ťažké problémy u novorodencov“ v klasifikačnom systéme.
+    if (
+        kriterium
+        == "Bez signifikantného OP výkonu, s UPV > 95 hodín, s viacerými ťažkými problémami"
+    ):
+        return (
+            not so_signifikantnym_vykonom(vykony)
+            and upv is not None
+            and upv > 95
+            and s_viacerymi_tazkymi_problemami(diagnozy)
+        )
+
+    # Doplňujúce kritérium „Bez signifikantného OP výkonu a bez UPV > 95 hodín a viacerých ťažkých problémov“ je splnené, ak hospitalizačný prípad pacienta nesplnil podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme a zároveň dĺžka umelej pľúcnej ventilácie poskytnutej počas hospitalizácie v súlade s pravidlami kódovania pre umelú pľúcnu ventiláciu nebola vyššia ako 95 hodín alebo hospitalizačný prípad nesplnil podmienky pre globálnu funkciu „Viaceré ťažké problémy u novorodencov“ v klasifikačnom systéme.
+    if (
+        kriterium
+        == "Bez signifikantného OP výkonu a bez UPV > 95 hodín a viacerých ťažkých problémov"
+    ):
+        return not so_signifikantnym_vykonom(vykony) and (
+            (upv is not None and upv <= 95)
+            or not s_viacerymi_tazkymi_problemami(diagnozy)
+        )
+
+
+def priloha_5(hmotnost, upv, diagnozy, vykony, drg):
+    """
+    Medicínska služba sa určí podľa skupiny klasifikačného systému, do ktorej bol hospitalizačný prípad zaradený alebo podľa skupiny klasifikačného systému a zdravotného výkonu alebo diagnózy podľa doplňujúceho kritéria (NOV).
+
+    Args:
+        hmotnost (int): hmotnosť poistenca v gramoch
+        upv (int): doba umelej pľúcnej ventilácie v hodinách
+        diagnozy (List[str]): zoznam diagnóz
+        vykony (List[str]): zoznam výkonov
+        drg (str): skupina klasifikačného systému DRG
+
+    Returns:
+        List[str]: Zoznam priradených medicínskych služieb
+    """
+
+    return [
+        line["kod_ms"]
+        for line in tabulky["p5_NOV"]
+        if drg.startswith(line["drg"])
+        and (
+            not line["doplnujuce_kriterium"]
+            or splna_kriterium_podla_5(
+                line["doplnujuce_kriterium"],
+                diagnozy,
+                vykony,
+                hmotnost,
+                upv,
+            )
+        )
+    ]
+
+
+def s_kraniocerebralnou_traumou(diagnozy):
+    """
+    Diagnóza patrí do skupiny diagnóz „Kraniocerebrálna trauma“, ak mal poistenec vykázanú najmenej jednu diagnózu s kódom začínajúcim v rozsahu kódov diagnóz „S02“ až „S09“.
+
+    Args:
+        diagnozy (List[str]): zoznam diagnóz
+
+    Returns:
+        bool: aspoň 1 z diagnóz je v rozsahu kódov diagnóz „S02“ až „S09“
+    """
+    return any(
+        diagnoza[:3] in ["s02", "s03", "s04", "s05", "s06", "s07", "s08", "s09"]
+        for diagnoza in diagnozy
+    )
+
+
+def splna_kriterium_podla_6(kriterium, diagnozy):
+    """
+    Diagnóza musí zodpovedať stĺpcu skupiny diagnóz.
+
+    Aktuálne sú 2 skupiny: „Kraniocerebrálna trauma“ a "bez diagnózy Kraniocerebrálna trauma".
+
+    Args:
+        kriterium (_type_): názov kritéria
+        diagnozy (_type_): zoznam diagnóz
+
+    Returns:
+        bool: spĺňa kritérium skupiny diagnóz
+    """
+    if kriterium == "Kraniocerebrálna trauma":
+        return s_kraniocerebralnou_traumou(diagnozy)
+
+    if kriterium == "bez diagnózy Kraniocerebrálna trauma":
+        return not s_kraniocerebralnou_traumou(diagnozy)
+
+
+def priloha_6(drg, diagnozy, je_dieta):
+    """
+    Ak bol hospitalizačný prípad poistenca zaradený podľa klasifikačného systému do skupiny podľa stĺpca "Skupina klasifikačného systému" pri diagnóze zodpovedajúcej stĺpcu „skupina diagnóz“, hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (DRGD).
+
+    Napr.
+    Skupina klasifikačného systému: Skupina klasifikačného systému začínajúca na „W“
+    Skupina diagnóz: Kraniocerebrálna trauma
+    Medicínska služba: Polytrauma s kraniocerebrálnou traumou (S02-01)
+
+    Rozdelené podľa veku.
+
+    Args:
+        drg (str): skupina klasifikačného systému DRG
+        diagnozy (List[str]): zoznam diagnóz
+        je_dieta (bool): poistenec vo veku 18 rokov a menej
+
+    Returns:
+        List[str]: Zoznam priradených medicínskych služieb
+    """
+    nazov_tabulky = "p6_DRGD_deti" if je_dieta else "p6_DRGD_dospeli"
+
+    return [
+        line["kod_ms"]
+        for line in tabulky[nazov_tabulky]
+        if drg.startswith(line["drg"])
+        and splna_kriterium_podla_6(line["doplnujuce_kriterium"], diagnozy)
+    ]
+
+
+def poskytnuty_vedlajsi_vykon(vykony, skupina_vykonov, nazov_tabulky):
+    """
+    Bol vykázaný minimálne jeden výkon z uvedenej skupiny výkonov.
+
+    Args:
+        vykony (List[str]): zoznam výkonov
+        skupina_vykonov (str): skupina výkonov podľa hlavného výkonu
+        nazov_tabulky (str): názov tabuľky, v ktorej sa nachádzajú prislúchajúce skupiny výkonov
+
+    Returns:
+        bool: aspoň jeden vykázaný výkon sa nachádza v uvedenej skupine výkonov.
+    """
+    cielove_vykony = [
+        vykon["kod_vykonu"]
+        for vykon in tabulky[nazov_tabulky]
+        if vykon["kod_ms"] == skupina_vykonov
+    ]
+
+    return any(vykon in cielove_vykony for vykon in vykony)
+
+
+def prilohy_7_8(vykony, je_dieta, vsetky_vykony_hlavne):
+    """
+    Ak bol poistencovi poskytnutý hlavný zdravotný výkon podľa stĺpca "zdravotný výkon" a minimálne jeden výkon z uvedených výkonov (VV, kombinácia Výkon - Výkon).
+
+    Hlavné výkony sú v tabuľkách p7_VV_deti a p8_VV_dospelí.
+    Vedľajšie výkony sa kontrolujú z tabuliek p7_vedlajsie_vykony a p8_vedlajsie_vykony podľa parametru skupina_vedlajsich_vykonov.
+
+    Args:
+        vykony (List[str]): zoznam výkonov
+        je_dieta (bool): poistenec vo veku 18 rokov a menej
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+
+    Returns:
+        List[str]: Zoznam priradených medicínskych služieb
+    """
+    nazov_tabulky = "p7_VV_deti" if je_dieta else "p8_VV_dospeli"
+    nazov_vedlajsej_tabulky = (
+        "p7_vedlajsie_vykony" if je_dieta else "p8_vedlajsie_vykony"
+    )
+
+    hlavny_vykon = vykony[0]
+    if not vsetky_vykony_hlavne and not hlavny_vykon:
+        return []
+    vedlajsie_vykony = vykony[1:]
+
+    out = [
+        line["kod_ms"]
+        for line in tabulky[nazov_tabulky]
+        if line["kod_hlavneho_vykonu"] == hlavny_vykon
+        and poskytnuty_vedlajsi_vykon(
+            vedlajsie_vykony,
+            line["kod_ms"],
+            nazov_vedlajsej_tabulky,
+        )
+    ]
+
+    if vsetky_vykony_hlavne:
+        for i, hlavny_vykon in enumerate(vykony[1:]):
+            vedlajsie_vykony = vykony[: i + 1] + vykony[i + 2 :]
+            out.extend(
+                [
+                    line["kod_ms"]
+                    for line in tabulky[nazov_tabulky]
+                    if line["kod_hlavneho_vykonu"] == hlavny_vykon
+                    and poskytnuty_vedlajsi_vykon(
+                        vedlajsie_vykony,
+                        line["kod_ms"],
+                        nazov_vedlajsej_tabulky,
+                    )
+                ]
+            )
+
+    return out
+
+
+def splna_diagnoza_zo_skupiny_podla_9(hlavna_diagnoza, skupina_diagnoz):
+    """
+    Kontroluj, či prípad má hlavnú diagnózu patriacu skupine definovaných diagnóz.
+
+        Args:
+            hlavna_diagnoza (List[str]): hlavná diagnóza hospitalizačného prípadu
+            skupina_diagnoz (str): Názov skupiny diagnóz podľa prílohy 9
+            je_dieta (bool): poistenec vo veku 18 rokov a menej
+
+        Returns:
+            bool: hlavná diagnóza je z uvedenej skupiny diagnóz
+    """
+    cielove_diagnozy = [
+        line["kod_hlavnej_diagnozy"]
+        for line in tabulky["p9_skupiny_diagnoz"]
+        if line["skupina_diagnoz"] == skupina_diagnoz
+    ]
+
+    return any(
+        hlavna_diagnoza.startswith(cielova_diagnoza)
+        for cielova_diagnoza in cielove_diagnozy
+    )
+
+
+def priloha_9(diagnozy, vykony, je_dieta, vsetky_vykony_hlavne):
+    """
+    Ak bol poistencovi poskytnutý hlavný zdravotný výkon podľa stĺpca "názov zdravotného výkonu" pri hlavnej diagnóze zo skupiny diagnóz podľa stĺpca „Skupina diagnóz“, hospitalizácii sa určí medicínska služba podľa stĺpca "Názov medicínskej služby" (VD).
+
+    Args:
+        diagnozy (List[str]): zoznam diagnóz
+        vykony (List[str]): zoznam výkonov
+        je_dieta (bool): poistenec vo veku 18 rokov a menej
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+
+    Returns:
+        List[str]: zoznam priradených medicínskych služieb
+    """
+    nazov_tabulky = "p9_VD_deti" if je_dieta else "p9_VD_dospeli"
+
+    hlavny_vykon = vykony[0]
+    if not vsetky_vykony_hlavne and not hlavny_vykon:
+        return []
+
+    hlavna_diagnoza = diagnozy[0]
+
+    out = [
+        line["kod_ms"]
+        for line in tabulky[nazov_tabulky]
+        if line["kod_hlavneho_vykonu"] == hlavny_vykon
+        and splna_diagnoza_zo_skupiny_podla_9(hlavna_diagnoza, line["skupina_diagnoz"])
+    ]
+
+    if vsetky_vykony_hlavne:
+        for hlavny_vykon in vykony[1:]:
+            out.extend(
+                [
+                    line["kod_ms"]
+                    for line in tabulky[nazov_tabulky]
+                    if line["kod_hlavneho_vykonu"] == hlavny_vykon
+                    and splna_diagnoza_zo_skupiny_podla_9(
+                        hlavna_diagnoza, line["skupina_diagnoz"]
+                    )
+                ]
+            )
+
+    return out
+
+
+def priloha_10(diagnozy):
+    """
+    Ak bola poistencovi pri hospitalizácii vykázaná hlavná diagnóza podľa stĺpca „skupina diagnóz pre hlavnú diagnózu“ a vedľajšia diagnóza podľa stĺpca „názov vedľajšej diagnózy“, hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (DD).
+
+    Args:
+        diagnozy (List[str]): zoznam diagnóz
+
+    Returns:
+        List[str]: zoznam medicínskych služieb
+    """
+    return [
+        line["kod_ms"]
+        for line in tabulky["p10_DD"]
+        if line["kod_hlavnej_diagnozy"] == diagnozy[0]
+        and line["kod_vedlajsej_diagnozy"] in diagnozy[1:]
+    ]
+
+
+def ms_podla_hlavneho_vykonu(vykony, nazov_tabulky, vsetky_vykony_hlavne):
+    """
+    Vráť zoznam medicínskych služieb podľa vykázaného hlavného výkonu.
+
+    Mechanizmus použitý v prílohách 12, 13 a 17.
+
+    Args:
+        vykony (List[str]): zoznam výkonov
+        nazov_tabulky (bool): názov tabuľky, v ktorej sú definované medicínske služby
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+
+    Returns:
+        List[str]: zoznam medicínskych služieb
+    """
+
+    hlavny_vykon = vykony[0]
+    if not vsetky_vykony_hlavne and not hlavny_vykon:
+        return []
+
+    out = [
+        line["kod_ms"]
+        for line in tabulky[nazov_tabulky]
+        if line["kod_hlavneho_vykonu"] == hlavny_vykon
+    ]
+
+    if vsetky_vykony_hlavne:
+        for hlavny_vykon in vykony[1:]:
+            out.extend(
+                [
+                    line["kod_ms"]
+                    for line in tabulky[nazov_tabulky]
+                    if line["kod_hlavneho_vykonu"] == hlavny_vykon
+                ]
+            )
+
+    return out
+
+
+def prilohy_12_13(vykony, je_dieta, vsetky_vykony_hlavne):
+    """
+    Ak bol poistencovi poskytnutý hlavný zdravotný výkon podľa stĺpca "zdravotný výkon", hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (V).
+
+    Rozdelené podľa veku.
+
+    Args:
+        vykony (List[str]): zoznam výkonov
+        je_dieta (bool): poistenec vo veku 18 rokov a menej
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+
+    Returns:
+        List[str]: zoznam medicínskych služieb
+    """
+    nazov_tabulky = "p12_V_deti" if je_dieta else "p13_V_dospeli"
+
+    return ms_podla_hlavneho_vykonu(vykony, nazov_tabulky, vsetky_vykony_hlavne)
+
+
+def prilohy_14_15(diagnozy, je_dieta):
+    """Ak bola poistencov pri hospitalizácii vykázaná hlavná diagnóza podľa stĺpca "hlavná diagnóza", hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (D).
+
+    Rozdelené podľa veku.
+
+    Args:
+        diagnozy (List[str]): zoznam diagnóz
+        je_dieta (bool): pacient vo veku 18 rokov a menej
+
+    Returns:
+        List[str]: Zoznam medicínskych služieb
+    """
+    nazov_tabulky = "p14_D_deti" if je_dieta else "p15_D_dospeli"
+
+    return [
+        line["kod_ms"]
+        for line in tabulky[nazov_tabulky]
+        if line["kod_hlavnej_diagnozy"] == diagnozy[0]
+    ]
+
+
+def priloha_16(diagnozy):
+    """
+    Medicínska služba „Identifikácia mŕtveho darcu orgánov“ (S17-22) sa určí, ak je pri hospitalizačnom prípade vykázaná aspoň jedna diagnóza zo skupiny diagnóz „Kóma“ a súčasne aspoň jedna diagnóza zo skupiny „Opuch mozgu“ a súčasne aspoň jedna z diagnóz so skupiny „Vybrané ochorenia mozgu“ (S)
+
+    Args:
+        diagnozy (List[str]): Zoznam diagnóz hospitalizačného prípadu.
+
+    Returns:
+        [List[str]]: Zoznam medicínskych služieb.
+    """
+
+    kod_ms = "S17-22"
+    nazvy_zoznamov_diagnoz = [
+        "p16_koma_diagnozy",
+        "p16_opuch_mozgu_diagnozy",
+        "p16_vybrane_ochorenia_diagnozy",
+    ]
+
+    for cielovy_zoznam in nazvy_zoznamov_diagnoz:
+        if not any(
+            cielova_diagnoza in diagnozy for cielova_diagnoza in tabulky[cielovy_zoznam]
+        ):
+            return []
+    return [kod_ms]
+
+
+def priloha_17(vykony, vsetky_vykony_hlavne):
+    """
+    V hospitalizačných prípadoch, v ktorých bol vykázaný hlavný výkon podľa stĺpca "zdravotný výkon", hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba".
+
+    Jedná sa o špeciálne prípady, kedy HP dobre nezapadá do aktuálneho nastavenie medicínskych služieb.
+
+    Príloha 17 má prednosť pred ostatnými prílohami.
+
+    Zdieľa mechanizmus vyhodnocovania s prílohami 12 a 13.
+
+    Args:
+        vykony (List[str]): Zoznam výkonov hospitalizačného prípadu.
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+
+    Returns:
+        [List[str]]: Zoznam medicínskych služieb.
+    """
+    return ms_podla_hlavneho_vykonu(vykony, "p17", vsetky_vykony_hlavne)
+
+
+def prirad_ms(hp, vsetky_vykony_hlavne):
+    """Vyhodnoť všetky prílohy a vytvor zoznam medicínskych služieb priraditeľných k hospitalizačnému prípadu.
+
+    Príloha sa vyhodnocuje, iba pokiaľ hospitalizačný prípad má vyplnené polia nutné pre vyhodnotenie prílohy.
+
+    Ako prvá sa vyhodnocuje príloha 17 s analytickými medicínskymi službami.
+
+    Pokiaľ hospitalizačný prípad nezapadá do žiadnej medicínskej služby podľa príloh, je mu priradená služba S99-99.
+
+    Args:
+        hp (dict): hospitalizačný prípad
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+
+    Returns:
+        List[str]: zoznam medicínskych služieb
+    """
+    services = []
+
+    je_dieta = hp["vek"] is not None and hp["vek"] <= 18
+
+    if hp["vykony"]:
+        services.extend(priloha_17(hp["vykony"], vsetky_vykony_hlavne))
+
+    if hp["drg"]:
+        services.extend(
+            priloha_5(
+                hp["hmotnost"],
+                hp["umela_plucna_ventilacia"],
+                hp["diagnozy"],
+                hp["vykony"],
+                hp["drg"],
+            )
+        )
+
+    if hp["drg"] and hp["vek"] is not None and hp["diagnozy"]:
+        services.extend(priloha_6(hp["drg"], hp["diagnozy"], je_dieta))
+
+    if hp["vek"] is not None and hp["vykony"]:
+        services.extend(prilohy_7_8(hp["vykony"], je_dieta, vsetky_vykony_hlavne))
+
+    if hp["vek"] is not None and hp["diagnozy"] and hp["vykony"]:
+        services.extend(
+            priloha_9(hp["diagnozy"], hp["vykony"], je_dieta, vsetky_vykony_hlavne)
+        )
+
+    if hp["diagnozy"]:
+        services.extend(priloha_10(hp["diagnozy"]))
+
+    if hp["vek"] is not None and hp["vykony"]:
+        services.extend(prilohy_12_13(hp["vykony"], je_dieta, vsetky_vykony_hlavne))
+
+    if hp["vek"] is not None and hp["diagnozy"]:
+        services.extend(prilohy_14_15(hp["diagnozy"], je_dieta))
+
+    if hp["diagnozy"]:
+        services.extend(priloha_16(hp["diagnozy"]))
+
+    if not services:
+        services = ["S99-99"]
+
+    return services
+
+
+def vyhodnot_hp_referencne(
+    hospitalizacny_pripad,
+    vsetky_vykony_hlavne,
+    vyhodnot_neuplne_pripady,
+    ponechaj_duplicity,
+):
+    """
+    Vyhodnotí hospitalizačný prípad pôvodným postupom a vráti hodnotu stĺpca 'ms' výstupného súboru.
+
+    Args:
+        hospitalizacny_pripad (dict): riadok načítaný čítačom dát
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+        vyhodnot_neuplne_pripady (bool): pokračuj vo vyhodnocovaní aj pri nevyplnených povinných hodnotách
+        ponechaj_duplicity (bool): ponechaj duplicitné medicínske služby
+
+    Returns:
+        str: medicínske služby oddelené znakom '~', pre neplatný prípad 'ERROR'
+    """
+    hp = deepcopy(hospitalizacny_pripad)
+
+    if not validuj_hp(hp, vyhodnot_neuplne_pripady):
+        return "ERROR"
+
+    priprav_hp(hp)
+
+    medicinske_sluzby = prirad_ms(hp, vsetky_vykony_hlavne)
+
+    if not ponechaj_duplicity:
+        # deduplikuj medicinske sluzby
+        medicinske_sluzby = list(dict.fromkeys(medicinske_sluzby))
+
+    return "~".join(medicinske_sluzby)
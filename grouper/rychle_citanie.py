@@ -0,0 +1,177 @@
+"""
+Rýchle čítanie vstupného csv súboru s pevnou štruktúrou 7 stĺpcov oddelených bodkočiarkou, bez úvodzoviek.
+
+Súbor sa namapuje do pamäte, delí sa na riadky po veľkých blokoch a riadky na polia priamo podľa oddeľovačov. Riadky, ktoré obsahujú úvodzovky alebo nemajú 7 polí, sa načítajú modulom csv, takže výsledok je rovnaký ako pri čítaní funkciou priprav_citac_dat.
+"""
+
+import csv
+import mmap
+import os
+from contextlib import nullcontext
+from itertools import chain
+
+from grouper.priprava_dat import NAZVY_STLPCOV, VELKOST_BUFFRA
+
+
+def otvor_mapovany_vstup(cesta):
+    """
+    Namapuje vstupný súbor do pamäte iba na čítanie.
+
+    Args:
+        cesta (str): cesta k vstupnému súboru
+
+    Returns:
+        mmap.mmap: súbor namapovaný do pamäte, pre prázdny súbor prázdne bajty
+    """
+    with open(cesta, "rb") as file:
+        # Prázdny súbor nie je možné namapovať
+        if os.fstat(file.fileno()).st_size == 0:
+            return nullcontext(b"")
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _koniec_bloku(data, zaciatok):
+    """Určí koniec bloku, ktorý začína na zadanej pozícii a končí za posledným celým riadkom, ktorý sa do neho zmestí."""
+    koniec = data.rfind(b"\n", zaciatok, zaciatok + VELKOST_BUFFRA)
+    if koniec == -1:
+        koniec = data.find(b"\n", zaciatok + VELKOST_BUFFRA)
+    return len(data) if koniec == -1 else koniec + 1
+
+
+def _na_slovnik(polia):
+    """Vytvorí z polí riadku slovník rovnako ako csv.DictReader, chýbajúce polia majú hodnotu None a nadbytočné sú v kľúči None."""
+    hp = dict(zip(NAZVY_STLPCOV, polia))
+    if len(polia) > len(NAZVY_STLPCOV):
+        hp[None] = polia[len(NAZVY_STLPCOV) :]
+    for nazov in NAZVY_STLPCOV[len(polia) :]:
+        hp[nazov] = None
+    return hp
+
+
+def _citaj_riadky(data, zaciatok, stav):
+    """
+    Postupne vracia riadky namapovaného súboru od zadanej pozície vrátane znaku konca riadku.
+
+    Riadky sa delia aj podľa znakov '\\r' a '\\r\\n', ktoré sa prevedú na '\\n' rovnako ako pri čítaní v textovom režime.
+
+    Args:
+        data (mmap.mmap): súbor namapovaný do pamäte
+        zaciatok (int): pozícia v bajtoch, od ktorej sa má čítať
+        stav (dict): stav čítania, aktualizuje sa pozícia za posledným vráteným riadkom a počet riadkov
+
+    Yields:
+        str: riadok súboru
+    """
+    while zaciatok < len(data):
+        koniec = data.find(b"\n", zaciatok)
+        koniec = len(data) if koniec == -1 else koniec + 1
+        riadok = data[zaciatok:koniec]
+
+        pozicia = 0
+        while pozicia < len(riadok):
+            cr = riadok.find(b"\r", pozicia)
+            if cr == -1:
+                koniec_casti = len(riadok)
+                text = riadok[pozicia:].decode("utf-8")
+            else:
+                koniec_casti = cr + 2 if riadok[cr + 1 : cr + 2] == b"\n" else cr + 1
+                text = riadok[pozicia:cr].decode("utf-8") + "\n"
+            stav["pozicia"] = zaciatok + koniec_casti
+            stav["cislo_riadku"] += 1
+            yield text
+            pozicia = koniec_casti
+
+        zaciatok = koniec
+
+
+def _citaj_blok_po_riadkoch(data, zaciatok, koniec, stav):
+    """
+    Načíta hospitalizačné prípady z bloku, ktorý obsahuje úvodzovky alebo znak '\\r', po jednotlivých riadkoch.
+
+    Riadky s úvodzovkami sa načítajú modulom csv, záznam v úvodzovkách môže pokračovať aj za koncom bloku.
+
+    Args:
+        data (mmap.mmap): súbor namapovaný do pamäte
+        zaciatok (int): pozícia začiatku bloku
+        koniec (int): pozícia konca bloku
+        stav (dict): stav čítania
+
+    Yields:
+        dict: hospitalizačný prípad
+    """
+    riadky = _citaj_riadky(data, zaciatok, stav)
+    for riadok in riadky:
+        if '"' in riadok:
+            reader = csv.reader(chain([riadok], riadky), delimiter=";", strict=True)
+            yield _na_slovnik(next(reader))
+        elif riadok != "\n":
+            yield _na_slovnik(riadok.rstrip("\n").split(";"))
+        if stav["pozicia"] >= koniec:
+            return
+
+
+def citaj_rychlo(data, stav, zaciatok=0):
+    """
+    Postupne načíta hospitalizačné prípady zo súboru namapovaného do pamäte.
+
+    Vracia rovnaké slovníky ako čítač dát z funkcie priprav_citac_dat. Bloky bez úvodzoviek a znakov '\\r' sa dekódujú naraz a delia na riadky a polia priamo podľa oddeľovačov, ostatné bloky sa čítajú po riadkoch.
+
+    Args:
+        data (mmap.mmap): súbor namapovaný do pamäte funkciou otvor_mapovany_vstup
+        stav (dict): stav čítania, priebežne sa aktualizuje pozícia v bajtoch za posledným načítaným riadkom ('pozicia') a počet načítaných riadkov ('cislo_riadku')
+        zaciatok (int, optional): pozícia v bajtoch, od ktorej sa má čítať
+
+    Raises:
+        csv.Error: riadok s úvodzovkami nemá platný formát csv
+
+    Yields:
+        dict: hospitalizačný prípad
+    """
+    stav["pozicia"] = zaciatok
+    stav["cislo_riadku"] = 0
+
+    while stav["pozicia"] < len(data):
+        zaciatok = stav["pozicia"]
+        koniec = _koniec_bloku(data, zaciatok)
+        blok = data[zaciatok:koniec]
+
+        if b'"' in blok or b"\r" in blok:
+            yield from _citaj_blok_po_riadkoch(data, zaciatok, koniec, stav)
+            continue
+
+        text = blok.decode("utf-8")
+        riadky = text.split("\n")
+        # Za posledným znakom konca riadku nasleduje prázdny reťazec, prípadne posledný riadok súboru bez konca riadku
+        if riadky[-1] == "":
+            riadky.pop()
+        prvy_riadok = stav["cislo_riadku"] + 1
+
+        # Prázdne riadky sa preskakujú rovnako ako v module csv
+        pripady = [
+            (
+                dict(zip(NAZVY_STLPCOV, polia))
+                if len(polia) == len(NAZVY_STLPCOV)
+                else _na_slovnik(polia) if polia != [""] else None
+            )
+            for polia in (riadok.split(";") for riadok in riadky)
+        ]
+        # Pri texte iba so znakmi ASCII zodpovedá dĺžka riadku počtu bajtov
+        dlzky = (
+            map(len, riadky)
+            if text.isascii()
+            else [len(riadok.encode("utf-8")) for riadok in riadky]
+        )
+
+        pozicia = zaciatok
+        for cislo_riadku, (dlzka, hp) in enumerate(
+            zip(dlzky, pripady), start=prvy_riadok
+        ):
+            pozicia += dlzka + 1
+            if hp is not None:
+                # Posledný riadok súboru nemusí mať znak konca riadku
+                stav["pozicia"] = min(pozicia, koniec)
+                # Číslo riadku musí zodpovedať vrátenému prípadu, aby ho bolo možné uviesť v chybe
+                stav["cislo_riadku"] = cislo_riadku
+                yield hp
+        stav["pozicia"] = koniec
+        stav["cislo_riadku"] = prvy_riadok + len(riadky) - 1
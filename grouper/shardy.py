@@ -0,0 +1,171 @@
+"""
+Funkcie na rozdelenie vstupných dát na časti (shardy) spracované na viacerých uzloch a na ich následné zlúčenie.
+
+Príslušnosť prípadu k shardu sa určuje iba podľa stabilného hashu jeho identifikátora, nezávisí teda od poradia čítania ani od uzla, na ktorom sa spracúva.
+"""
+
+import csv
+import zlib
+
+from grouper.priprava_dat import urci_stlpce_vystupu
+
+# Hlavičky výstupov, ktoré je možné zlúčiť: úplný, skrátený a skrátený s číslami príloh
+HLAVICKY_VYSTUPOV = [
+    urci_stlpce_vystupu(),
+    urci_stlpce_vystupu(skrateny_vystup=True),
+    urci_stlpce_vystupu(skrateny_vystup=True, s_prilohami=True),
+]
+
+
+def cislo_shardu(id_hp, pocet_shardov):
+    """
+    Určí číslo shardu, do ktorého patrí hospitalizačný prípad.
+
+    Args:
+        id_hp (str): identifikátor hospitalizačného prípadu
+        pocet_shardov (int): celkový počet shardov
+
+    Returns:
+        int: číslo shardu od 1 po pocet_shardov
+    """
+    return zlib.crc32(id_hp.encode("utf-8")) % pocet_shardov + 1
+
+
+def vyber_shard(riadky, shard, pocet_shardov):
+    """
+    Vyberie z načítaných riadkov iba hospitalizačné prípady patriace do zadaného shardu.
+
+    Args:
+        riadky (Iterable[dict]): riadky načítané čítačom dát
+        shard (int): číslo shardu od 1 po pocet_shardov
+        pocet_shardov (int): celkový počet shardov
+
+    Yields:
+        dict: riadok patriaci do shardu
+    """
+    for riadok in riadky:
+        if cislo_shardu(riadok["id"], pocet_shardov) == shard:
+            yield riadok
+
+
+def _riadky_shardu(reader, shard, pocet_shardov):
+    """Postupne vracia riadky výstupu shardu a kontroluje ich príslušnosť k shardu."""
+    for riadok in reader:
+        if cislo_shardu(riadok[0], pocet_shardov) != shard:
+            raise ValueError(
+                f"Prípad {riadok[0]} na riadku {reader.line_num} výstupu shardu {shard} nepatrí do tohto shardu."
+            )
+        yield riadok
+
+
+def _citaj_shardy(shard_files):
+    """
+    Načíta hlavičky výstupov shardov, skontroluje ich a pripraví postupné čítanie riadkov s kontrolou príslušnosti každého prípadu k shardu.
+
+    Args:
+        shard_files (List[file_handle]): prístupy k výstupom shardov v poradí ich čísel
+
+    Raises:
+        ValueError: výstup shardu nemá očakávanú hlavičku alebo výstupy shardov majú rôzne hlavičky
+
+    Returns:
+        Tuple[List[str], List[Iterator[List[str]]]]: spoločná hlavička a riadky výstupu každého shardu
+    """
+    pocet_shardov = len(shard_files)
+    hlavicky = []
+    shardy = []
+    for shard, file in enumerate(shard_files, start=1):
+        reader = csv.reader(file, delimiter=";", strict=True)
+        hlavicka = next(reader, None)
+        if hlavicka not in HLAVICKY_VYSTUPOV:
+            raise ValueError(f"Výstup shardu {shard} nemá očakávanú hlavičku.")
+        hlavicky.append(hlavicka)
+        shardy.append(_riadky_shardu(reader, shard, pocet_shardov))
+
+    if any(hlavicka != hlavicky[0] for hlavicka in hlavicky):
+        raise ValueError("Výstupy shardov majú rôzne hlavičky.")
+    return hlavicky[0] if hlavicky else HLAVICKY_VYSTUPOV[0], shardy
+
+
+def zluc_v_poradi_vstupu(input_file, shard_files, output_file):
+    """
+    Zlúči výstupy shardov do poradia vstupného súboru a skontroluje, že každý prípad bol spracovaný práve raz.
+
+    Každý shard zachováva poradie vstupu, preto stačí pre každý riadok vstupu zobrať nasledujúci riadok z jeho shardu. Spotreba pamäte nezávisí od veľkosti súborov.
+
+    Args:
+        input_file (file_handle): prístup k pôvodnému vstupnému súboru
+        shard_files (List[file_handle]): prístupy k výstupom shardov v poradí ich čísel
+        output_file (file_handle): prístup k výstupnému súboru
+
+    Raises:
+        ValueError: niektorý prípad chýba, je navyše alebo je v nesprávnom poradí
+
+    Returns:
+        int: počet zlúčených prípadov
+    """
+    pocet_shardov = len(shard_files)
+    hlavicka, shardy = _citaj_shardy(shard_files)
+
+    writer = csv.writer(output_file, delimiter=";")
+    writer.writerow(hlavicka)
+
+    reader = csv.reader(input_file, delimiter=";", strict=True)
+    pocet = 0
+    for riadok in reader:
+        # Prázdne riadky vstupu čítač dát preskakuje, vo výstupoch shardov preto nie sú
+        if not riadok:
+            continue
+        id_hp = riadok[0]
+        shard = cislo_shardu(id_hp, pocet_shardov)
+        vysledok = next(shardy[shard - 1], None)
+        if vysledok is None:
+            raise ValueError(
+                f"Prípad {id_hp} z riadku {reader.line_num} vstupu chýba vo výstupe shardu {shard}."
+            )
+        if vysledok[0] != id_hp:
+            raise ValueError(
+                f"Prípad {id_hp} z riadku {reader.line_num} vstupu nezodpovedá prípadu {vysledok[0]} vo výstupe shardu {shard}."
+            )
+        writer.writerow(vysledok)
+        pocet += 1
+
+    for shard, riadky in enumerate(shardy, start=1):
+        navyse = next(riadky, None)
+        if navyse is not None:
+            raise ValueError(
+                f"Výstup shardu {shard} obsahuje prípad {navyse[0]}, ktorý nie je vo vstupe."
+            )
+
+    return pocet
+
+
+def zluc_zoradene(shard_files, output_file):
+    """
+    Zlúči výstupy shardov zoradené podľa identifikátora prípadu a skontroluje, že sa žiaden prípad neopakuje.
+
+    Všetky riadky sa zoraďujú v pamäti.
+
+    Args:
+        shard_files (List[file_handle]): prístupy k výstupom shardov v poradí ich čísel
+        output_file (file_handle): prístup k výstupnému súboru
+
+    Raises:
+        ValueError: niektorý prípad sa vo výstupoch shardov opakuje
+
+    Returns:
+        int: počet zlúčených prípadov
+    """
+    hlavicka, shardy = _citaj_shardy(shard_files)
+    riadky = [riadok for riadky_shardu in shardy for riadok in riadky_shardu]
+    riadky.sort(key=lambda riadok: riadok[0])
+
+    for predchadzajuci, riadok in zip(riadky, riadky[1:]):
+        if predchadzajuci[0] == riadok[0]:
+            raise ValueError(f"Prípad {riadok[0]} sa vo výstupoch shardov opakuje.")
+
+    writer = csv.writer(output_file, delimiter=";")
+    writer.writerow(hlavicka)
+    writer.writerows(riadky)
+
+    return len(riadky)
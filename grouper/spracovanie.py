@@ -0,0 +1,279 @@
+"""
+Funkcie na vyhodnotenie hospitalizačných prípadov po dávkach, prípadne paralelne vo viacerých procesoch.
+
+Vstupom sú riadky načítané čítačom dát, výstupom je pre každý riadok veková skupina a zoznam priradených medicínskych služieb.
+
+Prílohy sú nemenné, dávky je preto možné vyhodnocovať aj vo viacerých vláknach jedného procesu. Vlákna zrýchlia vyhodnocovanie iba na verzii Pythonu bez GIL (free-threaded), inak sa striedajú na jednom jadre.
+"""
+
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from grouper.priprava_dat import priprav_hp, validuj_hp
+from grouper.vyhodnotenie_priloh import prirad_ms_s_prilohami
+
+# Počet hospitalizačných prípadov v jednej dávke
+VELKOST_DAVKY = 1000
+
+VEKOVA_SKUPINA_DETI = "deti"
+VEKOVA_SKUPINA_DOSPELI = "dospeli"
+VEKOVA_SKUPINA_NEZNAMA = "neznamy"
+
+
+def urci_vekovu_skupinu(vek):
+    """
+    Určí vekovú skupinu pacienta rovnako, ako sa určuje pri vyhodnocovaní príloh.
+
+    Args:
+        vek (int): vek pacienta, prípadne None
+
+    Returns:
+        str: veková skupina
+    """
+    if vek is None:
+        return VEKOVA_SKUPINA_NEZNAMA
+    return VEKOVA_SKUPINA_DETI if vek <= 18 else VEKOVA_SKUPINA_DOSPELI
+
+
+def deduplikuj_sluzby(sluzby):
+    """
+    Odstráni duplicitné medicínske služby, ponechá prvý výskyt každej služby spolu s jej prílohou.
+
+    Args:
+        sluzby (List[Tuple[str, str]]): zoznam dvojíc (číslo prílohy, medicínska služba)
+
+    Returns:
+        List[Tuple[str, str]]: zoznam dvojíc bez duplicitných medicínskych služieb
+    """
+    videne = set()
+    out = []
+    for priloha, sluzba in sluzby:
+        if sluzba not in videne:
+            videne.add(sluzba)
+            out.append((priloha, sluzba))
+    return out
+
+
+def vyhodnot_hp(
+    hospitalizacny_pripad,
+    vsetky_vykony_hlavne,
+    vyhodnot_neuplne_pripady,
+    ponechaj_duplicity,
+):
+    """
+    Zvaliduje, pripraví a vyhodnotí jeden hospitalizačný prípad. Vstupný riadok nemení.
+
+    Args:
+        hospitalizacny_pripad (dict): riadok načítaný čítačom dát
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+        vyhodnot_neuplne_pripady (bool): pokračuj vo vyhodnocovaní aj pri nevyplnených povinných hodnotách
+        ponechaj_duplicity (bool): ponechaj duplicitné medicínske služby
+
+    Returns:
+        Tuple[str, List[Tuple[str, str]]]: veková skupina a zoznam dvojíc (číslo prílohy, medicínska služba), pre neplatný prípad None namiesto zoznamu
+    """
+    hp = dict(hospitalizacny_pripad)
+
+    if not validuj_hp(hp, vyhodnot_neuplne_pripady):
+        return VEKOVA_SKUPINA_NEZNAMA, None
+
+    priprav_hp(hp)
+
+    sluzby = prirad_ms_s_prilohami(hp, vsetky_vykony_hlavne)
+
+    if not ponechaj_duplicity:
+        sluzby = deduplikuj_sluzby(sluzby)
+
+    return urci_vekovu_skupinu(hp["vek"]), sluzby
+
+
+def naformatuj_ms(sluzby):
+    """
+    Vytvorí hodnotu stĺpca 'ms' z výsledku vyhodnotenia.
+
+    Args:
+        sluzby (List[Tuple[str, str]]): zoznam dvojíc (číslo prílohy, medicínska služba), prípadne None
+
+    Returns:
+        str: medicínske služby oddelené znakom '~', pre neplatný prípad 'ERROR'
+    """
+    if sluzby is None:
+        return "ERROR"
+    return "~".join(sluzba for _, sluzba in sluzby)
+
+
+def naformatuj_prilohy(sluzby):
+    """
+    Vytvorí hodnotu stĺpca 'prilohy' skráteného výstupu z výsledku vyhodnotenia.
+
+    Args:
+        sluzby (List[Tuple[str, str]]): zoznam dvojíc (číslo prílohy, medicínska služba), prípadne None
+
+    Returns:
+        str: čísla príloh oddelené znakom '~' v poradí medicínskych služieb v stĺpci 'ms', pre neplatný prípad prázdny reťazec
+    """
+    if sluzby is None:
+        return ""
+    return "~".join(priloha for priloha, _ in sluzby)
+
+
+def naformatuj_skratene_riadky(davka, vysledky, s_prilohami=False):
+    """
+    Vytvorí riadky skráteného výstupu pre celú dávku.
+
+    Args:
+        davka (List[dict]): riadky načítané čítačom dát
+        vysledky (List[Tuple[str, List[Tuple[str, str]]]]): výsledky vyhodnotenia dávky
+        s_prilohami (bool, optional): pridaj hodnotu stĺpca 'prilohy'
+
+    Returns:
+        List[Tuple[str, ...]]: riadky výstupu (id, ms), prípadne (id, ms, prilohy)
+    """
+    if s_prilohami:
+        return [
+            (
+                hospitalizacny_pripad["id"],
+                naformatuj_ms(sluzby),
+                naformatuj_prilohy(sluzby),
+            )
+            for hospitalizacny_pripad, (_, sluzby) in zip(davka, vysledky)
+        ]
+    return [
+        (hospitalizacny_pripad["id"], naformatuj_ms(sluzby))
+        for hospitalizacny_pripad, (_, sluzby) in zip(davka, vysledky)
+    ]
+
+
+def vyhodnot_davku(
+    davka,
+    vsetky_vykony_hlavne,
+    vyhodnot_neuplne_pripady,
+    ponechaj_duplicity,
+):
+    """
+    Vyhodnotí dávku hospitalizačných prípadov. Funkcia sa spúšťa aj v samostatných procesoch.
+
+    Args:
+        davka (List[dict]): riadky načítané čítačom dát
+
+    Returns:
+        List[Tuple[str, List[Tuple[str, str]]]]: výsledky funkcie vyhodnot_hp v poradí riadkov
+    """
+    return [
+        vyhodnot_hp(
+            hospitalizacny_pripad,
+            vsetky_vykony_hlavne,
+            vyhodnot_neuplne_pripady,
+            ponechaj_duplicity,
+        )
+        for hospitalizacny_pripad in davka
+    ]
+
+
+def rozdel_na_davky(riadky, velkost_davky=VELKOST_DAVKY):
+    """
+    Postupne rozdelí riadky na dávky zadanej veľkosti.
+
+    Args:
+        riadky (Iterable[dict]): riadky načítané čítačom dát
+        velkost_davky (int, optional): počet riadkov v dávke
+
+    Yields:
+        List[dict]: dávka riadkov
+    """
+    riadky = iter(riadky)
+    while davka := list(islice(riadky, velkost_davky)):
+        yield davka
+
+
+def je_gil_zapnuty():
+    """
+    Zistí, či interpreter Pythonu používa GIL, ktorý neumožňuje vláknam vyhodnocovať súčasne.
+
+    Returns:
+        bool: True, ak interpreter používa GIL
+    """
+    # Funkcia je dostupná od Pythonu 3.13, staršie verzie GIL používajú vždy
+    je_zapnuty = getattr(sys, "_is_gil_enabled", None)
+    return je_zapnuty() if je_zapnuty is not None else True
+
+
+def _presmeruj_hlasenia():
+    """Presmeruje hlásenia procesu na štandardný chybový výstup."""
+    sys.stdout = sys.stderr
+
+
+def spracuj_davky(
+    davky,
+    vsetky_vykony_hlavne,
+    vyhodnot_neuplne_pripady,
+    ponechaj_duplicity,
+    pocet_procesov=1,
+    presmeruj_hlasenia=False,
+    pocet_vlakien=1,
+):
+    """
+    Vyhodnotí dávky hospitalizačných prípadov a vráti ich výsledky v pôvodnom poradí.
+
+    Pri viacerých procesoch alebo vláknach sa naraz spracúva najviac ich dvojnásobný počet dávok, takže spotreba pamäte nezávisí od veľkosti vstupu.
+
+    Args:
+        davky (Iterable[List[dict]]): dávky riadkov
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+        vyhodnot_neuplne_pripady (bool): pokračuj vo vyhodnocovaní aj pri nevyplnených povinných hodnotách
+        ponechaj_duplicity (bool): ponechaj duplicitné medicínske služby
+        pocet_procesov (int, optional): počet procesov, pri hodnote 1 sa dávky vyhodnocujú v hlavnom procese, pri hodnote 0 sa použije počet jadier procesora
+        presmeruj_hlasenia (bool, optional): hlásenia procesov vypisuj na štandardný chybový výstup
+        pocet_vlakien (int, optional): počet vlákien hlavného procesu, v ktorých sa dávky vyhodnocujú, pri hodnote 0 sa použije počet jadier procesora. Nie je možné kombinovať s viacerými procesmi.
+
+    Raises:
+        ValueError: zadaných je viacero procesov aj viacero vlákien
+
+    Yields:
+        Tuple[List[dict], List[Tuple[str, List[Tuple[str, str]]]]]: dávka a výsledky jej vyhodnotenia
+    """
+    vyhodnot = partial(
+        vyhodnot_davku,
+        vsetky_vykony_hlavne=vsetky_vykony_hlavne,
+        vyhodnot_neuplne_pripady=vyhodnot_neuplne_pripady,
+        ponechaj_duplicity=ponechaj_duplicity,
+    )
+
+    pocet_procesov = pocet_procesov or os.cpu_count() or 1
+    pocet_vlakien = pocet_vlakien or os.cpu_count() or 1
+
+    if pocet_procesov > 1 and pocet_vlakien > 1:
+        raise ValueError(
+            "Prípady je možné vyhodnocovať vo viacerých procesoch alebo vo viacerých vláknach, nie oboje naraz."
+        )
+
+    if pocet_vlakien > 1:
+        # Vlákna zdieľajú nemenné prílohy hlavného procesu, hlásenia idú na jeho štandardný výstup
+        executor = ThreadPoolExecutor(max_workers=pocet_vlakien)
+        pocet_uloh = pocet_vlakien
+    elif pocet_procesov > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=pocet_procesov,
+            initializer=_presmeruj_hlasenia if presmeruj_hlasenia else None,
+        )
+        pocet_uloh = pocet_procesov
+    else:
+        for davka in davky:
+            yield davka, vyhodnot(davka)
+        return
+
+    with executor:
+        rozpracovane = deque()
+        for davka in davky:
+            rozpracovane.append((davka, executor.submit(vyhodnot, davka)))
+            if len(rozpracovane) >= 2 * pocet_uloh:
+                davka, vysledok = rozpracovane.popleft()
+                yield davka, vysledok.result()
+
+        while rozpracovane:
+            davka, vysledok = rozpracovane.popleft()
+            yield davka, vysledok.result()
@@ -0,0 +1,110 @@
+"""
+Funkcie na agregáciu výsledkov vyhodnotenia do súhrnných počtov bez zápisu jednotlivých prípadov.
+
+Súhrn obsahuje počty prípadov podľa medicínskej služby, vekovej skupiny a prílohy, ktorá službu určila, a počty neplatných prípadov, prípadov bez medicínskej služby (S99-99) a prípadov s viacerými medicínskymi službami.
+"""
+
+import csv
+from collections import Counter
+
+NAZVY_STLPCOV_SUMARU = ["ukazovatel", "kod_ms", "vekova_skupina", "priloha", "pocet"]
+
+
+def vytvor_sumar():
+    """
+    Vytvorí prázdny súhrn.
+
+    Returns:
+        dict: súhrn s nulovými počtami
+    """
+    return {
+        "pocet_pripadov": 0,
+        "pocet_error": 0,
+        "pocet_s99_99": 0,
+        "pocet_viac_ms": 0,
+        "ms": Counter(),
+    }
+
+
+def zapocitaj_vysledok(sumar, vekova_skupina, sluzby):
+    """
+    Započíta výsledok vyhodnotenia jedného hospitalizačného prípadu do súhrnu.
+
+    Každá kombinácia medicínskej služby a prílohy sa v rámci jedného prípadu započíta najviac raz.
+
+    Args:
+        sumar (dict): súhrn
+        vekova_skupina (str): veková skupina pacienta
+        sluzby (List[Tuple[str, str]]): zoznam dvojíc (číslo prílohy, medicínska služba), pre neplatný prípad None
+
+    Returns:
+        None
+    """
+    sumar["pocet_pripadov"] += 1
+
+    if sluzby is None:
+        sumar["pocet_error"] += 1
+        return
+
+    if sluzby == [("", "S99-99")]:
+        sumar["pocet_s99_99"] += 1
+
+    if len({sluzba for _, sluzba in sluzby}) > 1:
+        sumar["pocet_viac_ms"] += 1
+
+    sumar["ms"].update(
+        (sluzba, vekova_skupina, priloha) for priloha, sluzba in set(sluzby)
+    )
+
+
+def zapis_sumar(sumar, file):
+    """
+    Zapíše súhrn do csv súboru vo formáte ukazovateľ;kód MS;veková skupina;príloha;počet.
+
+    Args:
+        sumar (dict): súhrn
+        file (file_handle): prístup k výstupnému súboru
+
+    Returns:
+        None
+    """
+    writer = csv.writer(file, delimiter=";")
+    writer.writerow(NAZVY_STLPCOV_SUMARU)
+    writer.writerow(["pocet_pripadov", "", "", "", sumar["pocet_pripadov"]])
+    writer.writerow(["ERROR", "", "", "", sumar["pocet_error"]])
+    writer.writerow(["S99-99", "", "", "", sumar["pocet_s99_99"]])
+    writer.writerow(["viac_ms", "", "", "", sumar["pocet_viac_ms"]])
+    for (sluzba, vekova_skupina, priloha), pocet in sorted(sumar["ms"].items()):
+        writer.writerow(["ms", sluzba, vekova_skupina, priloha, pocet])
+
+
+def sumar_do_json(sumar):
+    """
+    Prevedie súhrn do tvaru, ktorý je možné uložiť ako JSON.
+
+    Args:
+        sumar (dict): súhrn
+
+    Returns:
+        dict: súhrn s počtami podľa medicínskych služieb v zozname
+    """
+    return {
+        **sumar,
+        "ms": [[*kluc, pocet] for kluc, pocet in sumar["ms"].items()],
+    }
+
+
+def sumar_z_json(data):
+    """
+    Prevedie súhrn načítaný z JSON späť na počítadlá.
+
+    Args:
+        data (dict): súhrn vytvorený funkciou sumar_do_json
+
+    Returns:
+        dict: súhrn
+    """
+    return {
+        **data,
+        "ms": Counter({tuple(kluc): pocet for *kluc, pocet in data["ms"]}),
+    }
@@ -0,0 +1,132 @@
+"""
+Funkcie na kontrolu vstupného súboru s dátami bez vyhodnocovania príloh.
+
+Skontroluje každý riadok podľa rovnakých pravidiel ako funkcia validuj_hp a vytvorí súhrnný report o chybách.
+"""
+
+import csv
+from collections import Counter
+from itertools import zip_longest
+
+from grouper.priprava_dat import NAZVY_STLPCOV, MIN_POCET_STLPCOV, najdi_chybne_polia
+
+# Počet vzorových ID, ktoré sa pre každé pole uchovajú v reporte
+POCET_VZORIEK = 5
+
+# Maximálny počet chybných riadkov csv, ktoré sa v reporte vypíšu jednotlivo
+POCET_VYPISANYCH_RIADKOV = 100
+
+
+def validuj_subor(file, pocet_vzoriek=POCET_VZORIEK):
+    """
+    Skontroluje všetky riadky vstupného súboru a spočíta chyby podľa jednotlivých polí.
+
+    Riadky so zlým formátom csv alebo so zlým počtom stĺpcov sa zaznamenajú a kontrola pokračuje ďalším riadkom. Prázdne riadky sa preskakujú a chýbajúce stĺpce na konci riadku sa považujú za nevyplnené rovnako ako pri vyhodnocovaní.
+
+    Args:
+        file (file_handle): prístup k vstupnému súboru
+        pocet_vzoriek (int, optional): počet vzorových ID uchovaných pre každé pole
+
+    Returns:
+        dict: report s kľúčmi
+            pocet_riadkov (int): počet načítaných riadkov,
+            pocet_chybnych_pripadov (int): počet prípadov s aspoň jedným chybným poľom,
+            chyby_poli (Counter): počet chýb podľa názvu poľa,
+            vzorky (dict): vzorové dvojice (číslo riadku, id) podľa názvu poľa,
+            zle_riadky (List[Tuple[int, str]]): čísla riadkov so zlým formátom csv a popis chyby.
+    """
+    report = {
+        "pocet_riadkov": 0,
+        "pocet_chybnych_pripadov": 0,
+        "chyby_poli": Counter(),
+        "vzorky": {},
+        "zle_riadky": [],
+    }
+
+    reader = csv.reader(file, delimiter=";", strict=True)
+
+    while True:
+        try:
+            riadok = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as chyba:
+            report["pocet_riadkov"] += 1
+            report["zle_riadky"].append((reader.line_num, str(chyba)))
+            continue
+
+        # Prázdne riadky čítač dát pri vyhodnocovaní preskakuje
+        if not riadok:
+            continue
+
+        report["pocet_riadkov"] += 1
+
+        if not MIN_POCET_STLPCOV <= len(riadok) <= len(NAZVY_STLPCOV):
+            report["zle_riadky"].append(
+                (
+                    reader.line_num,
+                    f"očakávaných {MIN_POCET_STLPCOV} až {len(NAZVY_STLPCOV)} stĺpcov, nájdených {len(riadok)}",
+                )
+            )
+            continue
+
+        # Chýbajúce stĺpce na konci riadku majú hodnotu None rovnako ako v čítači dát
+        hp = dict(zip_longest(NAZVY_STLPCOV, riadok))
+        chybne_polia = najdi_chybne_polia(hp)
+        if not chybne_polia:
+            continue
+
+        report["pocet_chybnych_pripadov"] += 1
+        report["chyby_poli"].update(chybne_polia)
+        for pole in chybne_polia:
+            vzorky = report["vzorky"].setdefault(pole, [])
+            if len(vzorky) < pocet_vzoriek:
+                vzorky.append((reader.line_num, hp["id"]))
+
+    return report
+
+
+def vypis_report(report):
+    """
+    Vypíše report z kontroly vstupného súboru.
+
+    Args:
+        report (dict): report vytvorený funkciou validuj_subor
+
+    Returns:
+        None
+    """
+    print(f'Počet skontrolovaných riadkov: {report["pocet_riadkov"]}')
+    print(f'Počet prípadov s chybným poľom: {report["pocet_chybnych_pripadov"]}')
+
+    if report["chyby_poli"]:
+        print("Chyby podľa polí:")
+        for pole in NAZVY_STLPCOV:
+            if pole not in report["chyby_poli"]:
+                continue
+            vzorky = ", ".join(
+                f"{id_hp or '(prázdne)'} (riadok {cislo_riadku})"
+                for cislo_riadku, id_hp in report["vzorky"][pole]
+            )
+            print(f'  {pole}: {report["chyby_poli"][pole]}, napr. {vzorky}')
+
+    print(f'Počet riadkov so zlým formátom csv: {len(report["zle_riadky"])}')
+    for cislo_riadku, popis in report["zle_riadky"][:POCET_VYPISANYCH_RIADKOV]:
+        print(f"  riadok {cislo_riadku}: {popis}")
+    if len(report["zle_riadky"]) > POCET_VYPISANYCH_RIADKOV:
+        print(
+            f'  ... a ďalších {len(report["zle_riadky"]) - POCET_VYPISANYCH_RIADKOV} riadkov'
+        )
+
+
+def je_subor_v_poriadku(report):
+    """
+    Vyhodnotí, či report neobsahuje žiadne chyby.
+
+    Args:
+        report (dict): report vytvorený funkciou validuj_subor
+
+    Returns:
+        bool: True, ak sa v súbore nenašla žiadna chyba
+    """
+    return not report["pocet_chybnych_pripadov"] and not report["zle_riadky"]
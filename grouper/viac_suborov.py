@@ -0,0 +1,153 @@
+"""
+Funkcie na spracovanie viacerých vstupných súborov naraz, napr. mesačných dávok od jednotlivých poisťovní a nemocníc.
+
+Cesty k súborom sa zadávajú priamo, vzorom so zástupnými znakmi alebo adresárom. Prílohy sa načítajú raz v hlavnom procese a procesy, ktoré súbory spracúvajú, ich zdedia. Každý súbor spracúva jeden proces, výstup sa zapíše vedľa vstupného súboru a po dokončení sa vypíše súhrn za každý súbor.
+"""
+
+import glob
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+# Výstupy programu, ktoré sa pri hľadaní vstupných súborov v adresári preskakujú
+VYSTUPNY_SUBOR = re.compile(r"_output(_\d+_\d+)?\.csv$")
+
+
+def je_viac_suborov(cesty):
+    """
+    Zistí, či sa zadané cesty majú spracovať ako viac vstupných súborov, t.j. či ide o viac ciest, adresár alebo vzor so zástupnými znakmi.
+
+    Ostatné cesty sa spracujú ako jeden vstup, aj keď nejde o bežný súbor, napr. pomenovaná rúra, '/dev/stdin' alebo '<(zcat ...)'.
+
+    Args:
+        cesty (List[str]): zadané cesty
+
+    Returns:
+        bool: True, ak sa majú cesty spracovať ako viac súborov
+    """
+    if len(cesty) > 1:
+        return True
+    cesta = cesty[0]
+    return os.path.isdir(cesta) or (glob.has_magic(cesta) and not os.path.exists(cesta))
+
+
+def najdi_vstupne_subory(cesty):
+    """
+    Nájde vstupné súbory podľa zadaných ciest.
+
+    Cesta môže byť súbor, vzor so zástupnými znakmi '*', '?' a '[...]' alebo adresár, v ktorom sa spracujú všetky súbory s príponou '.csv'. Výstupy programu sa v adresári ani vo vzore nevyberajú. Každý súbor sa vráti iba raz.
+
+    Args:
+        cesty (List[str]): cesty k súborom, vzory alebo adresáre
+
+    Raises:
+        ValueError: cesta neexistuje alebo vzoru nezodpovedá žiaden súbor
+
+    Returns:
+        List[str]: cesty k vstupným súborom v poradí zadania, súbory z adresára a vzoru zoradené podľa názvu
+    """
+    subory = {}
+    for cesta in cesty:
+        if os.path.isfile(cesta):
+            najdene = [cesta]
+        else:
+            if os.path.isdir(cesta):
+                najdene = [
+                    os.path.join(cesta, nazov)
+                    for nazov in os.listdir(cesta)
+                    if nazov.lower().endswith(".csv")
+                ]
+            elif glob.has_magic(cesta):
+                najdene = glob.glob(cesta)
+            else:
+                raise ValueError(f"Súbor alebo adresár {cesta} neexistuje.")
+            najdene = sorted(
+                subor
+                for subor in najdene
+                if os.path.isfile(subor) and not VYSTUPNY_SUBOR.search(subor)
+            )
+
+        if not najdene:
+            raise ValueError(f"Ceste {cesta} nezodpovedá žiaden vstupný súbor.")
+        for subor in najdene:
+            subory.setdefault(os.path.normpath(subor), None)
+
+    return list(subory)
+
+
+def _spracuj_subor(spracuj, file_path, nastavenia):
+    """
+    Spracuje jeden vstupný súbor v samostatnom procese. Hlásenia k jednotlivým prípadom sa nevypisujú, aby sa nemiešali s hláseniami ostatných súborov.
+
+    Returns:
+        Tuple[dict, float, BaseException]: súhrnné počty spracovaných prípadov, trvanie spracovania v sekundách a chyba, ak spracovanie zlyhalo
+    """
+    zaciatok = time.perf_counter()
+    try:
+        with open(os.devnull, "w") as hlasenia, redirect_stdout(hlasenia):
+            sumar = spracuj(file_path, **nastavenia)
+    except (Exception, SystemExit) as chyba:
+        return None, time.perf_counter() - zaciatok, chyba
+    return sumar, time.perf_counter() - zaciatok, None
+
+
+def _kontext_procesov():
+    """Vráti kontext, v ktorom procesy vznikajú rozvetvením hlavného procesu a zdedia jeho načítané prílohy, ak to systém umožňuje."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def spracuj_subory(subory, spracuj, nastavenia, pocet_procesov=0):
+    """
+    Spracuje vstupné súbory súčasne vo viacerých procesoch a postupne vracia výsledky v poradí dokončenia.
+
+    Prílohy musia byť načítané ešte pred volaním funkcie. Na systémoch, kde nie je možné proces rozvetviť (Windows), si ich každý proces načíta raz pri svojom spustení.
+
+    Args:
+        subory (List[str]): cesty k vstupným súborom
+        spracuj (Callable): funkcia, ktorá spracuje jeden súbor a vráti súhrnné počty prípadov, volá sa s cestou k súboru a nastaveniami
+        nastavenia (dict): ďalšie pomenované argumenty funkcie spracuj, rovnaké pre všetky súbory
+        pocet_procesov (int, optional): počet súčasne spracúvaných súborov, pri hodnote 0 sa použije počet jadier procesora
+
+    Yields:
+        Tuple[str, dict, float, BaseException]: cesta k súboru, súhrnné počty prípadov, trvanie spracovania v sekundách a chyba, ak spracovanie zlyhalo, inak None
+    """
+    pocet_procesov = min(pocet_procesov or os.cpu_count() or 1, len(subory))
+
+    with ProcessPoolExecutor(
+        max_workers=pocet_procesov, mp_context=_kontext_procesov()
+    ) as executor:
+        rozpracovane = {
+            executor.submit(_spracuj_subor, spracuj, file_path, nastavenia): file_path
+            for file_path in subory
+        }
+        for vysledok in as_completed(rozpracovane):
+            yield (rozpracovane[vysledok], *vysledok.result())
+
+
+def vypis_vysledok_suboru(file_path, sumar, trvanie, chyba=None):
+    """
+    Vypíše súhrn spracovania jedného vstupného súboru.
+
+    Args:
+        file_path (str): cesta k vstupnému súboru
+        sumar (dict): súhrnné počty spracovaných prípadov, pri chybe None
+        trvanie (float): trvanie spracovania v sekundách
+        chyba (BaseException, optional): chyba, pre ktorú spracovanie zlyhalo
+
+    Returns:
+        None
+    """
+    if chyba is not None:
+        # Program pri chybe vstupu končí volaním sys.exit so správou, ktorá už obsahuje 'ERROR'
+        popis = str(chyba) if isinstance(chyba, SystemExit) else f"ERROR: {chyba!r}"
+        print(f"{file_path}: {popis} ({trvanie:.1f} s)")
+        return
+    print(
+        f"{file_path}: {sumar['pocet_pripadov']} prípadov, ERROR {sumar['pocet_error']}, "
+        f"S99-99 {sumar['pocet_s99_99']}, {trvanie:.1f} s"
+    )
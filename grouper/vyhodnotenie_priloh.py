@@ -2,6 +2,8 @@
 Funkcie na vyhodnotenie jednotlivých príloh zákona 531/2023 Z. z.
 
 Hlavnými funkicami sú funkcie nazvané priloha_x, prípadne prilohy_x_y. Tieto funkcie vždy vracajú zoznam nájdených medicínskych služieb.
+
+Pripravené prílohy sa funkciám odovzdávajú explicitne v argumente tabulky. Prílohy sú nemenné, takže funkcie je možné volať súčasne z viacerých vlákien. Pri importe modulu sa prílohy raz pripravia do premennej tabulky, ktorú funkcie prirad_ms_s_prilohami a prirad_ms používajú, ak nie sú zadané iné prílohy.
 """
 
 import re
@@ -10,13 +12,14 @@ from grouper.priprava_priloh import priprav_vsetky_prilohy
 tabulky = priprav_vsetky_prilohy()
 
 
-def s_viacerymi_tazkymi_problemami(diagnozy):
+def s_viacerymi_tazkymi_problemami(tabulky, diagnozy):
     """
     Vyhodnocuje splnenie podmienky pre globálnu funkciu „Viaceré ťažké problémy u novorodencov“ v klasifikačnom systéme.
 
     Interne je táto definícia implementovaná pomocou zoznamu diagnóz zapísaného v tabuľke. Je nutné mať aspoň 2 diagnózy z tohto zoznamu.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         diagnozy (List[str]): zoznam diagnóz
 
     Returns:
@@ -35,13 +38,14 @@ def s_viacerymi_tazkymi_problemami(diagnozy):
     return pocet_tazkych_problemov >= 2
 
 
-def so_signifikantnym_vykonom(vykony):
+def so_signifikantnym_vykonom(tabulky, vykony):
     """
     Vyhodnocuje splnenie podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme.
 
     Interne je táto definícia implementovaná pomocou zoznamu výkonov zapísaného v tabuľke.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         vykony (List[str]): zoznam výkonov
 
     Returns:
@@ -50,11 +54,12 @@ def so_signifikantnym_vykonom(vykony):
     return any(vykon in tabulky["p5_signifikantne_OP_vykony"] for vykon in vykony)
 
 
-def splna_kriterium_podla_5(kriterium, diagnozy, vykony, hmotnost, upv):
+def splna_kriterium_podla_5(tabulky, kriterium, diagnozy, vykony, hmotnost, upv):
     """
     Vyhodnotenie doplňujúcich kritérií podľa prílohy 5.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         kriterium (str): názov kritéria
         diagnozy (List[str]): zoznam diagnóz
         vykony (Listr[str]): zoznam výkonov
@@ -106,7 +111,7 @@ def splna_kriterium_podla_5(kriterium, diagnozy, vykony, hmotnost, upv):
 
     # Doplňujúce kritérium „So signifikantným OP výkonom“ je splnené, ak hospitalizačný prípad pacienta splnil podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme.
     if kriterium == "So signifikantným OP výkonom":
-        return so_signifikantnym_vykonom(vykony)
+        return so_signifikantnym_vykonom(tabulky, vykony)
 
     # Doplňujúce kritérium „Bez signifikantného OP výkonu, s UPV > 95 hodín, s viacerými ťažkými problémami“ je splnené, ak hospitalizačný prípad pacienta nesplnil podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme, ale dĺžka umelej pľúcnej ventilácie poskytnutej počas hospitalizácie v súlade s pravidlami kódovania pre umelú pľúcnu ventiláciu bola vyššia ako 95 hodín a hospitalizačný prípad splnil podmienky pre globálnu funkciu „Viaceré ťažké problémy u novorodencov“ v klasifikačnom systéme.
     if (
@@ -114,10 +119,10 @@ def splna_kriterium_podla_5(kriterium, diagnozy, vykony, hmotnost, upv):
         == "Bez signifikantného OP výkonu, s UPV > 95 hodín, s viacerými ťažkými problémami"
     ):
         return (
-            not so_signifikantnym_vykonom(vykony)
+            not so_signifikantnym_vykonom(tabulky, vykony)
             and upv is not None
             and upv > 95
-            and s_viacerymi_tazkymi_problemami(diagnozy)
+            and s_viacerymi_tazkymi_problemami(tabulky, diagnozy)
         )
 
     # Doplňujúce kritérium „Bez signifikantného OP výkonu a bez UPV > 95 hodín a viacerých ťažkých problémov“ je splnené, ak hospitalizačný prípad pacienta nesplnil podmienky pre globálnu funkciu „Signifikantný operačný výkon“ v klasifikačnom systéme a zároveň dĺžka umelej pľúcnej ventilácie poskytnutej počas hospitalizácie v súlade s pravidlami kódovania pre umelú pľúcnu ventiláciu nebola vyššia ako 95 hodín alebo hospitalizačný prípad nesplnil podmienky pre globálnu funkciu „Viaceré ťažké problémy u novorodencov“ v klasifikačnom systéme.
@@ -125,17 +130,18 @@ def splna_kriterium_podla_5(kriterium, diagnozy, vykony, hmotnost, upv):
         kriterium
         == "Bez signifikantného OP výkonu a bez UPV > 95 hodín a viacerých ťažkých problémov"
     ):
-        return not so_signifikantnym_vykonom(vykony) and (
+        return not so_signifikantnym_vykonom(tabulky, vykony) and (
             (upv is not None and upv <= 95)
-            or not s_viacerymi_tazkymi_problemami(diagnozy)
+            or not s_viacerymi_tazkymi_problemami(tabulky, diagnozy)
         )
 
 
-def priloha_5(hmotnost, upv, diagnozy, vykony, drg):
+def priloha_5(tabulky, hmotnost, upv, diagnozy, vykony, drg):
     """
     Medicínska služba sa určí podľa skupiny klasifikačného systému, do ktorej bol hospitalizačný prípad zaradený alebo podľa skupiny klasifikačného systému a zdravotného výkonu alebo diagnózy podľa doplňujúceho kritéria (NOV).
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         hmotnost (int): hmotnosť poistenca v gramoch
         upv (int): doba umelej pľúcnej ventilácie v hodinách
         diagnozy (List[str]): zoznam diagnóz
@@ -153,6 +159,7 @@ def priloha_5(hmotnost, upv, diagnozy, vykony, drg):
         and (
             not line["doplnujuce_kriterium"]
             or splna_kriterium_podla_5(
+                tabulky,
                 line["doplnujuce_kriterium"],
                 diagnozy,
                 vykony,
@@ -199,7 +206,7 @@ def splna_kriterium_podla_6(kriterium, diagnozy):
         return not s_kraniocerebralnou_traumou(diagnozy)
 
 
-def priloha_6(drg, diagnozy, je_dieta):
+def priloha_6(tabulky, drg, diagnozy, je_dieta):
     """
     Ak bol hospitalizačný prípad poistenca zaradený podľa klasifikačného systému do skupiny podľa stĺpca "Skupina klasifikačného systému" pri diagnóze zodpovedajúcej stĺpcu „skupina diagnóz“, hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (DRGD).
 
@@ -211,6 +218,7 @@ def priloha_6(drg, diagnozy, je_dieta):
     Rozdelené podľa veku.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         drg (str): skupina klasifikačného systému DRG
         diagnozy (List[str]): zoznam diagnóz
         je_dieta (bool): poistenec vo veku 18 rokov a menej
@@ -228,11 +236,12 @@ def priloha_6(drg, diagnozy, je_dieta):
     ]
 
 
-def poskytnuty_vedlajsi_vykon(vykony, skupina_vykonov, nazov_tabulky):
+def poskytnuty_vedlajsi_vykon(tabulky, vykony, skupina_vykonov, nazov_tabulky):
     """
     Bol vykázaný minimálne jeden výkon z uvedenej skupiny výkonov.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         vykony (List[str]): zoznam výkonov
         skupina_vykonov (str): skupina výkonov podľa hlavného výkonu
         nazov_tabulky (str): názov tabuľky, v ktorej sa nachádzajú prislúchajúce skupiny výkonov
@@ -249,7 +258,7 @@ def poskytnuty_vedlajsi_vykon(vykony, skupina_vykonov, nazov_tabulky):
     return any(vykon in cielove_vykony for vykon in vykony)
 
 
-def prilohy_7_8(vykony, je_dieta, vsetky_vykony_hlavne):
+def prilohy_7_8(tabulky, vykony, je_dieta, vsetky_vykony_hlavne):
     """
     Ak bol poistencovi poskytnutý hlavný zdravotný výkon podľa stĺpca "zdravotný výkon" a minimálne jeden výkon z uvedených výkonov (VV, kombinácia Výkon - Výkon).
 
@@ -257,6 +266,7 @@ def prilohy_7_8(vykony, je_dieta, vsetky_vykony_hlavne):
     Vedľajšie výkony sa kontrolujú z tabuliek p7_vedlajsie_vykony a p8_vedlajsie_vykony podľa parametru skupina_vedlajsich_vykonov.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         vykony (List[str]): zoznam výkonov
         je_dieta (bool): poistenec vo veku 18 rokov a menej
         vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
@@ -279,6 +289,7 @@ def prilohy_7_8(vykony, je_dieta, vsetky_vykony_hlavne):
         for line in tabulky[nazov_tabulky]
         if line["kod_hlavneho_vykonu"] == hlavny_vykon
         and poskytnuty_vedlajsi_vykon(
+            tabulky,
             vedlajsie_vykony,
             line["kod_ms"],
             nazov_vedlajsej_tabulky,
@@ -294,6 +305,7 @@ def prilohy_7_8(vykony, je_dieta, vsetky_vykony_hlavne):
                     for line in tabulky[nazov_tabulky]
                     if line["kod_hlavneho_vykonu"] == hlavny_vykon
                     and poskytnuty_vedlajsi_vykon(
+                        tabulky,
                         vedlajsie_vykony,
                         line["kod_ms"],
                         nazov_vedlajsej_tabulky,
@@ -304,11 +316,12 @@ def prilohy_7_8(vykony, je_dieta, vsetky_vykony_hlavne):
     return out
 
 
-def splna_diagnoza_zo_skupiny_podla_9(hlavna_diagnoza, skupina_diagnoz):
+def splna_diagnoza_zo_skupiny_podla_9(tabulky, hlavna_diagnoza, skupina_diagnoz):
     """
     Kontroluj, či prípad má hlavnú diagnózu patriacu skupine definovaných diagnóz.
 
         Args:
+            tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
             hlavna_diagnoza (List[str]): hlavná diagnóza hospitalizačného prípadu
             skupina_diagnoz (str): Názov skupiny diagnóz podľa prílohy 9
             je_dieta (bool): poistenec vo veku 18 rokov a menej
@@ -328,11 +341,12 @@ def splna_diagnoza_zo_skupiny_podla_9(hlavna_diagnoza, skupina_diagnoz):
     )
 
 
-def priloha_9(diagnozy, vykony, je_dieta, vsetky_vykony_hlavne):
+def priloha_9(tabulky, diagnozy, vykony, je_dieta, vsetky_vykony_hlavne):
     """
     Ak bol poistencovi poskytnutý hlavný zdravotný výkon podľa stĺpca "názov zdravotného výkonu" pri hlavnej diagnóze zo skupiny diagnóz podľa stĺpca „Skupina diagnóz“, hospitalizácii sa určí medicínska služba podľa stĺpca "Názov medicínskej služby" (VD).
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         diagnozy (List[str]): zoznam diagnóz
         vykony (List[str]): zoznam výkonov
         je_dieta (bool): poistenec vo veku 18 rokov a menej
@@ -353,7 +367,9 @@ def priloha_9(diagnozy, vykony, je_dieta, vsetky_vykony_hlavne):
         line["kod_ms"]
         for line in tabulky[nazov_tabulky]
         if line["kod_hlavneho_vykonu"] == hlavny_vykon
-        and splna_diagnoza_zo_skupiny_podla_9(hlavna_diagnoza, line["skupina_diagnoz"])
+        and splna_diagnoza_zo_skupiny_podla_9(
+            tabulky, hlavna_diagnoza, line["skupina_diagnoz"]
+        )
     ]
 
     if vsetky_vykony_hlavne:
@@ -364,7 +380,7 @@ def priloha_9(diagnozy, vykony, je_dieta, vsetky_vykony_hlavne):
                     for line in tabulky[nazov_tabulky]
                     if line["kod_hlavneho_vykonu"] == hlavny_vykon
                     and splna_diagnoza_zo_skupiny_podla_9(
-                        hlavna_diagnoza, line["skupina_diagnoz"]
+                        tabulky, hlavna_diagnoza, line["skupina_diagnoz"]
                     )
                 ]
             )
@@ -372,11 +388,12 @@ def priloha_9(diagnozy, vykony, je_dieta, vsetky_vykony_hlavne):
     return out
 
 
-def priloha_10(diagnozy):
+def priloha_10(tabulky, diagnozy):
     """
     Ak bola poistencovi pri hospitalizácii vykázaná hlavná diagnóza podľa stĺpca „skupina diagnóz pre hlavnú diagnózu“ a vedľajšia diagnóza podľa stĺpca „názov vedľajšej diagnózy“, hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (DD).
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         diagnozy (List[str]): zoznam diagnóz
 
     Returns:
@@ -390,13 +407,14 @@ def priloha_10(diagnozy):
     ]
 
 
-def ms_podla_hlavneho_vykonu(vykony, nazov_tabulky, vsetky_vykony_hlavne):
+def ms_podla_hlavneho_vykonu(tabulky, vykony, nazov_tabulky, vsetky_vykony_hlavne):
     """
     Vráť zoznam medicínskych služieb podľa vykázaného hlavného výkonu.
 
     Mechanizmus použitý v prílohách 12, 13 a 17.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         vykony (List[str]): zoznam výkonov
         nazov_tabulky (bool): názov tabuľky, v ktorej sú definované medicínske služby
         vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
@@ -428,13 +446,14 @@ def ms_podla_hlavneho_vykonu(vykony, nazov_tabulky, vsetky_vykony_hlavne):
     return out
 
 
-def prilohy_12_13(vykony, je_dieta, vsetky_vykony_hlavne):
+def prilohy_12_13(tabulky, vykony, je_dieta, vsetky_vykony_hlavne):
     """
     Ak bol poistencovi poskytnutý hlavný zdravotný výkon podľa stĺpca "zdravotný výkon", hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (V).
 
     Rozdelené podľa veku.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         vykony (List[str]): zoznam výkonov
         je_dieta (bool): poistenec vo veku 18 rokov a menej
         vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
@@ -444,15 +463,18 @@ def prilohy_12_13(vykony, je_dieta, vsetky_vykony_hlavne):
     """
     nazov_tabulky = "p12_V_deti" if je_dieta else "p13_V_dospeli"
 
-    return ms_podla_hlavneho_vykonu(vykony, nazov_tabulky, vsetky_vykony_hlavne)
+    return ms_podla_hlavneho_vykonu(
+        tabulky, vykony, nazov_tabulky, vsetky_vykony_hlavne
+    )
 
 
-def prilohy_14_15(diagnozy, je_dieta):
+def prilohy_14_15(tabulky, diagnozy, je_dieta):
     """Ak bola poistencov pri hospitalizácii vykázaná hlavná diagnóza podľa stĺpca "hlavná diagnóza", hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba" (D).
 
     Rozdelené podľa veku.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         diagnozy (List[str]): zoznam diagnóz
         je_dieta (bool): pacient vo veku 18 rokov a menej
 
@@ -468,11 +490,12 @@ def prilohy_14_15(diagnozy, je_dieta):
     ]
 
 
-def priloha_16(diagnozy):
+def priloha_16(tabulky, diagnozy):
     """
     Medicínska služba „Identifikácia mŕtveho darcu orgánov“ (S17-22) sa určí, ak je pri hospitalizačnom prípade vykázaná aspoň jedna diagnóza zo skupiny diagnóz „Kóma“ a súčasne aspoň jedna diagnóza zo skupiny „Opuch mozgu“ a súčasne aspoň jedna z diagnóz so skupiny „Vybrané ochorenia mozgu“ (S)
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         diagnozy (List[str]): Zoznam diagnóz hospitalizačného prípadu.
 
     Returns:
@@ -494,7 +517,7 @@ def priloha_16(diagnozy):
     return [kod_ms]
 
 
-def priloha_17(vykony, vsetky_vykony_hlavne):
+def priloha_17(tabulky, vykony, vsetky_vykony_hlavne):
     """
     V hospitalizačných prípadoch, v ktorých bol vykázaný hlavný výkon podľa stĺpca "zdravotný výkon", hospitalizácii sa určí medicínska služba podľa stĺpca "medicínska služba".
 
@@ -505,73 +528,109 @@ def priloha_17(vykony, vsetky_vykony_hlavne):
     Zdieľa mechanizmus vyhodnocovania s prílohami 12 a 13.
 
     Args:
+        tabulky (Mapping[str, tuple]): pripravené prílohy z funkcie priprav_vsetky_prilohy
         vykony (List[str]): Zoznam výkonov hospitalizačného prípadu.
         vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
 
     Returns:
         [List[str]]: Zoznam medicínskych služieb.
     """
-    return ms_podla_hlavneho_vykonu(vykony, "p17", vsetky_vykony_hlavne)
+    return ms_podla_hlavneho_vykonu(tabulky, vykony, "p17", vsetky_vykony_hlavne)
 
 
-def prirad_ms(hp, vsetky_vykony_hlavne):
-    """Vyhodnoť všetky prílohy a vytvor zoznam medicínskych služieb priraditeľných k hospitalizačnému prípadu.
+def prirad_ms_s_prilohami(hp, vsetky_vykony_hlavne, tabulky=tabulky):
+    """Vyhodnoť všetky prílohy a vytvor zoznam medicínskych služieb priraditeľných k hospitalizačnému prípadu spolu s číslom prílohy, podľa ktorej bola služba určená.
 
     Príloha sa vyhodnocuje, iba pokiaľ hospitalizačný prípad má vyplnené polia nutné pre vyhodnotenie prílohy.
 
     Ako prvá sa vyhodnocuje príloha 17 s analytickými medicínskymi službami.
 
-    Pokiaľ hospitalizačný prípad nezapadá do žiadnej medicínskej služby podľa príloh, je mu priradená služba S99-99.
+    Pokiaľ hospitalizačný prípad nezapadá do žiadnej medicínskej služby podľa príloh, je mu priradená služba S99-99 s prázdnym číslom prílohy.
 
     Args:
         hp (dict): hospitalizačný prípad
         vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+        tabulky (Mapping[str, tuple], optional): pripravené prílohy z funkcie priprav_vsetky_prilohy, štandardne prílohy pripravené pri importe modulu
 
     Returns:
-        List[str]: zoznam medicínskych služieb
+        List[Tuple[str, str]]: zoznam dvojíc (číslo prílohy, medicínska služba)
     """
     services = []
 
     je_dieta = hp["vek"] is not None and hp["vek"] <= 18
 
+    def pridaj(priloha, sluzby):
+        services.extend((priloha, sluzba) for sluzba in sluzby)
+
     if hp["vykony"]:
-        services.extend(priloha_17(hp["vykony"], vsetky_vykony_hlavne))
+        pridaj("17", priloha_17(tabulky, hp["vykony"], vsetky_vykony_hlavne))
 
     if hp["drg"]:
-        services.extend(
+        pridaj(
+            "5",
             priloha_5(
+                tabulky,
                 hp["hmotnost"],
                 hp["umela_plucna_ventilacia"],
                 hp["diagnozy"],
                 hp["vykony"],
                 hp["drg"],
-            )
+            ),
         )
 
     if hp["drg"] and hp["vek"] is not None and hp["diagnozy"]:
-        services.extend(priloha_6(hp["drg"], hp["diagnozy"], je_dieta))
+        pridaj("6", priloha_6(tabulky, hp["drg"], hp["diagnozy"], je_dieta))
 
     if hp["vek"] is not None and hp["vykony"]:
-        services.extend(prilohy_7_8(hp["vykony"], je_dieta, vsetky_vykony_hlavne))
+        pridaj(
+            "7" if je_dieta else "8",
+            prilohy_7_8(tabulky, hp["vykony"], je_dieta, vsetky_vykony_hlavne),
+        )
 
     if hp["vek"] is not None and hp["diagnozy"] and hp["vykony"]:
-        services.extend(
-            priloha_9(hp["diagnozy"], hp["vykony"], je_dieta, vsetky_vykony_hlavne)
+        pridaj(
+            "9",
+            priloha_9(
+                tabulky, hp["diagnozy"], hp["vykony"], je_dieta, vsetky_vykony_hlavne
+            ),
         )
 
     if hp["diagnozy"]:
-        services.extend(priloha_10(hp["diagnozy"]))
+        pridaj("10", priloha_10(tabulky, hp["diagnozy"]))
 
     if hp["vek"] is not None and hp["vykony"]:
-        services.extend(prilohy_12_13(hp["vykony"], je_dieta, vsetky_vykony_hlavne))
+        pridaj(
+            "12" if je_dieta else "13",
+            prilohy_12_13(tabulky, hp["vykony"], je_dieta, vsetky_vykony_hlavne),
+        )
 
     if hp["vek"] is not None and hp["diagnozy"]:
-        services.extend(prilohy_14_15(hp["diagnozy"], je_dieta))
+        pridaj(
+            "14" if je_dieta else "15", prilohy_14_15(tabulky, hp["diagnozy"], je_dieta)
+        )
 
     if hp["diagnozy"]:
-        services.extend(priloha_16(hp["diagnozy"]))
+        pridaj("16", priloha_16(tabulky, hp["diagnozy"]))
 
     if not services:
-        services = ["S99-99"]
+        services = [("", "S99-99")]
 
     return services
+
+
+def prirad_ms(hp, vsetky_vykony_hlavne, tabulky=tabulky):
+    """Vyhodnoť všetky prílohy a vytvor zoznam medicínskych služieb priraditeľných k hospitalizačnému prípadu.
+
+    Pokiaľ hospitalizačný prípad nezapadá do žiadnej medicínskej služby podľa príloh, je mu priradená služba S99-99.
+
+    Args:
+        hp (dict): hospitalizačný prípad
+        vsetky_vykony_hlavne (bool): skúša všetky možné hlavné výkony
+        tabulky (Mapping[str, tuple], optional): pripravené prílohy z funkcie priprav_vsetky_prilohy, štandardne prílohy pripravené pri importe modulu
+
+    Returns:
+        List[str]: zoznam medicínskych služieb
+    """
+    return [
+        sluzba for _, sluzba in prirad_ms_s_prilohami(hp, vsetky_vykony_hlavne, tabulky)
+    ]
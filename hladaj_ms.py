@@ -0,0 +1,144 @@
+r"""
+Program na vyhľadanie hospitalizačných prípadov podľa priradených medicínskych služieb v indexe vytvorenom programom main.py s prepínačom --index.
+
+Vypíše vo formáte riadok;id čísla riadkov výstupného súboru programu main.py (bez hlavičky, od 1) a identifikátory prípadov, ktoré majú všetky zadané medicínske služby, bez čítania celého výstupu.
+
+Args:
+    index_path: Cesta k indexu medicínskych služieb.
+    sluzby: Kódy medicínskych služieb, napr. S12-04. Hodnota ERROR vyhľadá neplatné prípady. Ak nie sú zadané, vypíšu sa počty prípadov podľa medicínskej služby.
+    --aspon_jedna, --any: Vyhľadaj prípady s aspoň jednou zo zadaných medicínskych služieb.
+    --s_inou, --with-other: Vyhľadaj iba prípady, ktoré majú okrem zadaných aj inú medicínsku službu.
+    --pocet, --count: Vypíš iba počet nájdených prípadov.
+    --vystup, --output, -o: Cesta k výstupnému súboru. Štandardne sa výsledok vypíše na štandardný výstup.
+
+Returns:
+    None
+
+Examples:
+    # Všetky prípady s medicínskou službou S12-04
+    python3 ./hladaj_ms.py ./test_data_index.db S12-04
+    # Počet prípadov s medicínskou službou S17-22 a aspoň jednou ďalšou
+    python3 ./hladaj_ms.py ./test_data_index.db S17-22 --s_inou --pocet
+    # Počty prípadov podľa medicínskej služby
+    python3 ./hladaj_ms.py ./test_data_index.db
+"""
+
+import argparse
+import csv
+import sqlite3
+import sys
+from contextlib import closing
+from grouper.index_ms import otvor_index_na_citanie, hladaj_pripady, prehlad_indexu
+from grouper.priprava_dat import otvor_vystup, STANDARDNY_PRUD
+
+
+def hladaj_ms(
+    index_path,
+    sluzby,
+    aspon_jedna=False,
+    s_inou=False,
+    iba_pocet=False,
+    output_path=STANDARDNY_PRUD,
+):
+    """
+    Vyhľadá v indexe prípady podľa priradených medicínskych služieb a zapíše ich vo formáte riadok;id, kde riadok je číslo riadku výstupného súboru programu main.py bez hlavičky, od 1.
+
+    Args:
+        index_path (str): Cesta k indexu medicínskych služieb.
+        sluzby (List[str]): Kódy medicínskych služieb. Ak je zoznam prázdny, zapíšu sa počty prípadov podľa medicínskej služby vo formáte ms;pocet.
+        aspon_jedna (bool, optional): Vyhľadaj prípady s aspoň jednou zo zadaných medicínskych služieb.
+        s_inou (bool, optional): Vyhľadaj iba prípady, ktoré majú okrem zadaných aj inú medicínsku službu.
+        iba_pocet (bool, optional): Zapíš iba počet nájdených prípadov.
+        output_path (str, optional): Cesta k výstupnému súboru alebo '-' pre štandardný výstup.
+
+    Raises:
+        sqlite3.Error: index neexistuje alebo ho nie je možné prečítať
+
+    Returns:
+        int: počet nájdených prípadov, prípadne medicínskych služieb
+    """
+    with closing(otvor_index_na_citanie(index_path)) as connection, otvor_vystup(
+        output_path
+    ) as output_file:
+        writer = csv.writer(output_file, delimiter=";")
+
+        if not sluzby:
+            prehlad = prehlad_indexu(connection)
+            writer.writerow(["ms", "pocet"])
+            writer.writerows(prehlad)
+            return len(prehlad)
+
+        pripady = hladaj_pripady(connection, sluzby, aspon_jedna, s_inou)
+        if iba_pocet:
+            pocet = sum(1 for _ in pripady)
+            writer.writerow([pocet])
+            return pocet
+
+        writer.writerow(["riadok", "id"])
+        pocet = 0
+        while davka := pripady.fetchmany(10000):
+            writer.writerows(davka)
+            pocet += len(davka)
+        return pocet
+
+
+if __name__ == "__main__":
+    # Nastav argumenty pri spúšťaní
+    parser = argparse.ArgumentParser(
+        description="Program na vyhľadanie hospitalizačných prípadov podľa priradených medicínskych služieb v indexe vytvorenom programom main.py s prepínačom --index. Vypíše stĺpce riadok a id, kde riadok je číslo riadku vo výstupnom súbore programu main.py (bez hlavičky, od 1), napr. pre 'sed -n' po pripočítaní 1 za hlavičku."
+    )
+    parser.add_argument(
+        "index_path",
+        action="store",
+        help="Cesta k indexu medicínskych služieb.",
+    )
+    parser.add_argument(
+        "sluzby",
+        action="store",
+        nargs="*",
+        help="Kódy medicínskych služieb, napr. S12-04. Štandardne sa vyhľadajú prípady, ktoré majú všetky zadané služby. Hodnota ERROR vyhľadá neplatné prípady. Ak nie sú zadané, vypíšu sa počty prípadov podľa medicínskej služby.",
+    )
+    parser.add_argument(
+        "--aspon_jedna",
+        "--any",
+        dest="aspon_jedna",
+        action="store_true",
+        help="Vyhľadaj prípady s aspoň jednou zo zadaných medicínskych služieb.",
+    )
+    parser.add_argument(
+        "--s_inou",
+        "--with-other",
+        dest="s_inou",
+        action="store_true",
+        help="Vyhľadaj iba prípady, ktoré majú okrem zadaných aj inú medicínsku službu.",
+    )
+    parser.add_argument(
+        "--pocet",
+        "--count",
+        dest="iba_pocet",
+        action="store_true",
+        help="Vypíš iba počet nájdených prípadov.",
+    )
+    parser.add_argument(
+        "--vystup",
+        "--output",
+        "-o",
+        dest="output_path",
+        action="store",
+        default=STANDARDNY_PRUD,
+        help="Cesta k výstupnému súboru. Štandardne sa výsledok vypíše na štandardný výstup.",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        hladaj_ms(
+            args.index_path,
+            args.sluzby,
+            args.aspon_jedna,
+            args.s_inou,
+            args.iba_pocet,
+            args.output_path,
+        )
+    except sqlite3.Error as chyba:
+        sys.exit(f"ERROR: Index {args.index_path} nie je možné prečítať: {chyba}")
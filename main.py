@@ -4,10 +4,31 @@ Program na priraďovanie hospitalizačných prípadov do medicínskych služieb.
 Vytvorí kópiu vstupného súboru s pripojeným novým stĺpcom so zoznamom priradených medicínskych služieb.
 
 Args:
-    file_path: Relatívna cesta k súboru s dátami.
+    file_path: Relatívna cesta k súboru s dátami. Hodnota '-' znamená čítanie zo štandardného vstupu. Pri zadaní viacerých ciest, vzoru so zástupnými znakmi alebo adresára sa súbory spracujú súčasne vo viacerých procesoch a výstup každého sa zapíše vedľa neho.
+    --vystup, --output, -o: Cesta k výstupnému súboru. Hodnota '-' znamená zápis na štandardný výstup. Štandardne sa výstup zapíše vedľa vstupného súboru s príponou '_output.csv', pri čítaní zo štandardného vstupu na štandardný výstup.
     --vsetky_vykony_hlavne, -v: Pri vyhodnotení príloh predpokladaj, že ktorýkoľvek z výkazaných výkonov mohol byť hlavný.
     --vyhodnot_neuplne_pripady, -n: V prípade, že nie je vyplnená nejaká povinná hodnota, aj tak pokračuj vo vyhodnocovaní. Štandardne vráti hodnotu 'ERROR'.
     --ponechaj_duplicity, -d: Vo výstupnom zozname medicínskych služieb ponechaj aj duplicitné záznamy.
+    --validuj, --validate-only: Iba skontroluj vstupný súbor a vypíš report o chybách, prípady nevyhodnocuj.
+    --sumar, --summary: Cesta k súboru so súhrnnými počtami prípadov podľa medicínskych služieb. Kópia vstupného súboru sa vtedy zapíše, iba ak je zadaný aj prepínač --vystup.
+    --procesy, --workers, -p: Počet procesov, v ktorých sa prípady vyhodnocujú, pri viacerých súboroch počet súčasne spracúvaných súborov. Hodnota 0 znamená počet jadier procesora.
+    --vlakna, --threads: Počet vlákien, v ktorých sa prípady vyhodnocujú. Hodnota 0 znamená počet jadier procesora. Zrýchli vyhodnocovanie iba na verzii Pythonu bez GIL.
+    --shard: Spracuj iba časť k/N prípadov vybranú podľa stabilného hashu identifikátora prípadu. Výstupy shardov sa zlúčia programom zluc_shardy.py.
+    --checkpoint: Priebežne ukladaj stav spracovania, štandardne každých 60 sekúnd.
+    --pokracuj, --resume: Pokračuj v prerušenom spracovaní od posledného checkpointu.
+    --databaza, --sqlite: Cesta k súboru s dátami je databáza SQLite. Prípady sa načítajú dotazom a priradené medicínske služby sa zapíšu do tabuľky výsledkov. Kópia vstupných dát sa vtedy zapíše, iba ak je zadaný aj prepínač --vystup.
+    --dotaz, --query: Dotaz na načítanie prípadov z databázy, ktorý vracia stĺpce v poradí ako vstupný csv súbor.
+    --tabulka, --table: Názov tabuľky, do ktorej sa zapíšu dvojice (id, ms).
+    --rychly_parser, --fast-parser: Vstupný súbor namapuj do pamäte a čítaj ho zjednodušeným parserom pre 7 stĺpcov bez úvodzoviek. Výsledok je rovnaký ako pri čítaní modulom csv.
+    --priebeh, --progress: Priebežne vypisuj na štandardný chybový výstup stav spracovania, štandardne každých 10 sekúnd.
+    --priebeh_subor, --progress-file: Stav spracovania priebežne zapisuj vo formáte JSON do zadaného súboru namiesto výpisu.
+    --priebeh_json, --progress-json: Stav spracovania vypisuj vo formáte JSON, jeden záznam na riadok.
+    --skrateny_vystup, --slim-output: Namiesto kópie vstupného súboru zapíš iba stĺpce id a ms.
+    --s_prilohami, --with-annex: Do skráteného výstupu pridaj stĺpec prilohy s číslami príloh, ktoré určili jednotlivé medicínske služby.
+    --index, --ms-index: Počas spracovania vytvor index medicínskych služieb na rýchle vyhľadávanie prípadov programom hladaj_ms.py.
+    --cesta_indexu, --index-path: Cesta k indexu medicínskych služieb. Štandardne sa index zapíše vedľa vstupného súboru s príponou '_index.db'.
+    --hlbka_fronty, --queue-depth: Počet dávok, ktoré môžu čakať medzi etapami čítania, vyhodnocovania a zápisu. Hodnota 0 znamená spracovanie bez etáp v jednom vlákne.
+    --statistiky_etap, --stage-stats: Po spracovaní vypíš na štandardný chybový výstup priepustnosť etáp čítania, vyhodnocovania a zápisu.
 
 Returns:
     None
@@ -19,19 +40,522 @@ Examples:
     python3 ./main.py ./test_data.csv --vyhodnot_neuplne_pripady
     # Spustenie so všetkými prepínačmi zapnutými
     python3 ./main.py ./test_data.csv -vnd
+    # Spustenie v rámci pipeline bez medzivýsledkov na disku
+    zcat ./data.csv.gz | python3 ./main.py - | gzip > ./data_output.csv.gz
+    # Kontrola vstupného súboru pred spracovaním
+    python3 ./main.py ./test_data.csv --validuj
+    # Iba súhrnné počty prípadov, vyhodnotené na všetkých jadrách procesora
+    python3 ./main.py ./test_data.csv --sumar ./test_data_sumar.csv -p 0
+    # Skrátený výstup iba s identifikátorom prípadu, medicínskymi službami a číslami príloh
+    python3 ./main.py ./test_data.csv --skrateny_vystup --s_prilohami
+    # Spracovanie s indexom medicínskych služieb a vyhľadanie prípadov s medicínskou službou S12-04
+    python3 ./main.py ./test_data.csv --index
+    python3 ./hladaj_ms.py ./test_data_index.db S12-04
+    # Spracovanie všetkých csv súborov v adresári na všetkých jadrách procesora so súhrnom za každý súbor
+    python3 ./main.py ./data_2024_05/
+    python3 ./main.py "./data_2024_05/*_phsk_*.csv" ./doplnok.csv -p 4
+    # Vyhodnocovanie vo vláknach na všetkých jadrách procesora na verzii Pythonu bez GIL (free-threaded)
+    python3.13t ./main.py ./test_data.csv --vlakna 0
+    # Spracovanie druhej zo štyroch častí dát, napr. na jednom zo štyroch uzlov
+    python3 ./main.py ./test_data.csv --shard 2/4
+    # Dlhé spracovanie s checkpointom každých 5 minút a pokračovanie po jeho prerušení
+    python3 ./main.py ./test_data.csv --checkpoint 300
+    python3 ./main.py ./test_data.csv --checkpoint 300 --pokracuj
+    # Dlhé spracovanie so stavom zapisovaným každú minútu do súboru pre plánovač úloh
+    python3 ./main.py ./test_data.csv --priebeh 60 --priebeh_subor ./test_data_stav.json
+    # Načítanie prípadov z databázy SQLite a zápis výsledkov do tabuľky vysledky_ms
+    python3 ./main.py ./nemocnica.db --databaza --dotaz "SELECT id, vek, hmotnost, upv, diagnozy, vykony, drg FROM hospitalizacie WHERE rok = 2024"
     # Spustenie na Windows
     python .\main.py .\test_data_phsk_2.csv -vnd
 """
 
 import argparse
-from copy import deepcopy
+import csv
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from contextlib import ExitStack, closing, redirect_stdout
+from grouper.checkpointy import (
+    INTERVAL_CHECKPOINTOV,
+    urci_cestu_checkpointu,
+    popis_vstupu,
+    otvor_vstup_od_pozicie,
+    dekoduj_riadky,
+    sleduj_poziciu,
+    zapis_checkpoint,
+    nacitaj_checkpoint,
+    orez_vystup,
+)
+from grouper.databaza import (
+    PREDVOLENY_DOTAZ,
+    otvor_databazu,
+    urci_tabulku_vysledkov,
+    vykonaj_dotaz,
+    citaj_z_databazy,
+    priprav_tabulku_vysledkov,
+    zapis_do_databazy,
+)
+from grouper.index_ms import (
+    urci_cestu_indexu,
+    otvor_index,
+    zapis_do_indexu,
+    uloz_index,
+    dokonci_index,
+)
+from grouper.etapy import (
+    HLBKA_FRONTY,
+    vytvor_statistiku,
+    spusti_etapu,
+    vypis_statistiky,
+)
 from grouper.priprava_dat import (
-    priprav_hp,
-    validuj_hp,
+    STANDARDNY_PRUD,
     priprav_citac_dat,
+    skontroluj_pocet_stlpcov,
     priprav_zapisovac_dat,
+    priprav_skrateny_zapisovac,
+    urci_stlpce_vystupu,
+    otvor_vstup,
+    otvor_vystup,
+    urci_vystupnu_cestu,
+    je_rovnaky_subor,
 )
-from grouper.vyhodnotenie_priloh import prirad_ms
+from grouper.priebeh import (
+    INTERVAL_PRIEBEHU,
+    vytvor_priebeh,
+    sleduj_nacitanie,
+    ohlas_priebeh,
+)
+from grouper.rychle_citanie import otvor_mapovany_vstup, citaj_rychlo
+from grouper.shardy import vyber_shard
+from grouper.sumar import vytvor_sumar, zapocitaj_vysledok, zapis_sumar
+from grouper.validacia import validuj_subor, vypis_report, je_subor_v_poriadku
+from grouper.viac_suborov import (
+    je_viac_suborov,
+    najdi_vstupne_subory,
+    spracuj_subory,
+    vypis_vysledok_suboru,
+)
+
+
+def _skontroluj_nastavenia(
+    file_path,
+    output_path,
+    sumar_path,
+    index_path,
+    index,
+    databaza,
+    rychly_parser,
+    checkpoint_interval,
+    pocet_procesov,
+    pocet_vlakien,
+):
+    """
+    Skontroluje, či je možné nastavenia spracovania použiť spolu, inak ukončí program s chybovým hlásením.
+
+    Args:
+        file_path (str): cesta k súboru s dátami alebo '-'
+        output_path (str): určená cesta k výstupnému súboru alebo '-', prípadne None, ak sa kópia vstupu nezapisuje
+        sumar_path (str): cesta k súboru so súhrnnými počtami alebo '-', prípadne None
+        index_path (str): určená cesta k indexu medicínskych služieb, prípadne None
+        index (bool): má sa vytvoriť index medicínskych služieb
+        databaza (bool): cesta k súboru s dátami je databáza SQLite
+        rychly_parser (bool): vstupný súbor sa číta zjednodušeným parserom
+        checkpoint_interval (float): interval medzi checkpointmi, prípadne None
+        pocet_procesov (int): počet procesov, v ktorých sa prípady vyhodnocujú
+        pocet_vlakien (int): počet vlákien, v ktorých sa prípady vyhodnocujú
+
+    Returns:
+        None
+    """
+    if pocet_procesov != 1 and pocet_vlakien != 1:
+        sys.exit(
+            "ERROR: Prípady je možné vyhodnocovať vo viacerých procesoch alebo vo viacerých vláknach, nie oboje naraz."
+        )
+    if index and index_path is None:
+        sys.exit(
+            "ERROR: Pri čítaní zo štandardného vstupu je potrebné zadať cestu k indexu prepínačom --cesta_indexu."
+        )
+    for cesta in (output_path, sumar_path, index_path):
+        if je_rovnaky_subor(file_path, cesta):
+            sys.exit(
+                f"ERROR: Výstup {cesta} je ten istý súbor ako vstup {file_path}, spracovanie by vstup prepísalo."
+            )
+    if rychly_parser and (databaza or file_path == STANDARDNY_PRUD):
+        sys.exit(
+            "ERROR: Rýchly parser vyžaduje vstupný csv súbor, nie štandardný vstup alebo databázu."
+        )
+    if checkpoint_interval is not None and databaza:
+        sys.exit("ERROR: Checkpointy nie je možné použiť pri čítaní z databázy.")
+    if checkpoint_interval is not None and STANDARDNY_PRUD in (
+        file_path,
+        output_path,
+        sumar_path,
+    ):
+        sys.exit(
+            "ERROR: Checkpointy vyžadujú, aby vstup aj výstupy boli súbory, nie štandardný vstup alebo výstup."
+        )
+
+
+def _otvor_zdroj(
+    subory,
+    file_path,
+    databaza,
+    dotaz,
+    tabulka_vysledkov,
+    shard,
+    rychly_parser,
+    checkpoint_interval,
+    pozicia_vstupu,
+):
+    """
+    Otvorí zdroj hospitalizačných prípadov: databázu SQLite, csv súbor alebo štandardný vstup.
+
+    Args:
+        subory (contextlib.ExitStack): zásobník, ktorý otvorené súbory na konci spracovania zatvorí
+        file_path (str): cesta k súboru s dátami alebo '-'
+        databaza (bool): cesta k súboru s dátami je databáza SQLite
+        dotaz (str): dotaz na načítanie prípadov z databázy
+        tabulka_vysledkov (str): názov tabuľky výsledkov v databáze, prípadne None
+        shard (Tuple[int, int]): spracovávaný shard, prípadne None
+        rychly_parser (bool): vstupný súbor sa číta zjednodušeným parserom
+        checkpoint_interval (float): interval medzi checkpointmi, prípadne None
+        pozicia_vstupu (int): pozícia vo vstupnom súbore, od ktorej sa číta
+
+    Returns:
+        dict: riadky prípadov, funkcie na zistenie pozície čítania a čísla riadku a pri databáze aj zápis výsledkov do nej
+    """
+    zdroj = {
+        "velkost": None,
+        "pozicia": None,
+        "precitane_bajty": None,
+        "cislo_riadku": None,
+        "zapisy": [],
+    }
+
+    if databaza:
+        from grouper.spracovanie import naformatuj_ms
+
+        connection = subory.enter_context(closing(otvor_databazu(file_path)))
+        tabulka_vysledkov = urci_tabulku_vysledkov(tabulka_vysledkov, shard)
+        try:
+            # Tabuľka výsledkov sa vymaže až po úspešnom spustení dotazu
+            cursor = vykonaj_dotaz(connection, dotaz)
+            priprav_tabulku_vysledkov(connection, tabulka_vysledkov)
+        except (sqlite3.Error, ValueError) as chyba:
+            sys.exit(f"ERROR: {chyba}")
+        zdroj["riadky"] = citaj_z_databazy(cursor)
+        zdroj["zapisy"].append(
+            lambda davka, vysledky, prvy_riadok: zapis_do_databazy(
+                connection,
+                tabulka_vysledkov,
+                [
+                    (hospitalizacny_pripad["id"], naformatuj_ms(sluzby))
+                    for hospitalizacny_pripad, (_, sluzby) in zip(davka, vysledky)
+                ],
+            )
+        )
+        return zdroj
+
+    if rychly_parser:
+        stav_citania = {}
+        input_data = subory.enter_context(otvor_mapovany_vstup(file_path))
+        reader = citaj_rychlo(input_data, stav_citania, pozicia_vstupu)
+        zdroj["pozicia"] = lambda: stav_citania.get("pozicia", 0)
+        zdroj["precitane_bajty"] = zdroj["pozicia"]
+        zdroj["cislo_riadku"] = lambda: stav_citania["cislo_riadku"]
+    else:
+        if checkpoint_interval is None:
+            input_file = subory.enter_context(otvor_vstup(file_path))
+            # Textový súbor číta do vyrovnávacej pamäte vopred, pozícia je preto približná
+            zdroj["precitane_bajty"] = lambda: input_file.buffer.tell()
+        else:
+            # Pri checkpointoch sa vstup číta binárne, aby bolo možné zistiť pozíciu spracovaných riadkov
+            input_binary = subory.enter_context(
+                otvor_vstup_od_pozicie(file_path, pozicia_vstupu)
+            )
+            input_file = dekoduj_riadky(input_binary)
+            zdroj["pozicia"] = input_binary.tell
+            zdroj["precitane_bajty"] = input_binary.tell
+        reader = priprav_citac_dat(input_file)
+        # DictReader aktualizuje číslo riadku až po úspešnom načítaní, aktuálne je iba v podkladovom čítači
+        zdroj["cislo_riadku"] = lambda: reader.reader.line_num
+
+    if file_path != STANDARDNY_PRUD:
+        zdroj["velkost"] = os.path.getsize(file_path)
+    zdroj["riadky"] = skontroluj_pocet_stlpcov(reader)
+    return zdroj
+
+
+def _otvor_vystupy(
+    subory,
+    output_path,
+    sumar_path,
+    index_path,
+    skrateny_vystup,
+    s_prilohami,
+    checkpoint,
+):
+    """
+    Otvorí výstupy spracovania: kópiu vstupu alebo skrátený výstup, súbor so súhrnnými počtami a index medicínskych služieb.
+
+    Args:
+        subory (contextlib.ExitStack): zásobník, ktorý otvorené súbory na konci spracovania zatvorí
+        output_path (str): cesta k výstupnému súboru alebo '-', prípadne None, ak sa kópia vstupu nezapisuje
+        sumar_path (str): cesta k súboru so súhrnnými počtami alebo '-', prípadne None
+        index_path (str): cesta k indexu medicínskych služieb, prípadne None
+        skrateny_vystup (bool): namiesto kópie vstupu sa zapíšu iba stĺpce id a ms
+        s_prilohami (bool): do skráteného výstupu sa pridá stĺpec s číslami príloh
+        checkpoint (dict): checkpoint, od ktorého spracovanie pokračuje, prípadne None
+
+    Returns:
+        dict: výstupný súbor, spojenie s indexom, funkcie na zápis vyhodnotenej dávky a funkcie na dokončenie výstupov po spracovaní
+    """
+    from grouper.spracovanie import naformatuj_ms, naformatuj_skratene_riadky
+
+    vystupy = {
+        "output_file": None,
+        "index_connection": None,
+        "zapisy": [],
+        "dokoncenia": [],
+    }
+
+    if output_path is not None:
+        if checkpoint is not None:
+            orez_vystup(output_path, checkpoint["pozicia_vystupu"])
+        output_file = subory.enter_context(
+            otvor_vystup(output_path, pripoj=checkpoint is not None)
+        )
+        vystupy["output_file"] = output_file
+    sumar_file = None
+    if sumar_path is not None:
+        sumar_file = subory.enter_context(otvor_vystup(sumar_path))
+    if index_path is not None:
+        try:
+            index_connection = subory.enter_context(
+                closing(
+                    otvor_index(
+                        index_path,
+                        (
+                            checkpoint["sumar"]["pocet_pripadov"]
+                            if checkpoint is not None
+                            else None
+                        ),
+                    )
+                )
+            )
+        except sqlite3.Error as chyba:
+            sys.exit(f"ERROR: Index {index_path} nie je možné vytvoriť: {chyba}")
+        vystupy["index_connection"] = index_connection
+
+    if output_path is not None and skrateny_vystup:
+        writer = priprav_skrateny_zapisovac(output_file)
+        if checkpoint is None:
+            writer.writerow(urci_stlpce_vystupu(skrateny_vystup, s_prilohami))
+        # Celá dávka sa zapíše naraz do veľkej vyrovnávacej pamäte výstupu
+        vystupy["zapisy"].append(
+            lambda davka, vysledky, prvy_riadok: writer.writerows(
+                naformatuj_skratene_riadky(davka, vysledky, s_prilohami)
+            )
+        )
+    elif output_path is not None:
+        writer = priprav_zapisovac_dat(output_file)
+        if checkpoint is None:
+            writer.writeheader()
+
+        def zapis_riadky(davka, vysledky, prvy_riadok):
+            for hospitalizacny_pripad, (_, sluzby) in zip(davka, vysledky):
+                hospitalizacny_pripad["ms"] = naformatuj_ms(sluzby)
+                writer.writerow(hospitalizacny_pripad)
+
+        vystupy["zapisy"].append(zapis_riadky)
+    if index_path is not None:
+        vystupy["zapisy"].append(
+            lambda davka, vysledky, prvy_riadok: zapis_do_indexu(
+                index_connection, davka, vysledky, prvy_riadok
+            )
+        )
+        vystupy["dokoncenia"].append(lambda sumar: dokonci_index(index_connection))
+    if sumar_file is not None:
+        vystupy["dokoncenia"].append(lambda sumar: zapis_sumar(sumar, sumar_file))
+    return vystupy
+
+
+def _sleduj_etapy(po_davke, dokoncenia, statistiky_etap):
+    """
+    Vytvorí štatistiky etáp čítania, vyhodnocovania a zápisu a ak sú požadované, po spracovaní ich vypíše.
+
+    Args:
+        po_davke (List[Callable]): funkcie volané po zápise každej dávky, pridá sa k nim počítanie zapísaných prípadov
+        dokoncenia (List[Callable]): funkcie volané po spracovaní, pridá sa k nim výpis štatistík
+        statistiky_etap (bool): po spracovaní vypíš štatistiky etáp
+
+    Returns:
+        List[dict]: štatistiky etáp čítania, vyhodnocovania a zápisu
+    """
+    statistiky = [
+        vytvor_statistiku(nazov) for nazov in ("čítanie", "vyhodnocovanie", "zápis")
+    ]
+    if statistiky_etap:
+        zaciatok = time.perf_counter()
+
+        def zapocitaj_zapis(davka, sumar):
+            statistiky[2]["pocet_davok"] += 1
+            statistiky[2]["pocet_pripadov"] += len(davka)
+
+        def vypis(sumar):
+            statistiky[2]["cas_prace"] = time.perf_counter() - zaciatok
+            vypis_statistiky(statistiky)
+
+        po_davke.append(zapocitaj_zapis)
+        dokoncenia.append(vypis)
+    return statistiky
+
+
+def _sleduj_checkpointy(
+    davky,
+    po_davke,
+    zisti_poziciu,
+    vystupy,
+    checkpoint_path,
+    checkpoint_interval,
+    nastavenia,
+    vstup,
+):
+    """
+    Zaznamenáva pozíciu vstupu za každou dávkou a po zápise dávky každých checkpoint_interval sekúnd uloží checkpoint.
+
+    Args:
+        davky (Iterable[List[dict]]): dávky riadkov
+        po_davke (List[Callable]): funkcie volané po zápise každej dávky, pridá sa k nim ukladanie checkpointu
+        zisti_poziciu (Callable[[], int]): funkcia, ktorá vráti pozíciu čítania vo vstupnom súbore
+        vystupy (dict): otvorené výstupy spracovania
+        checkpoint_path (str): cesta k súboru s checkpointom
+        checkpoint_interval (float): interval medzi checkpointmi v sekundách
+        nastavenia (dict): nastavenia, ktoré sa pri pokračovaní nesmú zmeniť
+        vstup (dict): veľkosť a čas zmeny vstupného súboru
+
+    Returns:
+        Iterator[List[dict]]: dávky riadkov
+    """
+    pozicie = deque()
+    cas_checkpointu = time.monotonic()
+
+    def uloz_checkpoint(davka, sumar):
+        nonlocal cas_checkpointu
+        pozicia_vstupu = pozicie.popleft()
+        if time.monotonic() - cas_checkpointu >= checkpoint_interval:
+            # Index musí obsahovať aspoň prípady zaznamenané v checkpointe
+            if vystupy["index_connection"] is not None:
+                uloz_index(vystupy["index_connection"])
+            zapis_checkpoint(
+                checkpoint_path,
+                pozicia_vstupu,
+                vystupy["output_file"],
+                sumar,
+                nastavenia,
+                vstup,
+            )
+            cas_checkpointu = time.monotonic()
+
+    po_davke.append(uloz_checkpoint)
+    return sleduj_poziciu(davky, zisti_poziciu, pozicie)
+
+
+def _sleduj_priebeh(
+    davky,
+    po_davke,
+    dokoncenia,
+    zdroj,
+    sumar,
+    pozicia_vstupu,
+    priebeh_interval,
+    priebeh_subor,
+    priebeh_json,
+):
+    """
+    Hlási stav spracovania po zápise dávok a po dokončení spracovania.
+
+    Args:
+        davky (Iterable[List[dict]]): dávky riadkov
+        po_davke (List[Callable]): funkcie volané po zápise každej dávky, pridá sa k nim hlásenie stavu
+        dokoncenia (List[Callable]): funkcie volané po spracovaní, pridá sa k nim záverečné hlásenie
+        zdroj (dict): otvorený zdroj prípadov
+        sumar (dict): súhrnné počty prípadov spracovaných pred začiatkom
+        pozicia_vstupu (int): pozícia vo vstupnom súbore, od ktorej sa číta
+        priebeh_interval (float): interval medzi hláseniami v sekundách
+        priebeh_subor (str): cesta k súboru so stavom spracovania, prípadne None
+        priebeh_json (bool): stav sa vypisuje vo formáte JSON
+
+    Returns:
+        Iterator[List[dict]]: dávky riadkov
+    """
+    priebeh = vytvor_priebeh(
+        zdroj["velkost"],
+        zdroj["precitane_bajty"],
+        priebeh_interval,
+        priebeh_subor,
+        priebeh_json,
+        sumar["pocet_pripadov"],
+        pozicia_vstupu,
+    )
+    po_davke.append(lambda davka, sumar: ohlas_priebeh(priebeh, sumar))
+    dokoncenia.append(lambda sumar: ohlas_priebeh(priebeh, sumar, dokoncene=True))
+    return sleduj_nacitanie(davky, priebeh)
+
+
+def _spusti_vyhodnocovanie(
+    davky,
+    statistiky,
+    hlbka_fronty,
+    vsetky_vykony_hlavne,
+    vyhodnot_neuplne_pripady,
+    ponechaj_duplicity,
+    pocet_procesov,
+    presmeruj_hlasenia,
+    pocet_vlakien,
+):
+    """
+    Vyhodnotí dávky v jednom alebo viacerých procesoch alebo vláknach, pri nenulovej hĺbke fronty v samostatných etapách.
+
+    Args:
+        davky (Iterable[List[dict]]): dávky riadkov
+        statistiky (List[dict]): štatistiky etáp čítania, vyhodnocovania a zápisu
+        hlbka_fronty (int): počet dávok, ktoré môžu čakať medzi etapami, 0 znamená spracovanie bez etáp
+        vsetky_vykony_hlavne (bool): pri vyhodnotení príloh predpokladaj, že ktorýkoľvek z výkonov mohol byť hlavný
+        vyhodnot_neuplne_pripady (bool): vyhodnocuj aj prípady s chýbajúcimi povinnými hodnotami
+        ponechaj_duplicity (bool): ponechaj duplicitné medicínske služby
+        pocet_procesov (int): počet procesov, v ktorých sa prípady vyhodnocujú
+        presmeruj_hlasenia (bool): hlásenia procesov sa presmerujú na štandardný chybový výstup
+        pocet_vlakien (int): počet vlákien, v ktorých sa prípady vyhodnocujú
+
+    Returns:
+        Iterator[Tuple[List[dict], List[Tuple[str, List[Tuple[str, str]]]]]]: dvojice dávky a jej výsledkov v poradí dávok
+    """
+    from grouper.spracovanie import spracuj_davky
+
+    # Čítanie, vyhodnocovanie a zápis bežia v samostatných etapách, aby sa čakanie na disk prekrývalo s výpočtom
+    if hlbka_fronty > 0:
+        davky = spusti_etapu(davky, statistiky[0], hlbka_fronty)
+    vyhodnotene_davky = spracuj_davky(
+        davky,
+        vsetky_vykony_hlavne,
+        vyhodnot_neuplne_pripady,
+        ponechaj_duplicity,
+        pocet_procesov,
+        presmeruj_hlasenia,
+        pocet_vlakien,
+    )
+    if hlbka_fronty > 0:
+        vyhodnotene_davky = spusti_etapu(
+            vyhodnotene_davky,
+            statistiky[1],
+            hlbka_fronty,
+            pocet_pripadov=lambda polozka: len(polozka[0]),
+        )
+    return vyhodnotene_davky
 
 
 def grouper_ms(
@@ -39,6 +563,26 @@ def grouper_ms(
     vsetky_vykony_hlavne=False,
     vyhodnot_neuplne_pripady=False,
     ponechaj_duplicity=False,
+    output_path=None,
+    sumar_path=None,
+    pocet_procesov=1,
+    shard=None,
+    checkpoint_interval=None,
+    pokracuj=False,
+    hlbka_fronty=HLBKA_FRONTY,
+    statistiky_etap=False,
+    databaza=False,
+    dotaz=PREDVOLENY_DOTAZ,
+    tabulka_vysledkov=None,
+    rychly_parser=False,
+    priebeh_interval=None,
+    priebeh_subor=None,
+    priebeh_json=False,
+    skrateny_vystup=False,
+    s_prilohami=False,
+    index=False,
+    index_path=None,
+    pocet_vlakien=1,
 ):
     """
     Funkcia na priraďovanie hospitalizačných prípadov do medicínskych služieb.
@@ -46,56 +590,289 @@ def grouper_ms(
     Vytvorí kópiu vstupného súboru s pripojeným novým stĺpcom so zoznamom priradených medicínskych služieb.
 
     Args:
-        file_path (str): Relatívna cesta k súboru s dátami.
+        file_path (str): Relatívna cesta k súboru s dátami alebo '-' pre štandardný vstup.
         vsetky_vykony_hlavne (bool, optional): Pri vyhodnotení príloh predpokladaj, že ktorýkoľvek z výkazaných výkonov mohol byť hlavný.
         vyhodnot_neuplne_pripady (bool, optional): V prípade, že nie je vyplnená nejaká povinná hodnota, aj tak pokračuj vo vyhodnocovaní. Štandardne vráti hodnotu 'ERROR'.
         ponechaj_duplicity (bool, optional): Vo výstupnom zozname medicínskych služieb ponechaj aj duplicitné záznamy.
+        output_path (str, optional): Cesta k výstupnému súboru alebo '-' pre štandardný výstup. Štandardne sa odvodí od cesty k súboru s dátami.
+        sumar_path (str, optional): Cesta k súboru so súhrnnými počtami alebo '-' pre štandardný výstup. Ak je zadaná, kópia vstupného súboru sa zapíše, iba ak je zadaná aj cesta output_path.
+        pocet_procesov (int, optional): Počet procesov, v ktorých sa prípady vyhodnocujú. Hodnota 0 znamená počet jadier procesora.
+        shard (Tuple[int, int], optional): Spracuj iba shard k z N, dvojica (k, N). Prípady sa do shardov rozdeľujú podľa stabilného hashu identifikátora.
+        checkpoint_interval (float, optional): Interval v sekundách, po ktorom sa ukladá checkpoint so stavom spracovania. Štandardne sa checkpointy neukladajú.
+        pokracuj (bool, optional): Pokračuj v spracovaní od posledného checkpointu.
+        hlbka_fronty (int, optional): Počet dávok, ktoré môžu čakať medzi etapami čítania, vyhodnocovania a zápisu. Hodnota 0 znamená spracovanie bez etáp v jednom vlákne.
+        statistiky_etap (bool, optional): Po spracovaní vypíš na štandardný chybový výstup priepustnosť jednotlivých etáp spracovania.
+        databaza (bool, optional): Cesta k súboru s dátami je databáza SQLite. Výsledky sa zapíšu do tabuľky výsledkov, kópia vstupných dát iba ak je zadaná cesta output_path.
+        dotaz (str, optional): Dotaz na načítanie prípadov z databázy, ktorý vracia stĺpce v poradí ako vstupný csv súbor.
+        tabulka_vysledkov (str, optional): Názov tabuľky výsledkov v databáze. Štandardne 'vysledky_ms', pri spracovaní shardu s príponou '_k_N'.
+        rychly_parser (bool, optional): Vstupný súbor namapuj do pamäte a čítaj ho zjednodušeným parserom pre 7 stĺpcov bez úvodzoviek.
+        priebeh_interval (float, optional): Interval v sekundách, po ktorom sa hlási stav spracovania. Štandardne sa stav nehlási.
+        priebeh_subor (str, optional): Cesta k súboru, do ktorého sa priebežne zapisuje stav spracovania vo formáte JSON. Štandardne sa stav vypisuje na štandardný chybový výstup.
+        priebeh_json (bool, optional): Stav spracovania vypisuj na štandardný chybový výstup vo formáte JSON.
+        skrateny_vystup (bool, optional): Namiesto kópie vstupného súboru zapíš iba stĺpce id a ms.
+        s_prilohami (bool, optional): Do skráteného výstupu pridaj stĺpec 'prilohy' s číslami príloh, ktoré určili jednotlivé medicínske služby. Zapne aj skrátený výstup.
+        index (bool, optional): Počas spracovania vytvor index medicínskych služieb s číslami riadkov výstupu a identifikátormi prípadov.
+        index_path (str, optional): Cesta k indexu medicínskych služieb. Štandardne sa odvodí od cesty k súboru s dátami. Zapne aj vytvorenie indexu.
+        pocet_vlakien (int, optional): Počet vlákien, v ktorých sa prípady vyhodnocujú. Hodnota 0 znamená počet jadier procesora. Nie je možné kombinovať s viacerými procesmi.
 
     Returns:
-        None
+        dict: súhrnné počty spracovaných prípadov
     """
 
-    if vsetky_vykony_hlavne:
-        print(
-            "Aktivovaný prepínač 'Všetky výkony hlavné'. Pri vyhodnotení príloh sa bude predpokladať, že ktorýkoľvek z výkazaných výkonov mohol byť hlavný."
+    # Prílohy sa načítajú až pri importe modulu, preto sa importuje až pri vyhodnocovaní
+    from grouper.spracovanie import je_gil_zapnuty, rozdel_na_davky
+
+    zapis_kopiu = output_path is not None or (sumar_path is None and not databaza)
+    output_path = (
+        urci_vystupnu_cestu(file_path, output_path, shard) if zapis_kopiu else None
+    )
+    # Pri čítaní zo štandardného vstupu nie je možné cestu k indexu odvodiť, musí byť zadaná
+    if index and index_path is None and file_path != STANDARDNY_PRUD:
+        index_path = urci_cestu_indexu(file_path, shard=shard)
+    if pokracuj and checkpoint_interval is None:
+        checkpoint_interval = INTERVAL_CHECKPOINTOV
+    skrateny_vystup = skrateny_vystup or s_prilohami
+
+    _skontroluj_nastavenia(
+        file_path=file_path,
+        output_path=output_path,
+        sumar_path=sumar_path,
+        index_path=index_path,
+        index=index,
+        databaza=databaza,
+        rychly_parser=rychly_parser,
+        checkpoint_interval=checkpoint_interval,
+        pocet_procesov=pocet_procesov,
+        pocet_vlakien=pocet_vlakien,
+    )
+
+    # Nastavenia, ktoré sa pri pokračovaní v spracovaní nesmú zmeniť
+    nastavenia = {
+        "file_path": file_path,
+        "output_path": output_path,
+        "sumar_path": sumar_path,
+        "vsetky_vykony_hlavne": vsetky_vykony_hlavne,
+        "vyhodnot_neuplne_pripady": vyhodnot_neuplne_pripady,
+        "ponechaj_duplicity": ponechaj_duplicity,
+        "shard": list(shard) if shard is not None else None,
+        "stlpce_vystupu": urci_stlpce_vystupu(skrateny_vystup, s_prilohami),
+        "index_path": index_path,
+    }
+    checkpoint_path = urci_cestu_checkpointu(output_path or sumar_path)
+    vstup = popis_vstupu(file_path) if checkpoint_interval is not None else None
+    checkpoint = None
+    if pokracuj:
+        try:
+            checkpoint = nacitaj_checkpoint(checkpoint_path, nastavenia, vstup)
+        except ValueError as chyba:
+            sys.exit(f"ERROR: {chyba}")
+        if checkpoint is None:
+            print(
+                f"Checkpoint {checkpoint_path} neexistuje, spracovanie začne od začiatku."
+            )
+
+    # Pri zápise na štandardný výstup idú hlásenia na štandardný chybový výstup, aby sa nemiešali s dátami.
+    # Výstupné súbory sa preto otvárajú ešte pred presmerovaním.
+    presmeruj_hlasenia = STANDARDNY_PRUD in (output_path, sumar_path)
+    pozicia_vstupu = checkpoint["pozicia_vstupu"] if checkpoint is not None else 0
+
+    with ExitStack() as subory:
+        zdroj = _otvor_zdroj(
+            subory,
+            file_path,
+            databaza=databaza,
+            dotaz=dotaz,
+            tabulka_vysledkov=tabulka_vysledkov,
+            shard=shard,
+            rychly_parser=rychly_parser,
+            checkpoint_interval=checkpoint_interval,
+            pozicia_vstupu=pozicia_vstupu,
         )
-    if vyhodnot_neuplne_pripady:
-        print(
-            "Aktivovaný prepínač 'Vyhodnoť neúplné prípady'. V prípade, že nie je vyplnená nejaká povinná hodnota, aj tak sa bude pokračovať vo vyhodnocovaní."
+        vystupy = _otvor_vystupy(
+            subory,
+            output_path,
+            sumar_path,
+            index_path,
+            skrateny_vystup=skrateny_vystup,
+            s_prilohami=s_prilohami,
+            checkpoint=checkpoint,
         )
-    if ponechaj_duplicity:
-        print(
-            "Aktivovaný prepínač 'Ponechaj duplicity'. Vo výstupnom zozname medicínskych služieb budú ponechané aj duplicitné záznamy."
+
+        if presmeruj_hlasenia:
+            subory.enter_context(redirect_stdout(sys.stderr))
+
+        if vsetky_vykony_hlavne:
+            print(
+                "Aktivovaný prepínač 'Všetky výkony hlavné'. Pri vyhodnotení príloh sa bude predpokladať, že ktorýkoľvek z výkazaných výkonov mohol byť hlavný."
+            )
+        if vyhodnot_neuplne_pripady:
+            print(
+                "Aktivovaný prepínač 'Vyhodnoť neúplné prípady'. V prípade, že nie je vyplnená nejaká povinná hodnota, aj tak sa bude pokračovať vo vyhodnocovaní."
+            )
+        if ponechaj_duplicity:
+            print(
+                "Aktivovaný prepínač 'Ponechaj duplicity'. Vo výstupnom zozname medicínskych služieb budú ponechané aj duplicitné záznamy."
+            )
+        if pocet_vlakien != 1 and je_gil_zapnuty():
+            print(
+                "WARNING: Interpreter Pythonu používa GIL, vyhodnocovanie vo viacerých vláknach preto nebude rýchlejšie. Zrýchlenie je možné na verzii Pythonu bez GIL (free-threaded), inak použite prepínač --procesy."
+            )
+        if checkpoint is not None:
+            print(
+                f"Pokračujem v spracovaní od checkpointu, spracovaných prípadov: {checkpoint['sumar']['pocet_pripadov']}."
+            )
+
+        sumar = checkpoint["sumar"] if checkpoint is not None else vytvor_sumar()
+        # Výstupy zapíšu každú vyhodnotenú dávku, po nej sa uloží checkpoint a ohlási stav
+        zapisy = vystupy["zapisy"] + zdroj["zapisy"]
+        po_davke = []
+        dokoncenia = vystupy["dokoncenia"]
+        statistiky = _sleduj_etapy(
+            po_davke, dokoncenia, statistiky_etap and hlbka_fronty > 0
         )
 
-    with open(file_path, "r", encoding="utf-8") as input_file:
-        with open(
-            f"{file_path[:-4]}_output.csv", "w", encoding="utf-8", newline=""
-        ) as output_file:
+        riadky = zdroj["riadky"]
+        if shard is not None:
+            riadky = vyber_shard(riadky, *shard)
+        davky = rozdel_na_davky(riadky)
+        if checkpoint_interval is not None:
+            davky = _sleduj_checkpointy(
+                davky,
+                po_davke,
+                zdroj["pozicia"],
+                vystupy,
+                checkpoint_path,
+                checkpoint_interval,
+                nastavenia,
+                vstup,
+            )
+        if priebeh_subor is not None or priebeh_json:
+            priebeh_interval = priebeh_interval or INTERVAL_PRIEBEHU
+        if priebeh_interval is not None:
+            davky = _sleduj_priebeh(
+                davky,
+                po_davke,
+                dokoncenia,
+                zdroj,
+                sumar,
+                pozicia_vstupu,
+                priebeh_interval,
+                priebeh_subor,
+                priebeh_json,
+            )
+        vyhodnotene_davky = _spusti_vyhodnocovanie(
+            davky,
+            statistiky,
+            hlbka_fronty,
+            vsetky_vykony_hlavne,
+            vyhodnot_neuplne_pripady,
+            ponechaj_duplicity,
+            pocet_procesov,
+            presmeruj_hlasenia,
+            pocet_vlakien,
+        )
 
-            reader = priprav_citac_dat(input_file)
-            writer = priprav_zapisovac_dat(output_file)
-            writer.writeheader()
+        try:
+            for davka, vysledky in vyhodnotene_davky:
+                for zapis in zapisy:
+                    zapis(davka, vysledky, sumar["pocet_pripadov"] + 1)
+                for vekova_skupina, sluzby in vysledky:
+                    zapocitaj_vysledok(sumar, vekova_skupina, sluzby)
+                for funkcia in po_davke:
+                    funkcia(davka, sumar)
+            for dokonci in dokoncenia:
+                dokonci(sumar)
+        except sqlite3.Error as chyba:
+            sys.exit(f"ERROR: Chyba pri práci s databázou: {chyba}")
+        except csv.Error as chyba:
+            # Chyba formátu aj zlý počet stĺpcov zastavia čítanie, číslo riadku preto zodpovedá chybnému riadku
+            sys.exit(
+                f"ERROR: Zlý formát csv na riadku {zdroj['cislo_riadku']()}: {chyba}. Celý súbor je možné skontrolovať prepínačom --validuj."
+            )
 
-            for hospitalizacny_pripad in reader:
-                hp = deepcopy(hospitalizacny_pripad)
+    # Spracovanie je dokončené, checkpoint už nie je potrebný
+    if checkpoint_interval is not None and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
 
-                if not validuj_hp(hp, vyhodnot_neuplne_pripady):
-                    hospitalizacny_pripad["ms"] = "ERROR"
-                    writer.writerow(hospitalizacny_pripad)
-                    continue
+    return sumar
 
-                priprav_hp(hp)
 
-                medicinske_sluzby = prirad_ms(hp, vsetky_vykony_hlavne)
+def grouper_ms_viac_suborov(file_paths, pocet_procesov=0, **nastavenia):
+    """
+    Priradí hospitalizačné prípady do medicínskych služieb vo viacerých vstupných súboroch.
 
-                if not ponechaj_duplicity:
-                    # deduplikuj medicinske sluzby
-                    medicinske_sluzby = list(dict.fromkeys(medicinske_sluzby))
+    Prílohy sa načítajú raz a súbory sa spracúvajú súčasne vo viacerých procesoch, každý súbor v jednom procese. Výstup každého súboru sa zapíše vedľa neho s príponou '_output.csv'. Po dokončení každého súboru sa vypíše počet prípadov, počty prípadov ERROR a S99-99 a trvanie spracovania.
 
-                hospitalizacny_pripad["ms"] = "~".join(medicinske_sluzby)
+    Args:
+        file_paths (List[str]): Relatívne cesty k súborom s dátami, vzory so zástupnými znakmi alebo adresáre.
+        pocet_procesov (int, optional): Počet súčasne spracúvaných súborov. Hodnota 0 znamená počet jadier procesora.
+        **nastavenia: Ďalšie argumenty funkcie grouper_ms, rovnaké pre všetky súbory.
 
-                writer.writerow(hospitalizacny_pripad)
+    Returns:
+        bool: True, ak sa podarilo spracovať všetky súbory
+    """
+    try:
+        subory = najdi_vstupne_subory(file_paths)
+    except ValueError as chyba:
+        sys.exit(f"ERROR: {chyba}")
+
+    # Prílohy sa načítajú pri importe, procesy spracúvajúce súbory ich zdedia
+    import grouper.spracovanie
+
+    print(f"Spracúvam {len(subory)} súborov.")
+    zaciatok = time.perf_counter()
+    spolu = vytvor_sumar()
+    pocet_chyb = 0
+    for file_path, sumar, trvanie, chyba in spracuj_subory(
+        subory,
+        grouper_ms,
+        # Súbory sa spracúvajú súčasne, prípady jedného súboru sa preto vyhodnocujú v jednom procese
+        {**nastavenia, "pocet_procesov": 1},
+        pocet_procesov,
+    ):
+        vypis_vysledok_suboru(file_path, sumar, trvanie, chyba)
+        if chyba is not None:
+            pocet_chyb += 1
+            continue
+        for kluc in ("pocet_pripadov", "pocet_error", "pocet_s99_99"):
+            spolu[kluc] += sumar[kluc]
+
+    print(
+        f"Spolu: {len(subory) - pocet_chyb} z {len(subory)} súborov, {spolu['pocet_pripadov']} prípadov, "
+        f"ERROR {spolu['pocet_error']}, S99-99 {spolu['pocet_s99_99']}, {time.perf_counter() - zaciatok:.1f} s"
+    )
+    return pocet_chyb == 0
+
+
+def validuj_vstup(file_path):
+    """
+    Skontroluje vstupný súbor podľa pravidiel validácie hospitalizačných prípadov a vypíše report o chybách.
+
+    Prílohy sa nenačítavajú a prípady sa nevyhodnocujú.
+
+    Args:
+        file_path (str): Relatívna cesta k súboru s dátami alebo '-' pre štandardný vstup.
+
+    Returns:
+        bool: True, ak sa v súbore nenašla žiadna chyba
+    """
+    with otvor_vstup(file_path) as input_file:
+        report = validuj_subor(input_file)
+
+    vypis_report(report)
+
+    return je_subor_v_poriadku(report)
+
+
+def _shard(hodnota):
+    """Prevedie argument v tvare k/N na dvojicu (k, N)."""
+    try:
+        shard, pocet_shardov = (int(cislo) for cislo in hodnota.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Shard musí byť v tvare k/N, napr. 2/4.")
+    if not 1 <= shard <= pocet_shardov:
+        raise argparse.ArgumentTypeError("Pre shard k/N musí platiť 1 <= k <= N.")
+    return shard, pocet_shardov
 
 
 if __name__ == "__main__":
@@ -104,7 +881,18 @@ if __name__ == "__main__":
         description="Funkcia na priraďovanie hospitalizačných prípadov do medicínskych služieb."
     )
     parser.add_argument(
-        "data_path", action="store", help="Relatívna cesta k súboru s dátami."
+        "data_path",
+        action="store",
+        nargs="+",
+        help="Relatívna cesta k súboru s dátami. Hodnota '-' znamená čítanie zo štandardného vstupu. Pri zadaní viacerých ciest, vzoru so zástupnými znakmi (v úvodzovkách) alebo adresára sa všetky súbory spracujú súčasne vo viacerých procesoch s prílohami načítanými iba raz. Výstup každého súboru sa zapíše vedľa neho s príponou '_output.csv' a vypíše sa súhrn za každý súbor.",
+    )
+    parser.add_argument(
+        "--vystup",
+        "--output",
+        "-o",
+        dest="output_path",
+        action="store",
+        help="Cesta k výstupnému súboru. Hodnota '-' znamená zápis na štandardný výstup. Štandardne sa výstup zapíše vedľa vstupného súboru s príponou '_output.csv', pri čítaní zo štandardného vstupu na štandardný výstup.",
     )
     parser.add_argument(
         "--vsetky_vykony_hlavne",
@@ -125,11 +913,246 @@ if __name__ == "__main__":
         help="Vo výstupnom zozname medicínskych služieb ponechaj aj duplicitné záznamy.",
     )
 
+    parser.add_argument(
+        "--validuj",
+        "--validate-only",
+        dest="validuj",
+        action="store_true",
+        help="Iba skontroluj vstupný súbor a vypíš počty chýb podľa polí, vzorové ID a čísla riadkov so zlým formátom csv. Prípady sa nevyhodnocujú.",
+    )
+
+    parser.add_argument(
+        "--sumar",
+        "--summary",
+        dest="sumar_path",
+        action="store",
+        help="Cesta k súboru so súhrnnými počtami prípadov podľa medicínskej služby, vekovej skupiny a prílohy, počtami prípadov ERROR, S99-99 a prípadov s viacerými medicínskymi službami. Kópia vstupného súboru sa vtedy zapíše, iba ak je zadaný aj prepínač --vystup.",
+    )
+    parser.add_argument(
+        "--procesy",
+        "--workers",
+        "-p",
+        dest="pocet_procesov",
+        action="store",
+        type=int,
+        help="Počet procesov, v ktorých sa prípady vyhodnocujú. Hodnota 0 znamená počet jadier procesora. Štandardne sa prípady vyhodnocujú v jednom procese. Pri viacerých vstupných súboroch počet súčasne spracúvaných súborov, štandardne počet jadier procesora.",
+    )
+
+    parser.add_argument(
+        "--vlakna",
+        "--threads",
+        dest="pocet_vlakien",
+        action="store",
+        type=int,
+        default=1,
+        help="Počet vlákien hlavného procesu, v ktorých sa prípady vyhodnocujú. Hodnota 0 znamená počet jadier procesora. Prílohy sú nemenné a vlákna ich zdieľajú, vyhodnocovanie sa však zrýchli iba na verzii Pythonu bez GIL (free-threaded). Nie je možné kombinovať s prepínačom --procesy. Štandardne sa prípady vyhodnocujú v jednom vlákne.",
+    )
+
+    parser.add_argument(
+        "--shard",
+        action="store",
+        type=_shard,
+        help="Spracuj iba shard k/N, napr. 2/4. Prípady sa do shardov rozdeľujú podľa stabilného hashu identifikátora, výber nezávisí od poradia čítania. Výstup sa štandardne zapíše s príponou '_output_k_N.csv'.",
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        dest="checkpoint_interval",
+        action="store",
+        nargs="?",
+        type=float,
+        const=INTERVAL_CHECKPOINTOV,
+        metavar="SEKUNDY",
+        help=f"Priebežne ukladaj stav spracovania do súboru s príponou '.checkpoint' vedľa výstupu. Interval v sekundách, štandardne {INTERVAL_CHECKPOINTOV}.",
+    )
+    parser.add_argument(
+        "--pokracuj",
+        "--resume",
+        dest="pokracuj",
+        action="store_true",
+        help="Pokračuj v prerušenom spracovaní od posledného checkpointu. Neúplný zápis na konci výstupu sa odstráni a spracované riadky vstupu sa preskočia bez načítania.",
+    )
+
+    parser.add_argument(
+        "--skrateny_vystup",
+        "--slim-output",
+        dest="skrateny_vystup",
+        action="store_true",
+        help="Namiesto kópie vstupného súboru s pripojeným stĺpcom ms zapíš iba stĺpce id a ms. Výstup je výrazne menší a zapisuje sa po celých dávkach, výsledky je možné k vstupu pripojiť podľa id.",
+    )
+    parser.add_argument(
+        "--s_prilohami",
+        "--with-annex",
+        dest="s_prilohami",
+        action="store_true",
+        help="Do skráteného výstupu pridaj stĺpec prilohy s číslami príloh, ktoré určili jednotlivé medicínske služby, oddelenými znakom '~' v poradí stĺpca ms. Zapne aj prepínač --skrateny_vystup.",
+    )
+
+    parser.add_argument(
+        "--index",
+        "--ms-index",
+        dest="index",
+        action="store_true",
+        help="Počas spracovania vytvor index medicínskych služieb, databázu SQLite s číslami riadkov výstupu a identifikátormi prípadov podľa medicínskej služby. Prípady je v ňom možné vyhľadať programom hladaj_ms.py bez čítania celého výstupu. Index sa štandardne zapíše vedľa vstupného súboru s príponou '_index.db', pri spracovaní shardu s príponou '_index_k_N.db'.",
+    )
+    parser.add_argument(
+        "--cesta_indexu",
+        "--index-path",
+        dest="index_path",
+        action="store",
+        help="Cesta k indexu medicínskych služieb. Zapne aj prepínač --index.",
+    )
+
+    parser.add_argument(
+        "--hlbka_fronty",
+        "--queue-depth",
+        dest="hlbka_fronty",
+        action="store",
+        type=int,
+        default=HLBKA_FRONTY,
+        help=f"Počet dávok, ktoré môžu čakať medzi etapami čítania, vyhodnocovania a zápisu. Etapy bežia v samostatných vláknach, takže čakanie na disk sa prekrýva s vyhodnocovaním. Hodnota 0 znamená spracovanie bez etáp v jednom vlákne. Štandardne {HLBKA_FRONTY}.",
+    )
+
+    parser.add_argument(
+        "--statistiky_etap",
+        "--stage-stats",
+        dest="statistiky_etap",
+        action="store_true",
+        help="Po spracovaní vypíš na štandardný chybový výstup pre každú etapu počet prípadov, čas práce, priepustnosť a čas čakania na predchádzajúcu a nasledujúcu etapu. Etapa, ktorá najmenej čaká, obmedzuje rýchlosť celého spracovania.",
+    )
+
+    parser.add_argument(
+        "--databaza",
+        "--sqlite",
+        dest="databaza",
+        action="store_true",
+        help="Cesta k súboru s dátami je databáza SQLite. Prípady sa načítajú dotazom po veľkých dávkach a dvojice (id, ms) sa hromadne zapíšu do tabuľky výsledkov v tej istej databáze. Kópia vstupných dát sa vtedy zapíše, iba ak je zadaný aj prepínač --vystup.",
+    )
+    parser.add_argument(
+        "--dotaz",
+        "--query",
+        dest="dotaz",
+        action="store",
+        default=PREDVOLENY_DOTAZ,
+        help=f"Dotaz na načítanie prípadov z databázy. Musí vracať stĺpce id, vek, hmotnosť, počet hodín umelej pľúcnej ventilácie, diagnózy, výkony a DRG v tomto poradí. Štandardne '{PREDVOLENY_DOTAZ}'.",
+    )
+    parser.add_argument(
+        "--tabulka",
+        "--table",
+        dest="tabulka_vysledkov",
+        action="store",
+        help="Názov tabuľky v databáze, do ktorej sa zapíšu dvojice (id, ms). Tabuľka sa vytvorí, prípadne sa z nej vymažú predchádzajúce výsledky. Existujúca tabuľka musí mať práve stĺpce id a ms. Štandardne 'vysledky_ms', pri spracovaní shardu s príponou '_k_N'.",
+    )
+
+    parser.add_argument(
+        "--rychly_parser",
+        "--fast-parser",
+        dest="rychly_parser",
+        action="store_true",
+        help="Vstupný súbor namapuj do pamäte a deľ ho na riadky a polia priamo podľa oddeľovačov. Riadky s úvodzovkami alebo so zlým počtom stĺpcov sa načítajú modulom csv, výsledok je rovnaký ako bez prepínača.",
+    )
+
+    parser.add_argument(
+        "--priebeh",
+        "--progress",
+        dest="priebeh_interval",
+        action="store",
+        nargs="?",
+        type=float,
+        const=INTERVAL_PRIEBEHU,
+        metavar="SEKUNDY",
+        help=f"Priebežne vypisuj na štandardný chybový výstup počet spracovaných prípadov, prečítanú časť vstupu, rýchlosť spracovania, odhad zostávajúceho času, počty prípadov ERROR a S99-99 a spotrebu pamäte. Interval v sekundách, štandardne {INTERVAL_PRIEBEHU}.",
+    )
+    parser.add_argument(
+        "--priebeh_subor",
+        "--progress-file",
+        dest="priebeh_subor",
+        action="store",
+        help="Stav spracovania priebežne zapisuj vo formáte JSON do zadaného súboru namiesto výpisu. Súbor sa pri každom hlásení prepíše, po dokončení obsahuje hodnotu 'dokoncene': true.",
+    )
+    parser.add_argument(
+        "--priebeh_json",
+        "--progress-json",
+        dest="priebeh_json",
+        action="store_true",
+        help="Stav spracovania vypisuj na štandardný chybový výstup vo formáte JSON, jeden záznam na riadok.",
+    )
+
     args = parser.parse_args()
 
+    # Jedna cesta k databáze sa nikdy nepovažuje za viac súborov
+    viac_suborov = je_viac_suborov(args.data_path) and not (
+        args.databaza and len(args.data_path) == 1
+    )
+    if viac_suborov:
+        if STANDARDNY_PRUD in args.data_path:
+            sys.exit("ERROR: Štandardný vstup je možné spracovať iba samostatne.")
+        for zadane, prepinac in (
+            (args.validuj, "--validuj"),
+            (args.databaza, "--databaza"),
+            (args.output_path is not None, "--vystup"),
+            (args.sumar_path is not None, "--sumar"),
+            (args.priebeh_interval is not None, "--priebeh"),
+            (args.priebeh_subor is not None, "--priebeh_subor"),
+            (args.priebeh_json, "--priebeh_json"),
+            (args.index_path is not None, "--cesta_indexu"),
+            (args.statistiky_etap, "--statistiky_etap"),
+        ):
+            if zadane:
+                sys.exit(
+                    f"ERROR: Prepínač {prepinac} je možné použiť iba pri spracovaní jedného súboru."
+                )
+
+        uspech = grouper_ms_viac_suborov(
+            args.data_path,
+            0 if args.pocet_procesov is None else args.pocet_procesov,
+            vsetky_vykony_hlavne=args.vsetky_vykony_hlavne,
+            vyhodnot_neuplne_pripady=args.vyhodnot_neuplne_pripady,
+            ponechaj_duplicity=args.ponechaj_duplicity,
+            shard=args.shard,
+            checkpoint_interval=args.checkpoint_interval,
+            pokracuj=args.pokracuj,
+            hlbka_fronty=args.hlbka_fronty,
+            rychly_parser=args.rychly_parser,
+            skrateny_vystup=args.skrateny_vystup,
+            s_prilohami=args.s_prilohami,
+            index=args.index,
+            pocet_vlakien=args.pocet_vlakien,
+        )
+        sys.exit(0 if uspech else 1)
+
+    data_path = args.data_path[0]
+    if data_path != STANDARDNY_PRUD and not os.path.exists(data_path):
+        sys.exit(f"ERROR: Súbor {data_path} neexistuje.")
+
+    if args.validuj and args.databaza:
+        sys.exit("ERROR: Prepínač --validuj kontroluje iba vstupné csv súbory.")
+    if args.validuj:
+        sys.exit(0 if validuj_vstup(data_path) else 1)
+
     grouper_ms(
-        args.data_path,
-        args.vsetky_vykony_hlavne,
-        args.vyhodnot_neuplne_pripady,
-        args.ponechaj_duplicity,
+        data_path,
+        vsetky_vykony_hlavne=args.vsetky_vykony_hlavne,
+        vyhodnot_neuplne_pripady=args.vyhodnot_neuplne_pripady,
+        ponechaj_duplicity=args.ponechaj_duplicity,
+        output_path=args.output_path,
+        sumar_path=args.sumar_path,
+        pocet_procesov=1 if args.pocet_procesov is None else args.pocet_procesov,
+        shard=args.shard,
+        checkpoint_interval=args.checkpoint_interval,
+        pokracuj=args.pokracuj,
+        hlbka_fronty=args.hlbka_fronty,
+        statistiky_etap=args.statistiky_etap,
+        databaza=args.databaza,
+        dotaz=args.dotaz,
+        tabulka_vysledkov=args.tabulka_vysledkov,
+        rychly_parser=args.rychly_parser,
+        priebeh_interval=args.priebeh_interval,
+        priebeh_subor=args.priebeh_subor,
+        priebeh_json=args.priebeh_json,
+        skrateny_vystup=args.skrateny_vystup,
+        s_prilohami=args.s_prilohami,
+        index=args.index,
+        index_path=args.index_path,
+        pocet_vlakien=args.pocet_vlakien,
     )
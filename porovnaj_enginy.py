@@ -0,0 +1,336 @@
+r"""
+Program na diferenciálne porovnanie spôsobov vyhodnocovania (enginov) so zmrazenou referenčnou implementáciou.
+
+Vygeneruje hraničné a náhodné hospitalizačné prípady, vyhodnotí ich referenčnou implementáciou (grouper/referencia.py) a každým enginom pri všetkých kombináciách prepínačov -v, -n, -d a porovná hodnoty stĺpca 'ms' vrátane poradia a duplicít. Pri rozdiele vypíše minimálny vstup, na ktorom sa rozdiel prejaví.
+
+Args:
+    --pocet: Počet náhodných prípadov.
+    --seed: Počiatočná hodnota generátora náhodných čísel.
+    --engine: Názov enginu, ktorý sa má porovnať. Je možné zadať viackrát, štandardne sa porovnajú všetky.
+
+Returns:
+    None
+
+Examples:
+    # Porovnanie všetkých enginov
+    python3 ./porovnaj_enginy.py
+    # Porovnanie jedného enginu na väčšom počte prípadov
+    python3 ./porovnaj_enginy.py --engine procesy --pocet 5000 --seed 7
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from main import grouper_ms, grouper_ms_viac_suborov
+from grouper.porovnanie import (
+    KOMBINACIE_PREPINACOV,
+    generuj_pripady,
+    porovnaj_engine,
+    vyhodnot_referenciou,
+    zapis_riadky,
+)
+from grouper.priprava_dat import NAZVY_STLPCOV
+from grouper.etapy import spusti_etapu, vytvor_statistiku
+from grouper.shardy import zluc_v_poradi_vstupu
+from grouper.spracovanie import (
+    naformatuj_ms,
+    rozdel_na_davky,
+    spracuj_davky,
+    vyhodnot_davku,
+)
+
+
+def engine_zakladny(
+    riadky, vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+):
+    """Vyhodnotenie po riadkoch v hlavnom procese."""
+    return [
+        naformatuj_ms(sluzby)
+        for _, sluzby in vyhodnot_davku(
+            riadky, vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+        )
+    ]
+
+
+def engine_procesy(
+    riadky, vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+):
+    """Vyhodnotenie malých dávok v dvoch procesoch."""
+    return [
+        naformatuj_ms(sluzby)
+        for _, vysledky in spracuj_davky(
+            rozdel_na_davky(riadky, 7),
+            vsetky_vykony_hlavne,
+            vyhodnot_neuplne_pripady,
+            ponechaj_duplicity,
+            pocet_procesov=2,
+        )
+        for _, sluzby in vysledky
+    ]
+
+
+def engine_vlakna(
+    riadky, vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+):
+    """Vyhodnotenie malých dávok v štyroch vláknach so zdieľanými prílohami."""
+    return [
+        naformatuj_ms(sluzby)
+        for _, vysledky in spracuj_davky(
+            rozdel_na_davky(riadky, 7),
+            vsetky_vykony_hlavne,
+            vyhodnot_neuplne_pripady,
+            ponechaj_duplicity,
+            pocet_vlakien=4,
+        )
+        for _, sluzby in vysledky
+    ]
+
+
+def engine_etapy(
+    riadky, vsetky_vykony_hlavne, vyhodnot_neuplne_pripady, ponechaj_duplicity
+):
+    """Vyhodnotenie malých dávok v etapách s frontami hĺbky 1 a v dvoch procesoch."""
+    davky = spusti_etapu(
+        rozdel_na_davky(riadky, 7), vytvor_statistiku("čítanie"), hlbka_fronty=1
+    )
+    vyhodnotene_davky = spusti_etapu(
+        spracuj_davky(
+            davky,
+            vsetky_vykony_hlavne,
+            vyhodnot_neuplne_pripady,
+            ponechaj_duplicity,
+            pocet_procesov=2,
+        ),
+        vytvor_statistiku("vyhodnocovanie"),
+        hlbka_fronty=1,
+        pocet_pripadov=lambda polozka: len(polozka[0]),
+    )
+    return [
+        naformatuj_ms(sluzby)
+        for _, vysledky in vyhodnotene_davky
+        for _, sluzby in vysledky
+    ]
+
+
+def _nacitaj_ms(cesta):
+    """Načíta hodnoty stĺpca 'ms' z výstupného súboru."""
+    with open(cesta, "r", encoding="utf-8", newline="") as file:
+        return [riadok["ms"] for riadok in csv.DictReader(file, delimiter=";")]
+
+
+def _cely_beh(riadky, prepinace, **nastavenia):
+    """Zapíše riadky do dočasného súboru, spracuje ho funkciou grouper_ms a načíta výsledky."""
+    with tempfile.TemporaryDirectory() as adresar:
+        vstup = os.path.join(adresar, "data.csv")
+        with open(vstup, "w", encoding="utf-8", newline="") as file:
+            zapis_riadky(riadky, file)
+        vystup = os.path.join(adresar, "data_output.csv")
+        grouper_ms(vstup, *prepinace, output_path=vystup, **nastavenia)
+        return _nacitaj_ms(vystup)
+
+
+def engine_cely_beh(riadky, *prepinace):
+    """Celé spracovanie súboru funkciou grouper_ms."""
+    return _cely_beh(riadky, prepinace)
+
+
+def engine_bez_etap(riadky, *prepinace):
+    """Celé spracovanie súboru funkciou grouper_ms v jednom vlákne bez etáp."""
+    return _cely_beh(riadky, prepinace, hlbka_fronty=0)
+
+
+def engine_rychly_parser(riadky, *prepinace):
+    """Celé spracovanie súboru čítaného rýchlym parserom s checkpointom po každej dávke."""
+    return _cely_beh(riadky, prepinace, rychly_parser=True, checkpoint_interval=0)
+
+
+def engine_skrateny_vystup(riadky, *prepinace):
+    """Celé spracovanie súboru so skráteným výstupom s číslami príloh a s checkpointom po každej dávke."""
+    return _cely_beh(riadky, prepinace, s_prilohami=True, checkpoint_interval=0)
+
+
+def engine_checkpointy(riadky, *prepinace):
+    """Celé spracovanie súboru s checkpointom po každej dávke."""
+    return _cely_beh(riadky, prepinace, checkpoint_interval=0)
+
+
+def engine_databaza(riadky, *prepinace):
+    """Celé spracovanie prípadov z databázy SQLite so zápisom do tabuľky výsledkov."""
+    with tempfile.TemporaryDirectory() as adresar:
+        cesta = os.path.join(adresar, "data.db")
+        connection = sqlite3.connect(cesta)
+        try:
+            with connection:
+                connection.execute(
+                    f"CREATE TABLE hospitalizacie ({', '.join(NAZVY_STLPCOV)})"
+                )
+                connection.executemany(
+                    f"INSERT INTO hospitalizacie VALUES ({', '.join(':' + stlpec for stlpec in NAZVY_STLPCOV)})",
+                    riadky,
+                )
+            grouper_ms(cesta, *prepinace, databaza=True)
+            return [
+                ms
+                for (ms,) in connection.execute(
+                    "SELECT ms FROM vysledky_ms ORDER BY rowid"
+                )
+            ]
+        finally:
+            connection.close()
+
+
+def engine_shardy(riadky, *prepinace):
+    """Spracovanie troch shardov a ich zlúčenie do poradia vstupu. Vstup obsahuje aj prázdne riadky, ktoré sa pri spracovaní aj zlúčení preskočia."""
+    pocet_shardov = 3
+    with tempfile.TemporaryDirectory() as adresar:
+        vstup = os.path.join(adresar, "data.csv")
+        with open(vstup, "w", encoding="utf-8", newline="") as file:
+            for zaciatok in range(0, len(riadky), 50):
+                zapis_riadky(riadky[zaciatok : zaciatok + 50], file)
+                file.write("\n")
+        for shard in range(1, pocet_shardov + 1):
+            grouper_ms(vstup, *prepinace, shard=(shard, pocet_shardov))
+
+        vystup = os.path.join(adresar, "zlucene.csv")
+        with open(vstup, "r", encoding="utf-8", newline="") as input_file, open(
+            vystup, "w", encoding="utf-8", newline=""
+        ) as output_file:
+            shard_files = [
+                open(
+                    os.path.join(adresar, f"data_output_{shard}_{pocet_shardov}.csv"),
+                    "r",
+                    encoding="utf-8",
+                    newline="",
+                )
+                for shard in range(1, pocet_shardov + 1)
+            ]
+            try:
+                zluc_v_poradi_vstupu(input_file, shard_files, output_file)
+            finally:
+                for file in shard_files:
+                    file.close()
+        return _nacitaj_ms(vystup)
+
+
+def engine_viac_suborov(riadky, *prepinace):
+    """Spracovanie riadkov rozdelených do troch súborov v adresári súčasne v dvoch procesoch."""
+    pocet_suborov = 3
+    velkost_casti = -(-len(riadky) // pocet_suborov)
+    with tempfile.TemporaryDirectory() as adresar:
+        for cislo in range(pocet_suborov):
+            with open(
+                os.path.join(adresar, f"data_{cislo}.csv"),
+                "w",
+                encoding="utf-8",
+                newline="",
+            ) as file:
+                zapis_riadky(
+                    riadky[cislo * velkost_casti : (cislo + 1) * velkost_casti], file
+                )
+
+        with open(os.devnull, "w") as hlasenia, redirect_stdout(hlasenia):
+            grouper_ms_viac_suborov(
+                [adresar],
+                2,
+                vsetky_vykony_hlavne=prepinace[0],
+                vyhodnot_neuplne_pripady=prepinace[1],
+                ponechaj_duplicity=prepinace[2],
+            )
+        return [
+            ms
+            for cislo in range(pocet_suborov)
+            for ms in _nacitaj_ms(os.path.join(adresar, f"data_{cislo}_output.csv"))
+        ]
+
+
+ENGINY = {
+    "zakladny": engine_zakladny,
+    "procesy": engine_procesy,
+    "vlakna": engine_vlakna,
+    "etapy": engine_etapy,
+    "cely_beh": engine_cely_beh,
+    "bez_etap": engine_bez_etap,
+    "checkpointy": engine_checkpointy,
+    "rychly_parser": engine_rychly_parser,
+    "skrateny_vystup": engine_skrateny_vystup,
+    "shardy": engine_shardy,
+    "databaza": engine_databaza,
+    "viac_suborov": engine_viac_suborov,
+}
+
+
+def porovnaj_enginy(nazvy_enginov, pocet, seed):
+    """
+    Porovná zadané enginy s referenčnou implementáciou pri všetkých kombináciách prepínačov.
+
+    Args:
+        nazvy_enginov (List[str]): názvy porovnávaných enginov
+        pocet (int): počet náhodných prípadov
+        seed (int): počiatočná hodnota generátora náhodných čísel
+
+    Returns:
+        bool: True, ak sa výsledky všetkých enginov zhodujú s referenciou
+    """
+    riadky = generuj_pripady(pocet, seed)
+    zhoda = True
+
+    for prepinace in KOMBINACIE_PREPINACOV:
+        ocakavane = vyhodnot_referenciou(riadky, prepinace)
+        oznacenie = "".join(
+            prepinac for prepinac, zapnuty in zip("vnd", prepinace) if zapnuty
+        )
+        for nazov in nazvy_enginov:
+            rozdiel = porovnaj_engine(ENGINY[nazov], riadky, prepinace, ocakavane)
+            if rozdiel is None:
+                print(f"OK: {nazov} -{oznacenie or '-'} ({len(riadky)} prípadov)")
+                continue
+
+            zhoda = False
+            print(
+                f"ERROR: {nazov} -{oznacenie or '-'} sa líši od referencie. Minimálny vstup:"
+            )
+            zapis_riadky(rozdiel["riadky"], sys.stdout)
+            print(f"  očakávané: {rozdiel['ocakavane']}")
+            print(f"  skutočné:  {rozdiel['skutocne']}")
+
+    return zhoda
+
+
+if __name__ == "__main__":
+    # Nastav argumenty pri spúšťaní
+    parser = argparse.ArgumentParser(
+        description="Program na diferenciálne porovnanie spôsobov vyhodnocovania so zmrazenou referenčnou implementáciou."
+    )
+    parser.add_argument(
+        "--pocet",
+        action="store",
+        type=int,
+        default=300,
+        help="Počet náhodných prípadov. Štandardne 300.",
+    )
+    parser.add_argument(
+        "--seed",
+        action="store",
+        type=int,
+        default=0,
+        help="Počiatočná hodnota generátora náhodných čísel. Štandardne 0.",
+    )
+    parser.add_argument(
+        "--engine",
+        dest="nazvy_enginov",
+        action="append",
+        choices=list(ENGINY),
+        help="Názov enginu, ktorý sa má porovnať. Je možné zadať viackrát, štandardne sa porovnajú všetky.",
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(
+        0
+        if porovnaj_enginy(args.nazvy_enginov or list(ENGINY), args.pocet, args.seed)
+        else 1
+    )
@@ -0,0 +1,95 @@
+r"""
+Program na zlúčenie výstupov shardov spracovaných programom main.py s prepínačom --shard.
+
+Skontroluje, že každý hospitalizačný prípad bol spracovaný práve raz, a zapíše jeden spoločný výstup.
+
+Args:
+    output_path: Cesta k zlúčenému výstupnému súboru. Hodnota '-' znamená zápis na štandardný výstup.
+    shard_paths: Cesty k výstupom shardov v poradí 1 až N.
+    --vstup, --input: Cesta k pôvodnému vstupnému súboru. Výstup sa zlúči do poradia vstupu.
+    --zorad, --sorted: Výstup sa zoradí podľa identifikátora prípadu. Všetky riadky sa zoraďujú v pamäti.
+
+Returns:
+    None
+
+Examples:
+    # Zlúčenie štyroch shardov do poradia vstupného súboru
+    python3 ./zluc_shardy.py ./data_output.csv ./data_output_1_4.csv ./data_output_2_4.csv ./data_output_3_4.csv ./data_output_4_4.csv --vstup ./data.csv
+    # Zlúčenie dvoch shardov zoradených podľa identifikátora
+    python3 ./zluc_shardy.py ./data_output.csv ./data_output_1_2.csv ./data_output_2_2.csv --zorad
+"""
+
+import argparse
+import sys
+from contextlib import ExitStack
+from grouper.priprava_dat import otvor_vstup, otvor_vystup
+from grouper.shardy import zluc_v_poradi_vstupu, zluc_zoradene
+
+
+def zluc_shardy(output_path, shard_paths, input_path=None):
+    """
+    Zlúči výstupy shardov do jedného výstupného súboru.
+
+    Args:
+        output_path (str): Cesta k zlúčenému výstupnému súboru alebo '-' pre štandardný výstup.
+        shard_paths (List[str]): Cesty k výstupom shardov v poradí 1 až N.
+        input_path (str, optional): Cesta k pôvodnému vstupnému súboru. Ak je zadaná, výstup sa zlúči do poradia vstupu, inak sa zoradí podľa identifikátora prípadu.
+
+    Raises:
+        ValueError: niektorý prípad chýba alebo bol spracovaný viackrát
+
+    Returns:
+        int: počet zlúčených prípadov
+    """
+    with ExitStack() as subory:
+        shard_files = [
+            subory.enter_context(otvor_vstup(cesta)) for cesta in shard_paths
+        ]
+        output_file = subory.enter_context(otvor_vystup(output_path))
+
+        if input_path is None:
+            return zluc_zoradene(shard_files, output_file)
+
+        input_file = subory.enter_context(otvor_vstup(input_path))
+        return zluc_v_poradi_vstupu(input_file, shard_files, output_file)
+
+
+if __name__ == "__main__":
+    # Nastav argumenty pri spúšťaní
+    parser = argparse.ArgumentParser(
+        description="Program na zlúčenie výstupov shardov spracovaných programom main.py s prepínačom --shard."
+    )
+    parser.add_argument(
+        "output_path",
+        action="store",
+        help="Cesta k zlúčenému výstupnému súboru. Hodnota '-' znamená zápis na štandardný výstup.",
+    )
+    parser.add_argument(
+        "shard_paths",
+        action="store",
+        nargs="+",
+        help="Cesty k výstupom shardov v poradí 1 až N.",
+    )
+    poradie = parser.add_mutually_exclusive_group(required=True)
+    poradie.add_argument(
+        "--vstup",
+        "--input",
+        dest="input_path",
+        action="store",
+        help="Cesta k pôvodnému vstupnému súboru. Výstup sa zlúči do poradia vstupu a skontroluje sa, že každý prípad zo vstupu bol spracovaný práve raz.",
+    )
+    poradie.add_argument(
+        "--zorad",
+        "--sorted",
+        action="store_true",
+        help="Výstup sa zoradí podľa identifikátora prípadu a skontroluje sa, že sa žiaden prípad neopakuje. Všetky riadky sa zoraďujú v pamäti.",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        pocet = zluc_shardy(args.output_path, args.shard_paths, args.input_path)
+    except ValueError as chyba:
+        sys.exit(f"ERROR: {chyba}")
+
+    print(f"Zlúčených prípadov: {pocet}", file=sys.stderr)
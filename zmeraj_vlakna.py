@@ -0,0 +1,164 @@
+r"""
+Program na meranie zrýchlenia vyhodnocovania vo viacerých vláknach (prepínač --vlakna) oproti jednému vláknu.
+
+Vyhodnotí rovnaké náhodné hospitalizačné prípady v jednom vlákne a v zadaných počtoch vlákien, overí, že sú výsledky rovnaké, a vypíše časy a zrýchlenie. Vlákna môžu vyhodnocovať súčasne iba na verzii Pythonu bez GIL (free-threaded) a na viacerých jadrách procesora, inak sa meranie preskočí.
+
+Args:
+    --vlakna: Počty vlákien, ktoré sa porovnajú s jedným vláknom.
+    --pocet: Počet náhodných prípadov.
+    --opakovania: Počet opakovaní merania, použije sa najkratší čas.
+    --min_zrychlenie, --min-speedup: Najmenšie požadované zrýchlenie pri najväčšom počte vlákien.
+    --aj_s_gil, --even-with-gil: Meraj aj na verzii Pythonu s GIL alebo na jednom jadre, napr. na overenie programu.
+
+Returns:
+    None
+
+Examples:
+    # Meranie na verzii Pythonu bez GIL so zlyhaním, ak 4 vlákna nie sú aspoň dvakrát rýchlejšie
+    python3.13t ./zmeraj_vlakna.py --vlakna 2 4 --min_zrychlenie 2
+"""
+
+import argparse
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from grouper.porovnanie import generuj_pripady
+from grouper.spracovanie import je_gil_zapnuty, rozdel_na_davky, spracuj_davky
+
+
+def zmeraj(riadky, pocet_vlakien, pocet_opakovani):
+    """
+    Vyhodnotí riadky v zadanom počte vlákien a zmeria čas vyhodnotenia.
+
+    Args:
+        riadky (List[dict]): riadky v tvare načítanom čítačom dát
+        pocet_vlakien (int): počet vlákien, v ktorých sa dávky vyhodnocujú
+        pocet_opakovani (int): počet opakovaní merania
+
+    Returns:
+        Tuple[float, List[Tuple[str, List[Tuple[str, str]]]]]: najkratší čas v sekundách a výsledky vyhodnotenia v poradí riadkov
+    """
+    najkratsi_cas = None
+    for _ in range(pocet_opakovani):
+        zaciatok = time.perf_counter()
+        with open(os.devnull, "w") as hlasenia, redirect_stdout(hlasenia):
+            vysledky = [
+                vysledok
+                for _, vysledky_davky in spracuj_davky(
+                    rozdel_na_davky(riadky),
+                    False,
+                    False,
+                    False,
+                    pocet_vlakien=pocet_vlakien,
+                )
+                for vysledok in vysledky_davky
+            ]
+        cas = time.perf_counter() - zaciatok
+        najkratsi_cas = cas if najkratsi_cas is None else min(najkratsi_cas, cas)
+    return najkratsi_cas, vysledky
+
+
+def zmeraj_vlakna(pocty_vlakien, pocet=20000, pocet_opakovani=3, min_zrychlenie=None):
+    """
+    Porovná čas vyhodnotenia v jednom vlákne a v zadaných počtoch vlákien a vypíše zrýchlenie.
+
+    Args:
+        pocty_vlakien (List[int]): počty vlákien, ktoré sa porovnajú s jedným vláknom
+        pocet (int, optional): počet náhodných prípadov
+        pocet_opakovani (int, optional): počet opakovaní merania
+        min_zrychlenie (float, optional): najmenšie požadované zrýchlenie pri najväčšom počte vlákien
+
+    Returns:
+        bool: True, ak sú výsledky vo všetkých počtoch vlákien rovnaké a zrýchlenie dosiahlo požadovanú hodnotu
+    """
+    riadky = generuj_pripady(pocet)
+
+    cas_jedneho_vlakna, ocakavane = zmeraj(riadky, 1, pocet_opakovani)
+    print(f"Počet vlákien 1: {cas_jedneho_vlakna:.2f} s")
+
+    zrychlenie = None
+    for pocet_vlakien in sorted(pocty_vlakien):
+        cas, vysledky = zmeraj(riadky, pocet_vlakien, pocet_opakovani)
+        if vysledky != ocakavane:
+            print(
+                f"ERROR: Výsledky v {pocet_vlakien} vláknach sa líšia od výsledkov v jednom vlákne."
+            )
+            return False
+        zrychlenie = cas_jedneho_vlakna / cas
+        print(
+            f"Počet vlákien {pocet_vlakien}: {cas:.2f} s, zrýchlenie {zrychlenie:.2f}x"
+        )
+
+    if min_zrychlenie is not None and zrychlenie < min_zrychlenie:
+        print(
+            f"ERROR: Zrýchlenie {zrychlenie:.2f}x v {max(pocty_vlakien)} vláknach je menšie ako požadované {min_zrychlenie:.2f}x."
+        )
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    # Nastav argumenty pri spúšťaní
+    parser = argparse.ArgumentParser(
+        description="Program na meranie zrýchlenia vyhodnocovania vo viacerých vláknach oproti jednému vláknu. Na verzii Pythonu s GIL alebo na jednom jadre sa meranie preskočí."
+    )
+    parser.add_argument(
+        "--vlakna",
+        dest="pocty_vlakien",
+        action="store",
+        nargs="+",
+        type=int,
+        help="Počty vlákien, ktoré sa porovnajú s jedným vláknom. Štandardne 2, 4 a počet jadier procesora.",
+    )
+    parser.add_argument(
+        "--pocet",
+        action="store",
+        type=int,
+        default=20000,
+        help="Počet náhodných prípadov. Štandardne 20000.",
+    )
+    parser.add_argument(
+        "--opakovania",
+        dest="pocet_opakovani",
+        action="store",
+        type=int,
+        default=3,
+        help="Počet opakovaní merania, použije sa najkratší čas. Štandardne 3.",
+    )
+    parser.add_argument(
+        "--min_zrychlenie",
+        "--min-speedup",
+        dest="min_zrychlenie",
+        action="store",
+        type=float,
+        help="Najmenšie požadované zrýchlenie pri najväčšom počte vlákien. Ak ho meranie nedosiahne, program skončí s chybou.",
+    )
+    parser.add_argument(
+        "--aj_s_gil",
+        "--even-with-gil",
+        dest="aj_s_gil",
+        action="store_true",
+        help="Meraj aj na verzii Pythonu s GIL alebo na jednom jadre, napr. na overenie programu. Zrýchlenie sa vtedy neočakáva.",
+    )
+
+    args = parser.parse_args()
+
+    pocet_jadier = os.cpu_count() or 1
+    if not args.aj_s_gil and je_gil_zapnuty():
+        print(
+            "Meranie preskočené: interpreter Pythonu používa GIL, vlákna nemôžu vyhodnocovať súčasne."
+        )
+        sys.exit(0)
+    if not args.aj_s_gil and pocet_jadier < 2:
+        print("Meranie preskočené: procesor má iba jedno jadro.")
+        sys.exit(0)
+
+    pocty_vlakien = args.pocty_vlakien or sorted({2, 4, pocet_jadier} - {1})
+    uspech = zmeraj_vlakna(
+        pocty_vlakien,
+        pocet=args.pocet,
+        pocet_opakovani=args.pocet_opakovani,
+        min_zrychlenie=args.min_zrychlenie,
+    )
+    sys.exit(0 if uspech else 1)